@@ -60,6 +60,8 @@ class ProcessInputsWorker(QObject):
             self.finished.emit(True, "Entrée enregistrée avec succès !")
         except Exception as e:
             self.finished.emit(False, f"Échec de l'enregistrement : {e}")
+        finally:
+            self.db_manager.release_thread_connection()
 
 
 class AudioSaverApp(QWidget):
@@ -0,0 +1,209 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QLabel,
+    QLineEdit,
+    QSizePolicy,
+    QSpacerItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+QWIDGETSIZE_MAX = (1 << 24) - 1
+
+
+def make_question_html(question, values, style="color:#1976d2;"):
+    """Question dont les (?) sont remplacés par `values` (ou ______ si vide)."""
+    parts = question.split("(?)")
+    html = ""
+    for i, part in enumerate(parts):
+        html += part
+        if i < len(values):
+            html += f"<b><span style='{style}'>{values[i] if values[i] else '______'}</span></b>"
+    return html
+
+
+class QuestionRow(QWidget):
+    """Une question et ses champs de réponse, réutilisée d'une carte à l'autre."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel()
+        self.label.setWordWrap(True)
+        self._layout.addWidget(self.label)
+        self.answer_label = QLabel()
+        self.answer_label.setTextFormat(Qt.RichText)
+        self._layout.addWidget(self.answer_label)
+        self.inputs = []  # réserve de champs, jamais détruits
+        self.active_inputs = []
+        self._question = ""
+
+    def _input(self, index):
+        while len(self.inputs) <= index:
+            edit = QLineEdit()
+            edit.textChanged.connect(self._update_blanks)
+            self._layout.addWidget(edit)
+            self.inputs.append(edit)
+        return self.inputs[index]
+
+    def bind(self, number, question, responses):
+        """Affiche la question à remplir ; `responses` (attendues) dimensionne les
+        champs des (?).
+        """
+        self._question = question
+        has_blanks = "(?)" in question
+        count = question.count("(?)") if has_blanks else 1
+        self.ensurePolished()
+        self.active_inputs = []
+        for i in range(count):
+            edit = self._input(i)
+            edit.blockSignals(True)
+            edit.clear()
+            edit.blockSignals(False)
+            if has_blanks:
+                expected = responses[i] if i < len(responses) else ""
+                edit.setFixedWidth(self.fontMetrics().horizontalAdvance(expected) + 18)
+                edit.setAlignment(Qt.AlignCenter)
+                edit.setStyleSheet("margin:4px 0 12px 0;padding:2px 6px;")
+                self._layout.setAlignment(edit, Qt.AlignHCenter)
+            else:
+                edit.setMinimumWidth(0)
+                edit.setMaximumWidth(QWIDGETSIZE_MAX)
+                edit.setAlignment(Qt.AlignLeft)
+                edit.setStyleSheet("")
+                self._layout.setAlignment(edit, Qt.Alignment())
+            edit.show()
+            self.active_inputs.append(edit)
+        for edit in self.inputs[count:]:
+            edit.hide()
+        self.answer_label.hide()
+        if has_blanks:
+            self.label.setTextFormat(Qt.RichText)
+            self.label.setAlignment(Qt.AlignHCenter)
+            self._update_blanks()
+        else:
+            self.label.setTextFormat(Qt.AutoText)
+            self.label.setAlignment(Qt.AlignLeft)
+            self.label.setText(f"{number}. {question}")
+
+    def show_answers(self, number, question, responses):
+        """Affiche la question avec ses réponses correctes, sans champ de saisie."""
+        self._question = question
+        self.active_inputs = []
+        for edit in self.inputs:
+            edit.hide()
+        if "(?)" in question:
+            values = responses + [""] * (question.count("(?)") - len(responses))
+            self.label.setTextFormat(Qt.RichText)
+            self.label.setAlignment(Qt.AlignHCenter)
+            self.label.setText(make_question_html(question, values, "color:green"))
+            self.answer_label.hide()
+        else:
+            self.label.setTextFormat(Qt.AutoText)
+            self.label.setAlignment(Qt.AlignLeft)
+            self.label.setText(f"{number}. {question}")
+            self.answer_label.setVisible(bool(responses))
+            if responses:
+                self.answer_label.setText(f"<b style='color:green'>{responses[0]}</b>")
+
+    def _update_blanks(self):
+        if "(?)" in self._question and self.active_inputs:
+            values = [edit.text() for edit in self.active_inputs]
+            self.label.setText(make_question_html(self._question, values))
+
+
+class CardView(QWidget):
+    """
+    Vue persistante d'une carte de révision : barre de progression, lignes de
+    questions (réservoir de QuestionRow) et zone de boutons. Passer à la carte
+    suivante ne fait que relier les widgets existants aux nouvelles données.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_label = QLabel()
+        self.progress_label.setAlignment(Qt.AlignRight)
+        layout.addWidget(self.progress_label)
+        # Espaceurs activés seulement pour centrer l'affichage des réponses
+        self._top_spacer = QSpacerItem(0, 0, QSizePolicy.Minimum, QSizePolicy.Fixed)
+        layout.addItem(self._top_spacer)
+        self.rows_layout = QVBoxLayout()
+        layout.addLayout(self.rows_layout)
+        self._bottom_spacer = QSpacerItem(0, 0, QSizePolicy.Minimum, QSizePolicy.Fixed)
+        layout.addItem(self._bottom_spacer)
+        self.controls = QWidget()
+        self.controls_layout = QVBoxLayout(self.controls)
+        self.controls_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.controls)
+        self._layout = layout
+        self.rows = []
+        self.active_rows = []
+
+    def add_control(self, widget):
+        self.controls_layout.addWidget(widget)
+        return widget
+
+    def _rows_for(self, count):
+        while len(self.rows) < count:
+            row = QuestionRow()
+            self.rows_layout.addWidget(row)
+            self.rows.append(row)
+        for row in self.rows[count:]:
+            row.hide()
+        self.active_rows = self.rows[:count]
+        for row in self.active_rows:
+            row.show()
+        return self.active_rows
+
+    @staticmethod
+    def split_responses(questions, responses):
+        """Répartit les réponses dans l'ordre : une par (?) ou une par question sans (?)."""
+        split, index = [], 0
+        for question in questions:
+            count = question.count("(?)") if "(?)" in question else 1
+            split.append(responses[index : index + count])
+            index += count
+        return split
+
+    def set_progress(self, percent):
+        self.progress_label.setText(f"Progression : {percent}%")
+
+    def bind(self, questions, responses):
+        """Relie la vue à une nouvelle carte à remplir ; retourne les champs de saisie."""
+        self._set_centered(False)
+        self.controls.show()
+        inputs = []
+        for number, (row, question, expected) in enumerate(
+            zip(
+                self._rows_for(len(questions)),
+                questions,
+                self.split_responses(questions, responses),
+            ),
+            start=1,
+        ):
+            row.bind(number, question, expected)
+            inputs.extend(row.active_inputs)
+        return inputs
+
+    def show_answers(self, questions, responses, show_controls=True):
+        """Affiche les questions avec leurs réponses correctes, centrées."""
+        self._set_centered(True)
+        self.controls.setVisible(show_controls)
+        for number, (row, question, expected) in enumerate(
+            zip(
+                self._rows_for(len(questions)),
+                questions,
+                self.split_responses(questions, responses),
+            ),
+            start=1,
+        ):
+            row.show_answers(number, question, expected)
+
+    def _set_centered(self, centered):
+        policy = QSizePolicy.Expanding if centered else QSizePolicy.Fixed
+        for spacer in (self._top_spacer, self._bottom_spacer):
+            spacer.changeSize(0, 0, QSizePolicy.Minimum, policy)
+        self._layout.invalidate()
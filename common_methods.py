@@ -14,19 +14,9 @@ from PySide6.QtWidgets import (
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtMultimediaWidgets import QVideoWidget
 import os
-import csv
 import json
-import unicodedata
-import logging
-
-# Initialisation du logger ffmpeg (au début du fichier)
-ffmpeg_logger = logging.getLogger("ffmpeg")
-if not ffmpeg_logger.hasHandlers():
-    handler = logging.FileHandler("ffmpeg_errors.log", encoding="utf-8")
-    formatter = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
-    handler.setFormatter(formatter)
-    ffmpeg_logger.addHandler(handler)
-    ffmpeg_logger.setLevel(logging.ERROR)
+import file_utils
+import text_normalization
 
 
 class PlainPasteTextEdit(QTextEdit):
@@ -181,124 +171,21 @@ class MediaUtils:
             Copie ou découpe un fichier média (audio ou vidéo) dans dest_dir.
             Retourne le chemin du fichier copié/découpé.
             """
-            import shutil
-            from common_methods import TextUtils
-            import os
-            from pydub import AudioSegment
-
-            ext = os.path.splitext(src_path)[1].lower()
-            # Correction : générer un nom unique et propre une seule fois
-            if ext in [".mp4", ".avi", ".mov", ".mkv"] and (
-                start_time_ms is not None or end_time_ms is not None
-            ):
-                base, _ = os.path.splitext(os.path.basename(src_path))
-                base = TextUtils.clean_filename(base)
-                file_name = (
-                    f"{base}_clip_{start_time_ms or 0}_{end_time_ms or 'end'}.mp4"
-                )
-            else:
-                file_name = TextUtils.clean_filename(os.path.basename(src_path))
-            dest_path = os.path.join(dest_dir, file_name)
-
-            # Découpage audio
-            if ext in [".mp3", ".wav", ".ogg"]:
-                if start_time_ms is not None and end_time_ms is not None:
-                    audio = AudioSegment.from_file(src_path)
-                    segment = audio[start_time_ms:end_time_ms]
-                    segment.export(dest_path, format="mp3")
-                else:
-                    shutil.copy2(src_path, dest_path)
-            # Découpage vidéo (remplacement MoviePy par ffmpeg)
-            elif ext in [".mp4", ".avi", ".mov", ".mkv"]:
-                import subprocess
-
-                if start_time_ms is not None and end_time_ms is not None:
-                    start_sec = start_time_ms / 1000.0
-                    end_sec = end_time_ms / 1000.0
-                    duration = end_sec - start_sec
-                    ffmpeg_cmd = [
-                        "ffmpeg",
-                        "-y",
-                        "-i",
-                        src_path,
-                        "-ss",
-                        str(start_sec),
-                        "-t",
-                        str(duration),
-                        "-c:v",
-                        "libx264",
-                        "-c:a",
-                        "aac",
-                        dest_path,
-                    ]
-                    try:
-                        result = subprocess.run(
-                            ffmpeg_cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            check=True,
-                        )
-                    except Exception as e:
-                        error_msg = f"Erreur ffmpeg sur {src_path}: {e}\n" + getattr(
-                            e, "stderr", b""
-                        ).decode(errors="ignore")
-                        ffmpeg_logger.error(error_msg)
-                        raise Exception(
-                            f"Erreur lors du découpage vidéo (ffmpeg) : {e}\n{getattr(e, 'stderr', b'').decode(errors='ignore')}"
-                        )
-                else:
-                    shutil.copy2(src_path, dest_path)
-            else:
-                raise Exception("Format de média non supporté.")
-            return dest_path
+            return file_utils.process_media_file(
+                src_path, dest_dir, start_time_ms, end_time_ms
+            )
 
 
 class FavoritesManager:
     @staticmethod
     def get_favorites_filename(db_manager):
-        db_path = getattr(db_manager, "db_path", None)
-        if db_path:
-            db_name = os.path.splitext(os.path.basename(db_path))[0]
-            return f"favourites-{db_name}.csv"
-        return "favourites.csv"
+        """Ancien fichier des favoris, relu seulement pour la migration vers la table."""
+        return file_utils.favorites_filename(getattr(db_manager, "db_path", None))
 
     @staticmethod
     def mark_as_favorite(db_manager, entry_uuid, parent=None, logger=None):
-        fav_file = FavoritesManager.get_favorites_filename(db_manager)
-        # Vérifier si l'UUID existe déjà
-        uuids = set()
-        if os.path.exists(fav_file):
-            try:
-                with open(fav_file, "r", encoding="utf-8") as file:
-                    reader = csv.reader(file)
-                    for row in reader:
-                        if row:
-                            uuids.add(row[0])
-            except Exception as e:
-                if logger:
-                    logger.error(f"Erreur lors de la lecture de {fav_file}: {e}")
-                if parent:
-                    QMessageBox.critical(
-                        parent, "Erreur", "Impossible de vérifier les favoris!"
-                    )
-                return False
-        if entry_uuid in uuids:
-            if parent:
-                QMessageBox.information(
-                    parent, "Info", "Cette entrée est déjà dans les favoris."
-                )
-            return False
         try:
-            with open(fav_file, "a", newline="", encoding="utf-8") as file:
-                writer = csv.writer(file)
-                writer.writerow([entry_uuid])
-            if logger:
-                logger.info(
-                    f"Entrée marquée comme favorite: {entry_uuid} dans {fav_file}"
-                )
-            if parent:
-                QMessageBox.information(parent, "Succès", "Entrée ajoutée aux favoris!")
-            return True
+            added = db_manager.add_favorite(entry_uuid)
         except Exception as e:
             if logger:
                 logger.error(f"Erreur lors de l'ajout aux favoris: {e}")
@@ -307,44 +194,23 @@ class FavoritesManager:
                     parent, "Erreur", "Impossible d'ajouter aux favoris!"
                 )
             return False
+        if not added:
+            if parent:
+                QMessageBox.information(
+                    parent, "Info", "Cette entrée est déjà dans les favoris."
+                )
+            return False
+        if logger:
+            logger.info(f"Entrée marquée comme favorite: {entry_uuid}")
+        if parent:
+            QMessageBox.information(parent, "Succès", "Entrée ajoutée aux favoris!")
+        return True
 
     @staticmethod
     def load_favorite_records(db_manager, parent=None, logger=None):
-        fav_file = FavoritesManager.get_favorites_filename(db_manager)
-        if not os.path.exists(fav_file):
-            if parent:
-                QMessageBox.information(parent, "Info", "Aucun favori trouvé.")
-            return []
-        uuids = set()
-        try:
-            with open(fav_file, "r", encoding="utf-8") as file:
-                reader = csv.reader(file)
-                for row in reader:
-                    if row:
-                        uuids.add(row[0])
-        except Exception as e:
-            if logger:
-                logger.error(f"Erreur lors de la lecture de {fav_file}: {e}")
-            if parent:
-                QMessageBox.critical(
-                    parent, "Erreur", "Impossible de charger les favoris!"
-                )
-            return []
-        if not uuids:
-            if parent:
-                QMessageBox.information(parent, "Info", "Aucun favori trouvé.")
-            return []
-        records = []
-        for uuid in uuids:
-            record = db_manager.fetch_record_by_uuid(uuid)
-            if record:
-                records.append(record)
+        records = db_manager.fetch_favorite_records()
         if not records and parent:
-            QMessageBox.information(
-                parent,
-                "Info",
-                "Aucun enregistrement favori trouvé dans la base de données.",
-            )
+            QMessageBox.information(parent, "Info", "Aucun favori trouvé.")
         return records
 
 
@@ -407,21 +273,8 @@ class DialogUtils:
 class TextUtils:
     @staticmethod
     def normalize_special_characters(text):
-        if not isinstance(text, str):
-            return text
-        text = unicodedata.normalize("NFKC", text)
-        text = text.replace("oe", "œ")
-        return text.translate(str.maketrans({"’": "'"}))
+        return text_normalization.normalize_special_characters(text)
 
     @staticmethod
     def clean_filename(s: str):
-        import unicodedata
-        import re
-
-        s = unicodedata.normalize("NFKD", s)
-        s = "".join(c if not unicodedata.combining(c) else "" for c in s)
-        s = s.replace("æ", "ae").replace("Æ", "AE")
-        s = s.replace("œ", "oe").replace("Œ", "OE")
-        s = re.sub(r"[^\w\s\.-]", "", s)
-        s = re.sub(r"\s+", "_", s)
-        return s
+        return file_utils.clean_filename(s)
@@ -1,19 +1,75 @@
 from __future__ import annotations
 
 import re
-from PySide6.QtSql import QSqlDatabase, QSqlQuery
-from PySide6.QtWidgets import QMessageBox
+import hashlib
+import itertools
+import threading
+from functools import wraps
 from datetime import date, datetime
 import uuid
-from gtts import gTTS  # Importer gTTS pour générer des fichiers audio
 import os
+import csv
 from logger import logger  # Remplacer l'import de logging par le logger centralisé
-from common_methods import MediaUtils
+from file_utils import clean_filename, favorites_filename, process_media_file
+from text_normalization import normalize_special_characters
+from storage import QtSqlBackend, QueryResult, StorageBackend, StorageError
+from tts_service import AudioGenerationService, TTSCache
+
+# Codes de retour de l'insertion (insert_record / insert_records_bulk)
+INSERT_OK = 0
+INSERT_DUPLICATE = 1
+INSERT_ERROR = 2
+
+
+def serialized_write(method):
+    """Une seule écriture à la fois, tous threads confondus : les connexions des
+    threads lisent en parallèle (WAL) mais SQLite n'admet qu'un écrivain.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class DatabaseManager:
+    # Nombre maximal de paramètres par clause IN (limite SQLite : 999)
+    IN_CHUNK_SIZE = 500
+    # Contrainte violée par l'insertion d'un doublon (message des deux moteurs)
+    DEDUP_CONSTRAINT = "records.dedup_key"
+    # Profil de connexion par défaut, complété par la section [database] de config.toml
+    DEFAULT_PRAGMAS = {
+        "journal_mode": "WAL",  # les lectures ne sont plus bloquées par les écritures
+        "synchronous": "NORMAL",  # sûr en WAL, beaucoup moins de fsync
+        "cache_size": -65536,  # en Kio si négatif : 64 Mio
+        "mmap_size": 268435456,  # 256 Mio lus par projection mémoire
+        "temp_store": "MEMORY",
+    }
+    # Ancien fichier global des signalements, importé dans error_reports
+    LEGACY_ERROR_FILE = "entry_error.csv"
+    fts_enabled = False  # mis à jour par _create_search_index
 
-    def __init__(self, db_path: str, language_code: str = "fr"):
+    def __init__(
+        self,
+        db_path: str,
+        language_code: str = "fr",
+        tts_service: AudioGenerationService = None,
+        pragmas: dict = None,
+        backend: type[StorageBackend] = QtSqlBackend,
+    ):
+        # Service de synthèse (pool de threads, moteur remplaçable) ; le cache
+        # d'audios est partagé entre toutes les bases
+        self.tts_service = tts_service or AudioGenerationService(
+            cache=TTSCache.shared()
+        )
+        # Moteur d'accès (QtSql pour l'application, sqlite3 sans interface) ; il
+        # ouvre une connexion par thread, les écritures restent sérialisées
+        self.storage = None
+        self.interactive = backend.interactive
+        self._write_lock = threading.RLock()
+        self._pragmas = {**self.DEFAULT_PRAGMAS, **(pragmas or {})}
         try:
             # Créer le dossier parent si nécessaire
             self.db_path = db_path
@@ -22,26 +78,66 @@ class DatabaseManager:
             if self.db_dir and not os.path.exists(self.db_dir):
                 os.makedirs(self.db_dir, exist_ok=True)
             self.language_code = language_code
-            self.connection_name = (
-                f"connection_{uuid.uuid4()}"  # Utiliser une connexion unique
-            )
             base_name = self.db_name.replace(".db", "-audio")
             self.audio_dir = f"assets/audio/{base_name}"
             os.makedirs(self.audio_dir, exist_ok=True)
-            self.db = QSqlDatabase.addDatabase("QSQLITE", self.connection_name)
-            self.db.setDatabaseName(db_path)
-            if not self.db.open():
-                raise Exception("Failed to open database")
+            self.storage = backend(
+                db_path, on_connect=lambda: self.apply_pragmas(self._pragmas)
+            )
             logger.info(f"{self.db_name} opened.")
             logger.info(f"databased located in {self.db_dir}.")
+            self.apply_pragmas(self._pragmas)
             self.create_tables()
         except Exception as e:
-            QMessageBox.critical(None, "Erreur", str(e))
+            self._report_error(e)
+
+    def _report_error(self, error: Exception):
+        """Erreur d'accès aux données : boîte de dialogue dans l'application,
+        exception propagée avec un moteur sans interface (scripts, tests).
+        """
+        if not self.interactive:
+            raise error
+        from PySide6.QtWidgets import QMessageBox
+
+        QMessageBox.critical(None, "Erreur", str(error))
+
+    def release_thread_connection(self):
+        """Ferme la connexion du thread courant ; à appeler en fin de travail par
+        les workers. Sans effet dans le thread créateur.
+        """
+        if self.storage is not None:
+            self.storage.release_thread_connection()
+
+    def apply_pragmas(self, pragmas: dict) -> dict:
+        """Applique le profil de connexion (PRAGMA) et journalise les valeurs
+        effectivement retenues par SQLite. Retourne ces valeurs.
+        """
+        applied = {}
+        for name, value in pragmas.items():
+            if name not in self.DEFAULT_PRAGMAS:
+                logger.warning(f"{self.db_name}: PRAGMA {name} ignoré (non supporté).")
+                continue
+            if isinstance(value, bool) or not (
+                isinstance(value, int) or str(value).isalpha()
+            ):
+                logger.warning(
+                    f"{self.db_name}: valeur invalide pour PRAGMA {name} : {value!r}"
+                )
+                continue
+            try:
+                self._run_query(f"PRAGMA {name} = {value}")
+                rows = self._run_query(f"PRAGMA {name}").rows
+                applied[name] = rows[0][0] if rows else None
+            except Exception as e:
+                logger.warning(f"{self.db_name}: PRAGMA {name} non appliqué : {e}")
+        logger.info(
+            f"{self.db_name}: profil de connexion "
+            + ", ".join(f"{name}={value}" for name, value in applied.items())
+        )
+        return applied
 
     def create_tables(self):
-        query = QSqlQuery(self.db)
-        query.exec_(
-            """
+        self._run_query("""
             CREATE TABLE IF NOT EXISTS records (
                 UUID TEXT PRIMARY KEY,
                 media_file TEXT NOT NULL,
@@ -49,22 +145,262 @@ class DatabaseManager:
                 response TEXT NOT NULL,
                 creation_date TEXT NOT NULL,
                 custom_media INTEGER DEFAULT 0,
-                attribution TEXT NOT NULL DEFAULT 'no-attribution'
+                attribution TEXT NOT NULL DEFAULT 'no-attribution',
+                dedup_key TEXT
+            )
+            """)
+        self._migrate_dedup_key()
+        self._create_date_index()
+        self._create_search_index()
+        self._create_review_table()
+        self._create_review_log_table()
+        self._create_stats_rollups()
+        self._create_favorites_table()
+        self._create_error_reports_table()
+
+    def _create_review_table(self):
+        """État de révision espacée par entrée (SM-2), indexé par date d'échéance."""
+        self._run_query("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                UUID TEXT PRIMARY KEY,
+                ease REAL NOT NULL,
+                interval INTEGER NOT NULL,
+                repetitions INTEGER NOT NULL,
+                due_date TEXT NOT NULL,
+                last_review TEXT
+            )
+            """)
+        self._run_query(
+            "CREATE INDEX IF NOT EXISTS idx_reviews_due_date ON reviews(due_date)"
+        )
+
+    def _create_date_index(self):
+        """Index sur creation_date : les sessions et filtres par plage de dates lisent
+        seulement la plage demandée, et les comptages (COUNT(*) ... BETWEEN) se font
+        dans l'index sans lire la table.
+        """
+        self._run_query(
+            "CREATE INDEX IF NOT EXISTS idx_records_creation_date ON records(creation_date)"
+        )
+
+    def explain(self, query_text: str, params: list = None) -> list[str]:
+        """Plan d'exécution SQLite (EXPLAIN QUERY PLAN) : une ligne par étape."""
+        query = self._run_query(f"EXPLAIN QUERY PLAN {query_text}", params)
+        return [row[3] for row in query.rows]
+
+    def _create_search_index(self):
+        """Index plein texte (FTS5) sur question, réponse et attribution, tenu à jour
+        par des triggers. Sans FTS5, search() se rabat sur LIKE.
+        """
+        try:
+            query = self._run_query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'records_fts'"
             )
+            exists = bool(query.rows)
+            self._run_query("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+                    question, response, attribution,
+                    content='records', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+                """)
+            self._run_query("""
+                CREATE TRIGGER IF NOT EXISTS records_fts_insert AFTER INSERT ON records BEGIN
+                    INSERT INTO records_fts(rowid, question, response, attribution)
+                    VALUES (new.rowid, new.question, new.response, new.attribution);
+                END
+                """)
+            self._run_query("""
+                CREATE TRIGGER IF NOT EXISTS records_fts_delete AFTER DELETE ON records BEGIN
+                    INSERT INTO records_fts(records_fts, rowid, question, response, attribution)
+                    VALUES ('delete', old.rowid, old.question, old.response, old.attribution);
+                END
+                """)
+            self._run_query("""
+                CREATE TRIGGER IF NOT EXISTS records_fts_update
+                AFTER UPDATE OF question, response, attribution ON records BEGIN
+                    INSERT INTO records_fts(records_fts, rowid, question, response, attribution)
+                    VALUES ('delete', old.rowid, old.question, old.response, old.attribution);
+                    INSERT INTO records_fts(rowid, question, response, attribution)
+                    VALUES (new.rowid, new.question, new.response, new.attribution);
+                END
+                """)
+            if not exists:
+                # Base existante : indexer les entrées déjà présentes
+                self._run_query(
+                    "INSERT INTO records_fts(records_fts) VALUES ('rebuild')"
+                )
+            self.fts_enabled = True
+        except Exception as e:
+            self.fts_enabled = False
+            logger.warning(f"{self.db_name}: recherche plein texte indisponible : {e}")
+
+    @staticmethod
+    def _fts_match_expression(text: str) -> str:
+        """Chaque mot devient un préfixe ("mot"*), tous les mots sont requis."""
+        tokens = re.findall(r"\w+", text)
+        return " ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+    def search_filter(self, text: str) -> tuple:
+        """Filtre (where, params) des entrées correspondant à `text`, utilisable avec
+        count_records et fetch_records_page.
+        """
+        if self.fts_enabled:
+            expression = self._fts_match_expression(text)
+            if not expression:
+                return "", []
+            return (
+                "rowid IN (SELECT rowid FROM records_fts WHERE records_fts MATCH ?)",
+                [expression],
+            )
+        columns = ["question", "response", "attribution"]
+        # %, _ et \ saisis par l'utilisateur sont cherchés tels quels
+        pattern = re.sub(r"([%_\\])", r"\\\1", text.strip())
+        return (
+            " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in columns),
+            [f"%{pattern}%"] * len(columns),
+        )
+
+    def materialize_search(self, text: str, refine: bool = False) -> tuple:
+        """Enregistre les entrées correspondant à `text` dans la table temporaire
+        search_results et retourne le filtre (where, params) qui la lit : le comptage
+        et chaque page n'ont plus à refaire la recherche. Avec `refine=True` (le texte
+        prolonge la recherche précédente), seules les entrées déjà retenues sont filtrées.
+        """
+        where, params = self.search_filter(text)
+        if not where:
+            return "", []
+        try:
+            self._run_query(
+                "CREATE TEMP TABLE IF NOT EXISTS search_results (record_rowid INTEGER PRIMARY KEY)"
+            )
+            if refine:
+                self._run_query(
+                    f"""
+                    DELETE FROM temp.search_results WHERE record_rowid NOT IN (
+                        SELECT rowid FROM records
+                        WHERE rowid IN (SELECT record_rowid FROM temp.search_results)
+                        AND ({where})
+                    )
+                    """,
+                    params,
+                )
+            else:
+                self._run_query("DELETE FROM temp.search_results")
+                self._run_query(
+                    f"INSERT INTO temp.search_results SELECT rowid FROM records WHERE {where}",
+                    params,
+                )
+        except Exception as e:
+            logger.error(f"Échec de la recherche incrémentale, filtre direct : {e}")
+            return where, params
+        return "rowid IN (SELECT record_rowid FROM temp.search_results)", []
+
+    def search(self, text: str, limit: int = 100, offset: int = 0) -> list:
+        """Recherche plein texte insensible aux accents, par préfixe de mots,
+        triée par pertinence.
+        """
+        if self.fts_enabled:
+            expression = self._fts_match_expression(text)
+            if not expression:
+                return []
+            query_text = """
+                SELECT r.UUID, r.media_file, r.question, r.response, r.creation_date,
+                       r.attribution
+                FROM records_fts
+                JOIN records r ON r.rowid = records_fts.rowid
+                WHERE records_fts MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
             """
+            return self._fetch_records(query_text, [expression, limit, offset])
+        where, params = self.search_filter(text)
+        query_text = f"""
+            SELECT UUID, media_file, question, response, creation_date, attribution
+            FROM records
+            WHERE {where}
+            ORDER BY rowid
+            LIMIT ? OFFSET ?
+        """
+        return self._fetch_records(query_text, [*params, limit, offset])
+
+    def _run_query(self, query_text: str, params: list = None) -> QueryResult:
+        """Prépare et exécute une requête dans la connexion du thread courant ;
+        lève StorageError en cas d'échec.
+        """
+        return self.storage.execute(query_text, params)
+
+    def _run_each(self, query_text: str, rows, error_message: str):
+        """Exécute la requête pour chaque ligne de paramètres (dans la transaction
+        en cours) ; lève StorageError à la première ligne en échec.
+        """
+        for error in self.storage.execute_each(query_text, rows):
+            if error:
+                raise StorageError(f"{error_message}: {error}")
+
+    def _column_exists(self, table: str, column: str) -> bool:
+        query = self._run_query(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in query.rows)
+
+    @staticmethod
+    def make_dedup_key(question: str, response: str) -> str:
+        """Clé de déduplication : empreinte du couple (question, réponse) normalisé."""
+        normalized = "\x1f".join(
+            normalize_special_characters(text or "").strip()
+            for text in (question, response)
         )
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
 
-    def auto_generate_audio(
-        self, question: str, response: str, language_code: str
-    ) -> str:
-        """Génère un fichier audio basé sur la question et toutes les réponses séparées par ';'.
-        Tous les (?) de la question sont remplacés dans l'ordre par les réponses.
-        Retourne le chemin du fichier généré.
+    def _migrate_dedup_key(self):
+        """Ajoute la colonne dedup_key (bases existantes), la remplit et l'indexe.
+        Les doublons déjà présents gardent une clé NULL pour ne pas violer l'index unique.
+        """
+        if not self._column_exists("records", "dedup_key"):
+            self._run_query("ALTER TABLE records ADD COLUMN dedup_key TEXT")
+            logger.info(f"{self.db_name}: colonne dedup_key ajoutée.")
+
+        pending = self._run_query(
+            "SELECT rowid, question, response FROM records WHERE dedup_key IS NULL"
+        ).rows
+        if pending:
+            known_keys = {
+                row[0]
+                for row in self._run_query(
+                    "SELECT dedup_key FROM records WHERE dedup_key IS NOT NULL"
+                ).rows
+            }
+            duplicates = 0
+            updates = []
+            for rowid, question, response in pending:
+                key = self.make_dedup_key(question, response)
+                if key in known_keys:
+                    duplicates += 1
+                    continue
+                known_keys.add(key)
+                updates.append((key, rowid))
+            with self.storage.transaction():
+                self._run_each(
+                    "UPDATE records SET dedup_key = ? WHERE rowid = ?",
+                    updates,
+                    "Failed to backfill dedup_key",
+                )
+            if duplicates:
+                logger.warning(
+                    f"{self.db_name}: {duplicates} doublon(s) existant(s) laissé(s) sans dedup_key."
+                )
+
+        self._run_query(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_records_dedup_key ON records(dedup_key)"
+        )
+
+    @staticmethod
+    def build_audio_text(question: str, response: str) -> str:
+        """Texte à prononcer : tous les (?) de la question sont remplacés dans l'ordre
+        par les réponses séparées par ';'.
         """
         responses = [r.strip() for r in response.split(";") if r.strip()]
         if not responses:
             raise Exception("Aucune réponse fournie pour la génération audio.")
-        q = question
 
         def replace_nth(match):
             replace_nth.idx += 1
@@ -75,23 +411,85 @@ class DatabaseManager:
             )
 
         replace_nth.idx = 0
-        audio_text = re.sub(r"\(\?\)", replace_nth, q)
-
-        from common_methods import TextUtils
+        return re.sub(r"\(\?\)", replace_nth, question)
 
+    def _auto_audio_path(
+        self, response: str, audio_text: str, reserved: set = None
+    ) -> str:
+        """Chemin du fichier audio généré, nommé d'après la première réponse et un
+        hachage court du texte prononcé. Un chemin déjà pris (sur disque ou dans
+        `reserved`, les chemins attribués dans le même lot) reçoit un suffixe.
+        """
+        first_response = next(r.strip() for r in response.split(";") if r.strip())
         # Utiliser toute la chaîne si elle fait moins de 20 caractères
-        base_name = TextUtils.clean_filename(
-            responses[0][:20] if len(responses[0]) > 20 else responses[0]
+        base_name = clean_filename(
+            first_response[:20] if len(first_response) > 20 else first_response
         )
-        file_name = f"{base_name}.mp3"
-        media_file_path = os.path.join(self.audio_dir, file_name)
-        tts = gTTS(text=audio_text, lang=language_code)
+        digest = hashlib.sha1(audio_text.encode("utf-8")).hexdigest()[:8]
+        base_name = f"{base_name}_{digest}"
+        media_file_path = os.path.join(self.audio_dir, f"{base_name}.mp3")
+        suffix = 1
+        while os.path.exists(media_file_path) or (
+            reserved is not None and media_file_path in reserved
+        ):
+            suffix += 1
+            media_file_path = os.path.join(self.audio_dir, f"{base_name}_{suffix}.mp3")
+        return media_file_path
+
+    def auto_generate_audio(
+        self, question: str, response: str, language_code: str
+    ) -> str:
+        """Génère un fichier audio basé sur la question et toutes les réponses séparées par ';'.
+        Tous les (?) de la question sont remplacés dans l'ordre par les réponses.
+        Retourne le chemin du fichier généré.
+        """
+        audio_text = self.build_audio_text(question, response)
+        media_file_path = self._auto_audio_path(response, audio_text)
         try:
-            tts.save(media_file_path)
+            self.tts_service.synthesize(audio_text, language_code, media_file_path)
         except Exception as e:
             raise Exception(f"Échec de la génération de l'audio : {e}")
         return media_file_path
 
+    def prepare_rows_media(self, rows: list) -> list:
+        """Prépare les médias d'un lot de lignes (voir prepare_row_media).
+        Les audios automatiques sont soumis ensemble au pool de synthèse puis collectés.
+        Retourne, pour chaque ligne, la ligne préparée ou l'exception rencontrée.
+        """
+        results = [None] * len(rows)
+        pending = []  # (index, ligne, future)
+        reserved_paths = set()
+        for index, row in enumerate(rows):
+            try:
+                if row.get("media_file"):
+                    results[index] = self.prepare_row_media(row)
+                    continue
+                prepared = dict(row)
+                prepared["creation_date"] = self._normalize_creation_date(
+                    row.get("creation_date")
+                )
+                audio_text = self.build_audio_text(
+                    row.get("question", ""), row.get("response", "")
+                )
+                prepared["media_file"] = self._auto_audio_path(
+                    row.get("response", ""), audio_text, reserved_paths
+                )
+                prepared["custom_media"] = 0
+                reserved_paths.add(prepared["media_file"])
+                future = self.tts_service.submit(
+                    audio_text, self.language_code, prepared["media_file"]
+                )
+                pending.append((index, prepared, future))
+            except Exception as e:
+                results[index] = e
+        for index, prepared, future in pending:
+            try:
+                future.result()
+                results[index] = prepared
+            except Exception as e:
+                results[index] = Exception(f"Échec de la génération de l'audio : {e}")
+        return results
+
     def insert_record(
         self,
         media_file: str,
@@ -105,113 +503,286 @@ class DatabaseManager:
     ):
         try:
             # Vérifier si un entrée avec la même question et réponse existe déjà (AVANT toute opération)
-            query = QSqlQuery(self.db)
-            query.prepare(
-                """
-                SELECT COUNT(*) FROM records
-                WHERE question = ? AND response = ?
-                """
-            )
-            query.addBindValue(question)
-            query.addBindValue(response)
-            if not query.exec_():
-                raise Exception(
-                    f"Failed to check for duplicate record: {query.lastError().text()}"
-                )
-            query.next()
-            if query.value(0) > 0:
-                return 1
+            dedup_key = self.make_dedup_key(question, response)
+            if self._dedup_key_taken(dedup_key):
+                return INSERT_DUPLICATE
 
             UUID = UUID or str(uuid.uuid4())
-            if creation_date:
-                try:
-                    datetime.strptime(creation_date, "%Y-%m-%d")
-                except ValueError:
-                    raise Exception("Le format de la date doit être 'YYYY-MM-DD'")
-            else:
-                creation_date = datetime.now().strftime("%Y-%m-%d")
+            creation_date = self._normalize_creation_date(creation_date)
+            # Préparation du média hors du verrou d'écriture, comme _insert_batch
+            media_file, custom_media = self.prepare_media(
+                media_file, question, response, start_time_ms, end_time_ms
+            )
 
-            if not media_file:
-                media_file = self.auto_generate_audio(
-                    question, response, self.language_code
-                )
-                custom_media = 0
-            else:
-                try:
-                    media_file = MediaUtils.MediaFileProcessing.process_media_file(
-                        media_file, self.audio_dir, start_time_ms, end_time_ms
+            with self._write_lock:
+                # Une autre écriture a pu ajouter la même entrée pendant la préparation
+                if self._dedup_key_taken(dedup_key):
+                    error = "entrée ajoutée entre-temps par une autre écriture"
+                else:
+                    (error,) = self.storage.execute_each(
+                        """
+                        INSERT INTO records (UUID, media_file, question, response, creation_date, custom_media, attribution, dedup_key)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        [
+                            (
+                                UUID,
+                                media_file,
+                                normalize_special_characters(question),
+                                normalize_special_characters(response),
+                                creation_date,
+                                custom_media,
+                                attribution or "no-attribution",
+                                dedup_key,
+                            )
+                        ],
                     )
-                except Exception as e:
-                    raise Exception(f"Erreur lors du traitement du média : {e}")
-                custom_media = 1
+                if error:
+                    self._discard_unused_media(media_file)
+            if error:
+                logger.error(f"Échec de l'insertion de '{question}' : {error}")
+                return INSERT_DUPLICATE
+            return INSERT_OK
+        except Exception as e:
+            self._report_error(e)
 
-            query.prepare(
-                """
-                INSERT INTO records (UUID, media_file, question, response, creation_date, custom_media, attribution)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """
+    @staticmethod
+    def _normalize_creation_date(creation_date: str = None) -> str:
+        """Valide une date 'YYYY-MM-DD' ou retourne la date du jour si absente."""
+        if creation_date:
+            try:
+                datetime.strptime(creation_date, "%Y-%m-%d")
+            except ValueError:
+                raise Exception("Le format de la date doit être 'YYYY-MM-DD'")
+            return creation_date
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def prepare_media(
+        self,
+        media_file: str,
+        question: str,
+        response: str,
+        start_time_ms: int = None,
+        end_time_ms: int = None,
+    ) -> tuple[str, int]:
+        """Génère l'audio automatique ou copie/découpe le média fourni.
+        Retourne (chemin du média, custom_media).
+        """
+        if not media_file:
+            return self.auto_generate_audio(question, response, self.language_code), 0
+        try:
+            media_file = process_media_file(
+                media_file, self.audio_dir, start_time_ms, end_time_ms
             )
-            query.addBindValue(UUID)
-            query.addBindValue(media_file)
-            from common_methods import TextUtils
-
-            query.addBindValue(TextUtils.normalize_special_characters(question))
-            query.addBindValue(TextUtils.normalize_special_characters(response))
-            query.addBindValue(creation_date)
-            query.addBindValue(custom_media)
-            query.addBindValue(attribution or "no-attribution")
-            if not query.exec_():
-                return 1
-                raise Exception(f"Failed to insert record: {query.lastError().text()}")
-            else:
-                return 0
         except Exception as e:
-            QMessageBox.critical(None, "Erreur", str(e))
+            raise Exception(f"Erreur lors du traitement du média : {e}")
+        return media_file, 1
+
+    def find_existing_keys(self, keys: list) -> set:
+        """Retourne les clés de déduplication déjà présentes dans la base (requêtes IN par tranches)."""
+        existing = set()
+        keys = list(keys)
+        for start in range(0, len(keys), self.IN_CHUNK_SIZE):
+            chunk = keys[start : start + self.IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            query = self._run_query(
+                f"SELECT dedup_key FROM records WHERE dedup_key IN ({placeholders})",
+                chunk,
+            )
+            existing.update(row[0] for row in query.rows)
+        return existing
+
+    def prepare_row_media(self, row: dict) -> dict:
+        """Retourne une copie de `row` avec la date validée et le média préparé
+        (clé `custom_media` ajoutée), prête pour insert_records_bulk(media_ready=True).
+        """
+        prepared = dict(row)
+        prepared["creation_date"] = self._normalize_creation_date(
+            row.get("creation_date")
+        )
+        prepared["media_file"], prepared["custom_media"] = self.prepare_media(
+            row.get("media_file", ""),
+            row.get("question", ""),
+            row.get("response", ""),
+            row.get("start_time_ms"),
+            row.get("end_time_ms"),
+        )
+        return prepared
+
+    def insert_records_bulk(
+        self,
+        rows,
+        batch_size: int = 500,
+        progress_callback=None,
+        media_ready: bool = False,
+    ) -> list[int]:
+        """Insère des entrées par lots, chaque lot dans une seule transaction.
+        `rows` est un itérable de dicts (media_file, question, response, start_time_ms,
+        end_time_ms, UUID, creation_date, attribution). Retourne un code par ligne :
+        INSERT_OK, INSERT_DUPLICATE ou INSERT_ERROR. `progress_callback(n)` reçoit
+        le nombre de lignes traitées après chaque lot. Avec `media_ready=True`, les
+        lignes viennent de prepare_row_media et le média n'est pas retraité.
+        """
+        statuses = []
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            statuses.extend(self._insert_batch(batch, media_ready))
+            if progress_callback:
+                progress_callback(len(statuses))
+        return statuses
+
+    def _insert_batch(self, batch: list, media_ready: bool = False) -> list[int]:
+        keys = [
+            self.make_dedup_key(row.get("question", ""), row.get("response", ""))
+            for row in batch
+        ]
+        existing = self.find_existing_keys(keys)
+        statuses = [INSERT_ERROR] * len(batch)
+        candidates = []  # (index, ligne, clé)
+        for index, (row, key) in enumerate(zip(batch, keys)):
+            if key in existing:
+                statuses[index] = INSERT_DUPLICATE
+                continue
+            existing.add(key)  # doublons à l'intérieur du même lot
+            candidates.append((index, row, key))
+        if not media_ready:
+            media_results = self.prepare_rows_media([row for _, row, _ in candidates])
+            ready = []
+            for (index, row, key), result in zip(candidates, media_results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Échec de la préparation de '{row.get('question', '')}' : {result}"
+                    )
+                    continue
+                ready.append((index, result, key))
+            candidates = ready
+
+        prepared = []  # (index, valeurs à lier)
+        for index, row, key in candidates:
+            prepared.append(
+                (
+                    index,
+                    [
+                        row.get("UUID") or str(uuid.uuid4()),
+                        row["media_file"],
+                        normalize_special_characters(row.get("question", "")),
+                        normalize_special_characters(row.get("response", "")),
+                        row["creation_date"],
+                        row["custom_media"],
+                        row.get("attribution") or "no-attribution",
+                        key,
+                    ],
+                )
+            )
+        if not prepared:
+            return statuses
+
+        insert_sql = """
+            INSERT INTO records (UUID, media_file, question, response, creation_date, custom_media, attribution, dedup_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        # Une requête préparée exécutée ligne par ligne dans la transaction : l'execBatch
+        # du pilote QSQLITE est émulé et devient quadratique sur les gros lots. Une
+        # ligne en échec (ex. UUID déjà présent) n'annule que sa propre instruction.
+        with self._write_lock:
+            with self.storage.transaction():
+                errors = self.storage.execute_each(
+                    insert_sql, [values for _, values in prepared]
+                )
+            for (index, values), error in zip(prepared, errors):
+                if not error:
+                    statuses[index] = INSERT_OK
+                    continue
+                # Même entrée validée entre-temps par une autre écriture : doublon,
+                # comme dans insert_record
+                if self.DEDUP_CONSTRAINT in error:
+                    statuses[index] = INSERT_DUPLICATE
+                else:
+                    logger.error(f"Échec de l'insertion de '{values[2]}' : {error}")
+                if values[5] == 0:  # audio généré pour cette ligne
+                    self._discard_unused_media(values[1])
+        return statuses
+
+    # Colonnes lues par _fetch_records, par nom (les absentes sont ignorées)
+    RECORD_FIELDS = (
+        "UUID",
+        "media_file",
+        "question",
+        "response",
+        "creation_date",
+        "attribution",
+        "rowid",
+    )
 
     def _fetch_records(self, query_text: str, params: list = None) -> list:
-        """Méthode générique pour exécuter une requête SELECT et récupérer les résultats."""
+        """Méthode générique pour exécuter une requête SELECT et récupérer les résultats.
+        Les colonnes sont associées par nom : la requête ne sélectionne que ce qu'elle
+        utilise (RECORD_FIELDS), dans n'importe quel ordre.
+        """
         try:
-            query = QSqlQuery(self.db)
-            query.prepare(query_text)
-            if params:
-                for param in params:
-                    query.addBindValue(param)
-            if not query.exec_():
-                raise Exception(f"Failed to execute query: {query.lastError().text()}")
-
+            query = self._run_query(query_text, params)
+            fields = [
+                (name, index)
+                for index, name in enumerate(query.columns)
+                if name in self.RECORD_FIELDS
+            ]
             records = []
-            while query.next():
-                records.append(
-                    {
-                        "UUID": query.value(0),
-                        "media_file": query.value(1),
-                        "question": query.value(2),
-                        "response": query.value(3),
-                        "creation_date": query.value(4),
-                        "attribution": (
-                            query.value(6)
-                            if query.record().count() > 6
-                            else "no-attribution"
-                        ),
-                    }
-                )
+            for row in query.rows:
+                entry = {name: row[index] for name, index in fields}
+                entry.setdefault("attribution", "no-attribution")
+                records.append(entry)
             return records
         except Exception as e:
-            QMessageBox.critical(None, "Erreur", str(e))
+            self._report_error(e)
             return []
 
     def fetch_all_records(self):
         """Récupère tous les enregistrements de la base de données."""
         query_text = """
-            SELECT UUID, media_file, question, response, creation_date, custom_media, attribution
+            SELECT UUID, media_file, question, response, creation_date, attribution
             FROM records
         """
         return self._fetch_records(query_text)
 
+    def count_records(self, where: str = "", params: list = None) -> int:
+        """Nombre d'entrées correspondant au filtre SQL `where` (sans le mot-clé WHERE)."""
+        try:
+            query = self._run_query(
+                f"SELECT COUNT(*) FROM records {'WHERE ' + where if where else ''}",
+                params,
+            )
+            return query.rows[0][0] if query.rows else 0
+        except Exception as e:
+            self._report_error(e)
+            return 0
+
+    def fetch_records_page(
+        self,
+        limit: int,
+        after_rowid: int = 0,
+        where: str = "",
+        params: list = None,
+    ) -> list:
+        """Récupère une page d'entrées par pagination sur rowid (keyset) : seules les
+        `limit` entrées suivant `after_rowid` sont lues, quelle que soit la taille de
+        la base. Chaque dict contient en plus son `rowid`, à repasser pour la page suivante.
+        """
+        query_text = f"""
+            SELECT UUID, media_file, question, response, creation_date, attribution, rowid
+            FROM records
+            WHERE rowid > ? {'AND (' + where + ')' if where else ''}
+            ORDER BY rowid
+            LIMIT ?
+        """
+        return self._fetch_records(query_text, [after_rowid, *(params or []), limit])
+
     def fetch_record_by_creation_date(self, start: date, finish: date):
         """Récupère les enregistrements entre deux dates."""
         query_text = """
-            SELECT UUID, media_file, question, response, creation_date, custom_media, attribution
+            SELECT UUID, media_file, question, response, creation_date, attribution
             FROM records
             WHERE creation_date BETWEEN ? AND ?
         """
@@ -221,13 +792,500 @@ class DatabaseManager:
     def fetch_record_by_uuid(self, uuid: str):
         """Récupère un enregistrement spécifique depuis la base de données par UUID."""
         query_text = """
-            SELECT UUID, media_file, question, response, creation_date, custom_media, attribution
+            SELECT UUID, media_file, question, response, creation_date, attribution
             FROM records
             WHERE UUID = ?
         """
         records = self._fetch_records(query_text, [uuid])
         return records[0] if records else None
 
+    def fetch_records_by_uuids(self, uuids) -> list:
+        """Récupère plusieurs enregistrements en quelques requêtes IN (par tranches),
+        dans l'ordre des UUID fournis. Les UUID introuvables sont ignorés.
+        """
+        uuids = list(uuids)
+        by_uuid = {}
+        unique_uuids = list(dict.fromkeys(uuids))
+        for start in range(0, len(unique_uuids), self.IN_CHUNK_SIZE):
+            chunk = unique_uuids[start : start + self.IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            query_text = f"""
+                SELECT UUID, media_file, question, response, creation_date, attribution
+                FROM records
+                WHERE UUID IN ({placeholders})
+            """
+            for record in self._fetch_records(query_text, chunk):
+                by_uuid[record["UUID"]] = record
+        return [dict(by_uuid[uuid]) for uuid in uuids if uuid in by_uuid]
+
+    def _create_review_log_table(self):
+        """Journal des réponses (une ligne par carte vérifiée), en ajout seul."""
+        self._run_query("""
+            CREATE TABLE IF NOT EXISTS review_log (
+                id INTEGER PRIMARY KEY,
+                UUID TEXT,
+                reviewed_at TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                correct INTEGER,
+                near_miss INTEGER,
+                total INTEGER,
+                latency_ms INTEGER
+            )
+            """)
+        self._run_query(
+            "CREATE INDEX IF NOT EXISTS idx_review_log_reviewed_at ON review_log(reviewed_at)"
+        )
+        self._run_query(
+            "CREATE INDEX IF NOT EXISTS idx_review_log_uuid ON review_log(UUID, reviewed_at)"
+        )
+
+    @serialized_write
+    def log_reviews(self, entries: list) -> bool:
+        """Ajoute un lot de réponses (dicts de ReviewLogBuffer) en une transaction."""
+        keys = (
+            "UUID",
+            "reviewed_at",
+            "mode",
+            "correct",
+            "near_miss",
+            "total",
+            "latency_ms",
+        )
+        try:
+            with self.storage.transaction():
+                self._run_each(
+                    """
+                    INSERT INTO review_log (UUID, reviewed_at, mode, correct, near_miss, total, latency_ms)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [[entry.get(key) for key in keys] for entry in entries],
+                    "Failed to log reviews",
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture du journal des réponses : {e}")
+            return False
+
+    def _create_stats_rollups(self):
+        """
+        Agrégats matérialisés du journal des réponses, par jour, par entrée et par
+        attribution, tenus à jour par un trigger à chaque ligne ajoutée : les
+        statistiques se lisent sans parcourir review_log.
+        """
+        query = self._run_query(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_daily'"
+        )
+        exists = bool(query.rows)
+        self._run_query("""
+            CREATE TABLE IF NOT EXISTS stats_daily (
+                day TEXT PRIMARY KEY,
+                retrieval_count INTEGER NOT NULL DEFAULT 0,
+                review_count INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                near_miss INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                latency_sum INTEGER NOT NULL DEFAULT 0,
+                latency_count INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+        self._run_query("""
+            CREATE TABLE IF NOT EXISTS stats_card (
+                UUID TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                near_miss INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                last_reviewed TEXT
+            )
+            """)
+        self._run_query(
+            "CREATE INDEX IF NOT EXISTS idx_stats_card_misses ON stats_card(misses, attempts)"
+        )
+        self._run_query("""
+            CREATE TABLE IF NOT EXISTS stats_attribution (
+                attribution TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0,
+                near_miss INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+        # Les cartes du mode revue (sans réponses notées) ne comptent que par jour
+        self._run_query("""
+            CREATE TRIGGER IF NOT EXISTS review_log_rollup AFTER INSERT ON review_log BEGIN
+                INSERT INTO stats_daily (day, retrieval_count, review_count, correct,
+                                         near_miss, total, latency_sum, latency_count)
+                VALUES (substr(new.reviewed_at, 1, 10), new.mode = 'retrieval',
+                        new.mode = 'review', COALESCE(new.correct, 0),
+                        COALESCE(new.near_miss, 0), COALESCE(new.total, 0),
+                        COALESCE(new.latency_ms, 0), new.latency_ms IS NOT NULL)
+                ON CONFLICT(day) DO UPDATE SET
+                    retrieval_count = retrieval_count + excluded.retrieval_count,
+                    review_count = review_count + excluded.review_count,
+                    correct = correct + excluded.correct,
+                    near_miss = near_miss + excluded.near_miss,
+                    total = total + excluded.total,
+                    latency_sum = latency_sum + excluded.latency_sum,
+                    latency_count = latency_count + excluded.latency_count;
+                INSERT INTO stats_card (UUID, attempts, correct, near_miss, total,
+                                        misses, last_reviewed)
+                SELECT new.UUID, 1, new.correct, COALESCE(new.near_miss, 0), new.total,
+                       new.total - new.correct - COALESCE(new.near_miss, 0),
+                       new.reviewed_at
+                WHERE new.total IS NOT NULL AND new.UUID IS NOT NULL
+                ON CONFLICT(UUID) DO UPDATE SET
+                    attempts = attempts + 1,
+                    correct = correct + excluded.correct,
+                    near_miss = near_miss + excluded.near_miss,
+                    total = total + excluded.total,
+                    misses = misses + excluded.misses,
+                    last_reviewed = excluded.last_reviewed;
+                INSERT INTO stats_attribution (attribution, attempts, correct,
+                                               near_miss, total)
+                SELECT COALESCE((SELECT attribution FROM records WHERE UUID = new.UUID),
+                                'no-attribution'),
+                       1, new.correct, COALESCE(new.near_miss, 0), new.total
+                WHERE new.total IS NOT NULL
+                ON CONFLICT(attribution) DO UPDATE SET
+                    attempts = attempts + 1,
+                    correct = correct + excluded.correct,
+                    near_miss = near_miss + excluded.near_miss,
+                    total = total + excluded.total;
+            END
+            """)
+        if not exists:
+            self._rebuild_stats_rollups()
+
+    def _rebuild_stats_rollups(self):
+        """Recalcule les agrégats depuis review_log (création sur une base existante)."""
+        with self.storage.transaction():
+            for table in ("stats_daily", "stats_card", "stats_attribution"):
+                self._run_query(f"DELETE FROM {table}")
+            self._run_query("""
+                INSERT INTO stats_daily
+                SELECT substr(reviewed_at, 1, 10), SUM(mode = 'retrieval'),
+                       SUM(mode = 'review'), COALESCE(SUM(correct), 0),
+                       COALESCE(SUM(near_miss), 0), COALESCE(SUM(total), 0),
+                       COALESCE(SUM(latency_ms), 0), COUNT(latency_ms)
+                FROM review_log
+                GROUP BY substr(reviewed_at, 1, 10)
+                """)
+            self._run_query("""
+                INSERT INTO stats_card
+                SELECT UUID, COUNT(*), SUM(correct), COALESCE(SUM(near_miss), 0),
+                       SUM(total),
+                       SUM(total - correct - COALESCE(near_miss, 0)),
+                       MAX(reviewed_at)
+                FROM review_log
+                WHERE total IS NOT NULL AND UUID IS NOT NULL
+                GROUP BY UUID
+                """)
+            self._run_query("""
+                INSERT INTO stats_attribution
+                SELECT COALESCE(r.attribution, 'no-attribution'), COUNT(*),
+                       SUM(l.correct), COALESCE(SUM(l.near_miss), 0), SUM(l.total)
+                FROM review_log l
+                LEFT JOIN records r ON r.UUID = l.UUID
+                WHERE l.total IS NOT NULL
+                GROUP BY COALESCE(r.attribution, 'no-attribution')
+                """)
+
+    def fetch_usage_stats(self, recent_days: int = 5) -> dict:
+        """Totaux (cartes par mode, réponses exactes, presque justes et données,
+        latence moyenne) et derniers jours d'activité, lus dans stats_daily.
+        """
+        stats = {
+            "retrieval_count": 0,
+            "review_count": 0,
+            "correct_count": 0,
+            "near_miss_count": 0,
+            "answered_count": 0,
+            "average_latency_ms": None,
+            "dates": [],
+        }
+        try:
+            query = self._run_query("""
+                SELECT COALESCE(SUM(retrieval_count), 0), COALESCE(SUM(review_count), 0),
+                       COALESCE(SUM(correct), 0), COALESCE(SUM(near_miss), 0),
+                       COALESCE(SUM(total), 0),
+                       SUM(latency_sum) * 1.0 / NULLIF(SUM(latency_count), 0)
+                FROM stats_daily
+                """)
+            if query.rows:
+                # Même ordre que les colonnes du SELECT ci-dessus
+                columns = (
+                    "retrieval_count",
+                    "review_count",
+                    "correct_count",
+                    "near_miss_count",
+                    "answered_count",
+                    "average_latency_ms",
+                )
+                stats.update(zip(columns, query.rows[0]))
+            query = self._run_query(
+                "SELECT day FROM stats_daily ORDER BY day DESC LIMIT ?", [recent_days]
+            )
+            stats["dates"] = [row[0] for row in reversed(query.rows)]
+        except Exception as e:
+            self._report_error(e)
+        return stats
+
+    def fetch_daily_accuracy(self, days: int = 30) -> list:
+        """[(jour, réponses exactes, presque justes, données)] des `days` derniers
+        jours d'activité, du plus ancien au plus récent.
+        """
+        try:
+            query = self._run_query(
+                """
+                SELECT day, correct, near_miss, total FROM stats_daily
+                ORDER BY day DESC LIMIT ?
+                """,
+                [days],
+            )
+            return query.rows[::-1]
+        except Exception as e:
+            self._report_error(e)
+            return []
+
+    def fetch_activity_days(self) -> list:
+        """Jours ('YYYY-MM-DD') avec au moins une carte, dans l'ordre."""
+        try:
+            query = self._run_query("SELECT day FROM stats_daily ORDER BY day")
+            return [row[0] for row in query.rows]
+        except Exception as e:
+            self._report_error(e)
+            return []
+
+    def fetch_hardest_cards(self, limit: int = 10) -> list:
+        """Entrées les plus souvent ratées (index sur stats_card.misses), avec leurs
+        compteurs : attempts, correct, near_miss, total, misses.
+        """
+        try:
+            query = self._run_query(
+                """
+                SELECT s.UUID, r.question, r.response, s.attempts, s.correct,
+                       s.near_miss, s.total, s.misses
+                FROM stats_card s
+                JOIN records r ON r.UUID = s.UUID
+                WHERE s.misses > 0
+                ORDER BY s.misses DESC, s.attempts DESC
+                LIMIT ?
+                """,
+                [limit],
+            )
+            keys = (
+                "UUID",
+                "question",
+                "response",
+                "attempts",
+                "correct",
+                "near_miss",
+                "total",
+                "misses",
+            )
+            return [dict(zip(keys, row)) for row in query.rows]
+        except Exception as e:
+            self._report_error(e)
+            return []
+
+    def fetch_attribution_accuracy(self) -> list:
+        """[(attribution, réponses exactes, presque justes, données)] par attribution."""
+        try:
+            query = self._run_query("""
+                SELECT attribution, correct, near_miss, total FROM stats_attribution
+                ORDER BY total DESC
+                """)
+            return query.rows
+        except Exception as e:
+            self._report_error(e)
+            return []
+
+    def _create_favorites_table(self):
+        self._run_query("""
+            CREATE TABLE IF NOT EXISTS favorites (
+                UUID TEXT PRIMARY KEY REFERENCES records(UUID) ON DELETE CASCADE,
+                added_at TEXT NOT NULL
+            )
+            """)
+        try:
+            self._migrate_favorites_csv()
+        except (OSError, UnicodeDecodeError, csv.Error, StorageError) as e:
+            # Fichier laissé en place (migration retentée à la prochaine ouverture) ;
+            # les tables suivantes doivent être créées quoi qu'il arrive
+            logger.error(f"{self.db_name}: migration des favoris impossible : {e}")
+
+    def _migrate_favorites_csv(self):
+        """Importe une seule fois l'ancien fichier favourites-<base>.csv, dans son
+        ordre, puis le renomme en .migrated (conservé comme sauvegarde).
+        """
+        csv_path = favorites_filename(self.db_path)
+        if not os.path.exists(csv_path):
+            return
+        with open(csv_path, "r", newline="", encoding="utf-8") as file:
+            uuids = [row[0] for row in csv.reader(file) if row]
+        added_at = datetime.now().isoformat(timespec="seconds")
+        with self.storage.transaction():
+            self._run_each(
+                """
+                INSERT OR IGNORE INTO favorites (UUID, added_at)
+                SELECT UUID, ? FROM records WHERE UUID = ?
+                """,
+                [(added_at, entry_uuid) for entry_uuid in uuids],
+                "Failed to migrate favourites",
+            )
+        os.replace(csv_path, csv_path + ".migrated")
+        logger.info(f"{self.db_name}: {len(uuids)} favori(s) importé(s) de {csv_path}.")
+
+    @serialized_write
+    def add_favorite(self, entry_uuid: str) -> bool:
+        """Ajoute une entrée aux favoris ; False si elle y était déjà."""
+        query = self._run_query(
+            "INSERT OR IGNORE INTO favorites (UUID, added_at) VALUES (?, ?)",
+            [entry_uuid, datetime.now().isoformat(timespec="seconds")],
+        )
+        return query.rowcount > 0
+
+    def fetch_favorite_records(self) -> list:
+        """Entrées favorites, dans l'ordre d'ajout, en une seule jointure."""
+        return self._fetch_records("""
+            SELECT r.UUID, r.media_file, r.question, r.response, r.creation_date, r.attribution
+            FROM favorites f
+            JOIN records r ON r.UUID = f.UUID
+            ORDER BY f.rowid
+            """)
+
+    def _create_error_reports_table(self):
+        """Signalements d'erreur par entrée. À la création, les signalements de
+        l'ancien fichier global entry_error.csv qui concernent cette base sont
+        importés (le fichier reste en place pour les autres bases).
+        """
+        query = self._run_query(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'error_reports'"
+        )
+        exists = bool(query.rows)
+        self._run_query("""
+            CREATE TABLE IF NOT EXISTS error_reports (
+                id INTEGER PRIMARY KEY,
+                UUID TEXT NOT NULL REFERENCES records(UUID) ON DELETE CASCADE,
+                reported_at TEXT NOT NULL,
+                note TEXT
+            )
+            """)
+        self._run_query(
+            "CREATE INDEX IF NOT EXISTS idx_error_reports_uuid ON error_reports(UUID)"
+        )
+        if not exists and os.path.exists(self.LEGACY_ERROR_FILE):
+            with open(
+                self.LEGACY_ERROR_FILE, "r", newline="", encoding="utf-8"
+            ) as file:
+                uuids = list(dict.fromkeys(row[0] for row in csv.reader(file) if row))
+            reported_at = datetime.now().isoformat(timespec="seconds")
+            with self.storage.transaction():
+                self._run_each(
+                    """
+                    INSERT INTO error_reports (UUID, reported_at)
+                    SELECT UUID, ? FROM records WHERE UUID = ?
+                    """,
+                    [(reported_at, entry_uuid) for entry_uuid in uuids],
+                    "Failed to migrate error reports",
+                )
+            logger.info(
+                f"{self.db_name}: signalements importés de {self.LEGACY_ERROR_FILE}."
+            )
+
+    @serialized_write
+    def add_error_report(self, entry_uuid: str, note: str = None):
+        self._run_query(
+            "INSERT INTO error_reports (UUID, reported_at, note) VALUES (?, ?, ?)",
+            [entry_uuid, datetime.now().isoformat(timespec="seconds"), note or None],
+        )
+
+    @serialized_write
+    def clear_error_reports(self):
+        self._run_query("DELETE FROM error_reports")
+
+    @staticmethod
+    def error_reports_filter() -> tuple:
+        """Filtre (where, params) des entrées signalées, pour count_records /
+        fetch_records_page : semi-jointure sur l'index error_reports(UUID).
+        """
+        return "UUID IN (SELECT UUID FROM error_reports)", []
+
+    def fetch_review_state(self, entry_uuid: str) -> dict | None:
+        """État de révision d'une entrée, ou None si elle n'a jamais été notée."""
+        try:
+            query = self._run_query(
+                "SELECT ease, interval, repetitions, due_date, last_review FROM reviews WHERE UUID = ?",
+                [entry_uuid],
+            )
+            if not query.rows:
+                return None
+            return dict(zip(query.columns, query.rows[0]))
+        except Exception as e:
+            self._report_error(e)
+            return None
+
+    @serialized_write
+    def save_review_state(self, entry_uuid: str, state: dict) -> bool:
+        try:
+            self._run_query(
+                """
+                INSERT INTO reviews (UUID, ease, interval, repetitions, due_date, last_review)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(UUID) DO UPDATE SET
+                    ease = excluded.ease,
+                    interval = excluded.interval,
+                    repetitions = excluded.repetitions,
+                    due_date = excluded.due_date,
+                    last_review = excluded.last_review
+                """,
+                [
+                    entry_uuid,
+                    state["ease"],
+                    state["interval"],
+                    state["repetitions"],
+                    state["due_date"],
+                    state["last_review"],
+                ],
+            )
+            return True
+        except Exception as e:
+            self._report_error(e)
+            return False
+
+    def fetch_due_records(
+        self, limit: int, include_new: bool = True, today: date = None
+    ) -> list:
+        """Entrées à réviser : d'abord celles dont l'échéance est passée (les plus en
+        retard en premier, via l'index sur due_date), puis, s'il reste de la place,
+        les entrées jamais révisées dans l'ordre d'ajout.
+        """
+        today = (today or date.today()).isoformat()
+        records = self._fetch_records(
+            """
+            SELECT r.UUID, r.media_file, r.question, r.response, r.creation_date, r.attribution
+            FROM reviews v
+            JOIN records r ON r.UUID = v.UUID
+            WHERE v.due_date <= ?
+            ORDER BY v.due_date
+            LIMIT ?
+            """,
+            [today, limit],
+        )
+        if include_new and len(records) < limit:
+            records += self._fetch_records(
+                """
+                SELECT r.UUID, r.media_file, r.question, r.response, r.creation_date, r.attribution
+                FROM records r
+                WHERE NOT EXISTS (SELECT 1 FROM reviews v WHERE v.UUID = r.UUID)
+                ORDER BY r.rowid
+                LIMIT ?
+                """,
+                [limit - len(records)],
+            )
+        return records
+
     def update_record(
         self,
         record_id: str,
@@ -239,23 +1297,24 @@ class DatabaseManager:
         try:
             """Met à jour un entrée existant dans la base de données."""
             # Récupérer l'entrée existante
-            query = QSqlQuery(self.db)
-            query.prepare(
+            query = self._run_query(
                 """
                 SELECT media_file, question, response, custom_media FROM records WHERE UUID = ?
-                """
+                """,
+                [record_id],
             )
-            query.addBindValue(record_id)
-            if not query.exec_():
-                raise Exception(f"Failed to fetch record: {query.lastError().text()}")
-
-            if not query.next():
+            if not query.rows:
                 raise Exception("Record not found")
 
-            old_media_file = query.value(0)
-            old_question = query.value(1)
-            old_response = query.value(2)
-            custom_media = query.value(3)
+            old_media_file, old_question, old_response, custom_media = query.rows[0]
+            # Refuser un doublon avant de toucher aux fichiers médias
+            dedup_key = self.make_dedup_key(new_question, new_response)
+            if self._dedup_key_taken(dedup_key, record_id):
+                raise Exception(
+                    "Une autre entrée a déjà cette question et cette réponse."
+                )
+            created_media = None  # nouveau fichier, à retirer si la mise à jour échoue
+            stale_media = None  # ancien fichier, retiré après la mise à jour
             custom_deleted = False
             if (
                 len(new_media_file) <= 2
@@ -268,77 +1327,120 @@ class DatabaseManager:
             else:
                 if new_media_file != old_media_file:
                     try:
-                        new_media_file = (
-                            MediaUtils.MediaFileProcessing.process_media_file(
-                                new_media_file, self.audio_dir
-                            )
+                        new_media_file = process_media_file(
+                            new_media_file, self.audio_dir
                         )
                     except Exception as e:
                         raise Exception(
                             f"Erreur lors du traitement du nouveau média : {e}"
                         )
+                    created_media = new_media_file
                     custom_media = 1
 
-            # Vérifier si le média doit être régénéré
+            # Vérifier si le média doit être régénéré : seulement si le texte
+            # prononcé change (ou si l'ancien fichier a disparu)
             if custom_media != 1 and (
-                new_response != old_response
-                or new_question != old_question
-                or custom_deleted == True
+                custom_deleted == True
+                or not os.path.exists(old_media_file or "")
+                or self.build_audio_text(
+                    normalize_special_characters(new_question),
+                    normalize_special_characters(new_response),
+                )
+                != self.build_audio_text(old_question, old_response)
             ):
-                if os.path.exists(old_media_file):
-                    try:
-                        os.remove(old_media_file)  # Supprimer l'ancien fichier média
-                    except Exception as e:
-                        raise Exception(
-                            f"Échec de la suppression de l'ancien média : {e}"
-                        )
-                from common_methods import TextUtils
-
-                new_question = TextUtils.normalize_special_characters(new_question)
-                new_response = TextUtils.normalize_special_characters(new_response)
+                if old_media_file and os.path.exists(old_media_file):
+                    stale_media = old_media_file
+                new_question = normalize_special_characters(new_question)
+                new_response = normalize_special_characters(new_response)
                 new_media_file = self.auto_generate_audio(
                     new_question,
                     new_response,
                     self.language_code,
                 )
+                created_media = new_media_file
 
-            # Mettre à jour l'entrée
-            query.prepare(
-                """
-                UPDATE records
-                SET media_file = ?, question = ?, response = ?, custom_media = ?, attribution = ?
-                WHERE UUID = ?
-                """
-            )
-            query.addBindValue(new_media_file)
-            query.addBindValue(new_question)
-            query.addBindValue(new_response)
-            query.addBindValue(custom_media)
-            query.addBindValue(new_attribution or "no-attribution")
-            query.addBindValue(record_id)
-            if not query.exec_():
-                raise Exception(f"Failed to update record: {query.lastError().text()}")
+            # Mettre à jour l'entrée : seule l'écriture SQL prend le verrou, le
+            # média est déjà prêt
+            with self._write_lock:
+                try:
+                    if self._dedup_key_taken(dedup_key, record_id):
+                        raise StorageError(
+                            "Une autre entrée a déjà cette question et cette réponse."
+                        )
+                    self._run_query(
+                        """
+                        UPDATE records
+                        SET media_file = ?, question = ?, response = ?, custom_media = ?, attribution = ?, dedup_key = ?
+                        WHERE UUID = ?
+                        """,
+                        [
+                            new_media_file,
+                            new_question,
+                            new_response,
+                            custom_media,
+                            new_attribution or "no-attribution",
+                            dedup_key,
+                            record_id,
+                        ],
+                    )
+                except StorageError as e:
+                    if created_media and created_media != old_media_file:
+                        self._discard_unused_media(created_media)
+                    raise Exception(
+                        f"Failed to update record (doublon question/réponse ?): {e}"
+                    )
+            if stale_media and stale_media != new_media_file:
+                self._remove_media_file(stale_media)
             return True
         except Exception as e:
-            QMessageBox.critical(None, "Erreur", str(e))
+            self._report_error(e)
             return False
 
+    def _dedup_key_taken(self, dedup_key: str, exclude_uuid: str = None) -> bool:
+        """True si une entrée (autre que `exclude_uuid`) a déjà cette clé."""
+        if exclude_uuid is None:
+            query = self._run_query(
+                "SELECT 1 FROM records WHERE dedup_key = ? LIMIT 1", [dedup_key]
+            )
+        else:
+            query = self._run_query(
+                "SELECT 1 FROM records WHERE dedup_key = ? AND UUID != ? LIMIT 1",
+                [dedup_key, exclude_uuid],
+            )
+        return bool(query.rows)
+
+    def _discard_unused_media(self, path: str):
+        """Supprime un média préparé pour une écriture abandonnée, sauf si une
+        entrée y renvoie déjà (même chemin choisi par une écriture concurrente).
+        À appeler sous le verrou d'écriture.
+        """
+        if not path or not os.path.exists(path):
+            return
+        if not self._run_query(
+            "SELECT 1 FROM records WHERE media_file = ? LIMIT 1", [path]
+        ).rows:
+            self._remove_media_file(path)
+
+    @staticmethod
+    def _remove_media_file(path: str):
+        """Supprime un fichier média devenu inutile ; un échec est seulement journalisé."""
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Échec de la suppression du média {path} : {e}")
+
+    @serialized_write
     def delete_record(self, record_id: str) -> bool:
         try:
             """Supprime un entrée de la base de données."""
             # D'abord récupérer le chemin du fichier média
-            query = QSqlQuery(self.db)
-            query.prepare("SELECT media_file FROM records WHERE UUID = ?")
-            query.addBindValue(record_id)
-
-            if not query.exec_():
-                raise Exception(
-                    f"Échec de la récupération du fichier média: {query.lastError().text()}"
-                )
+            query = self._run_query(
+                "SELECT media_file FROM records WHERE UUID = ?", [record_id]
+            )
 
             # Vérifier si un fichier média est associé à cet enregistrement
-            if query.next():
-                media_file_path = query.value(0)
+            if query.rows:
+                media_file_path = query.rows[0][0]
                 # Tenter de supprimer le fichier média s'il existe
                 if media_file_path and os.path.exists(media_file_path):
                     try:
@@ -347,36 +1449,19 @@ class DatabaseManager:
                     except Exception as e:
                         print(f"Échec de la suppression du fichier média: {e}")
 
-            # Ensuite supprimer l'entrée de la base de données
-            query = QSqlQuery(self.db)
-            query.prepare("DELETE FROM records WHERE UUID = ?")
-            query.addBindValue(record_id)
-            if not query.exec_():
-                raise Exception(f"Failed to delete record: {query.lastError().text()}")
-            self.db.commit()  # Valider les modifications
+            # Ensuite supprimer l'entrée et ses données associées, ensemble
+            with self.storage.transaction():
+                for table in ("records", "reviews", "favorites", "error_reports"):
+                    self._run_query(f"DELETE FROM {table} WHERE UUID = ?", [record_id])
             return True
         except Exception as e:
-            QMessageBox.critical(None, "Erreur", str(e))
+            self._report_error(e)
             return False
 
     def close_connection(self):
-        """Ferme la connexion à la base de données."""
-        # Attendre que toutes les requêtes soient terminées avant de fermer la base
-        QSqlDatabase.database(self.connection_name).transaction()
-        QSqlDatabase.database(self.connection_name).commit()
-
-        if self.db.isOpen():
-            self.db.close()  # Fermer la connexion
-
-        # Nettoyer explicitement les requêtes actives
-        QSqlQuery(self.db).clear()
-
-        # S'assurer que la connexion est supprimée proprement
-        if QSqlDatabase.contains(self.connection_name):
-            try:
-                QSqlDatabase.removeDatabase(self.connection_name)
-                logger.info(f"{self.db_name} closed.")
-            except RuntimeError as e:
-                logger.warning(
-                    f"Erreur lors de la suppression de la connexion avec {self.db_path} : {e}"
-                )
+        """Ferme la connexion à la base de données (et celles des threads)."""
+        self.tts_service.shutdown()
+        if self.storage is None or not self.storage.is_open:
+            return
+        self.storage.close()
+        logger.info(f"{self.db_name} closed.")
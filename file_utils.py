@@ -0,0 +1,112 @@
+"""Fichiers médias et noms de fichiers, sans dépendance Qt : utilisable par db.py
+hors de l'interface (imports en ligne de commande, tests, mesures).
+"""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import unicodedata
+
+# Initialisation du logger ffmpeg (au début du fichier)
+ffmpeg_logger = logging.getLogger("ffmpeg")
+if not ffmpeg_logger.hasHandlers():
+    handler = logging.FileHandler("ffmpeg_errors.log", encoding="utf-8")
+    formatter = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
+    handler.setFormatter(formatter)
+    ffmpeg_logger.addHandler(handler)
+    ffmpeg_logger.setLevel(logging.ERROR)
+
+
+def clean_filename(s: str):
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(c if not unicodedata.combining(c) else "" for c in s)
+    s = s.replace("æ", "ae").replace("Æ", "AE")
+    s = s.replace("œ", "oe").replace("Œ", "OE")
+    s = re.sub(r"[^\w\s\.-]", "", s)
+    s = re.sub(r"\s+", "_", s)
+    return s
+
+
+def favorites_filename(db_path: str = None) -> str:
+    """Ancien fichier des favoris, relu seulement pour la migration vers la table."""
+    if db_path:
+        db_name = os.path.splitext(os.path.basename(db_path))[0]
+        return f"favourites-{db_name}.csv"
+    return "favourites.csv"
+
+
+def process_media_file(
+    src_path: str,
+    dest_dir: str,
+    start_time_ms: int = None,
+    end_time_ms: int = None,
+) -> str:
+    """
+    Copie ou découpe un fichier média (audio ou vidéo) dans dest_dir.
+    Retourne le chemin du fichier copié/découpé.
+    """
+    ext = os.path.splitext(src_path)[1].lower()
+    # Correction : générer un nom unique et propre une seule fois
+    if ext in [".mp4", ".avi", ".mov", ".mkv"] and (
+        start_time_ms is not None or end_time_ms is not None
+    ):
+        base, _ = os.path.splitext(os.path.basename(src_path))
+        base = clean_filename(base)
+        file_name = f"{base}_clip_{start_time_ms or 0}_{end_time_ms or 'end'}.mp4"
+    else:
+        file_name = clean_filename(os.path.basename(src_path))
+    dest_path = os.path.join(dest_dir, file_name)
+
+    # Découpage audio
+    if ext in [".mp3", ".wav", ".ogg"]:
+        if start_time_ms is not None and end_time_ms is not None:
+            from pydub import AudioSegment
+
+            audio = AudioSegment.from_file(src_path)
+            segment = audio[start_time_ms:end_time_ms]
+            segment.export(dest_path, format="mp3")
+        else:
+            shutil.copy2(src_path, dest_path)
+    # Découpage vidéo (remplacement MoviePy par ffmpeg)
+    elif ext in [".mp4", ".avi", ".mov", ".mkv"]:
+        if start_time_ms is not None and end_time_ms is not None:
+            start_sec = start_time_ms / 1000.0
+            end_sec = end_time_ms / 1000.0
+            duration = end_sec - start_sec
+            ffmpeg_cmd = [
+                "ffmpeg",
+                "-y",
+                "-i",
+                src_path,
+                "-ss",
+                str(start_sec),
+                "-t",
+                str(duration),
+                "-c:v",
+                "libx264",
+                "-c:a",
+                "aac",
+                dest_path,
+            ]
+            try:
+                subprocess.run(
+                    ffmpeg_cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    check=True,
+                )
+            except Exception as e:
+                error_msg = f"Erreur ffmpeg sur {src_path}: {e}\n" + getattr(
+                    e, "stderr", b""
+                ).decode(errors="ignore")
+                ffmpeg_logger.error(error_msg)
+                raise Exception(
+                    f"Erreur lors du découpage vidéo (ffmpeg) : {e}\n{getattr(e, 'stderr', b'').decode(errors='ignore')}"
+                )
+        else:
+            shutil.copy2(src_path, dest_path)
+    else:
+        raise Exception("Format de média non supporté.")
+    return dest_path
@@ -0,0 +1,131 @@
+import toml
+from logger import logger
+from text_normalization import (
+    expected_answer,
+    fold_accents,
+    normalize_special_characters,
+    normalize_text,
+)
+
+# Catégories de notation d'une réponse
+CORRECT = "correct"
+NEAR_MISS = "near_miss"  # accent oublié ou faute de frappe : crédit partiel
+INCORRECT = "incorrect"
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Distance de Damerau-Levenshtein (transpositions adjacentes) limitée à
+    `max_distance` : seule une bande de largeur 2 * max_distance + 1 autour de la
+    diagonale est calculée, et le calcul s'arrête dès qu'une ligne dépasse la
+    limite. Retourne max_distance + 1 si la distance est supérieure.
+    """
+    over = max_distance + 1
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return over
+    # Préfixe et suffixe communs n'influent pas sur la distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    len_a, len_b = len(a), len(b)
+    if not a or not b:
+        return min(max(len_a, len_b), over)
+
+    before_previous = None
+    previous = [j if j <= max_distance else over for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        current = [over] * (len_b + 1)
+        current[0] = i if i <= max_distance else over
+        row_min = current[0]
+        char_a = a[i - 1]
+        for j in range(max(1, i - max_distance), min(len_b, i + max_distance) + 1):
+            char_b = b[j - 1]
+            value = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if (
+                i > 1
+                and j > 1
+                and char_a == b[j - 2]
+                and a[i - 2] == char_b
+                and before_previous[j - 2] + 1 < value
+            ):
+                value = before_previous[j - 2] + 1
+            if value > over:
+                value = over
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        before_previous, previous = previous, current
+    return min(previous[len_b], over)
+
+
+class GradingEngine:
+    """
+    Notation d'une réponse : exacte (après normalisation), presque juste
+    (accents ou quelques fautes de frappe sous le seuil) ou incorrecte.
+    Le nombre de fautes admises est `tolerance` × longueur de la réponse
+    attendue, plafonné à `max_distance` ; les réponses numériques restent exactes.
+    """
+
+    def __init__(
+        self,
+        tolerance: float = 0.15,
+        max_distance: int = 2,
+        accent_insensitive: bool = True,
+    ):
+        self.tolerance = tolerance
+        self.max_distance = max_distance
+        self.accent_insensitive = accent_insensitive
+
+    @classmethod
+    def from_config(cls, path: str = "config.toml"):
+        """Paramètres de la section [grading] de config.toml (facultative)."""
+        try:
+            settings = toml.load(path).get("grading", {})
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement de la configuration: {e}")
+            settings = {}
+        return cls(
+            tolerance=settings.get("tolerance", 0.15),
+            max_distance=settings.get("max_distance", 2),
+            accent_insensitive=settings.get("accent_insensitive", True),
+        )
+
+    def allowed_distance(self, expected: str) -> int:
+        return min(self.max_distance, round(len(expected) * self.tolerance))
+
+    def grade(self, user: str, correct: str) -> str:
+        expected = expected_answer(correct)
+        if expected.matches(user):
+            return CORRECT
+        if expected.numeric:
+            return INCORRECT
+        user = normalize_special_characters(user)
+        if expected.optionals:
+            # Forme complète (mots facultatifs compris) et formes sans chacun d'eux
+            full = normalize_text(correct.replace("(", "").replace(")", ""))
+            candidates = [(user, full)] + [
+                (user.replace(opt, ""), target) for opt, target in expected.optionals
+            ]
+        else:
+            candidates = [(user, expected.normalized)]
+        for user_text, target in candidates:
+            user_text = normalize_text(user_text)
+            if self.accent_insensitive:
+                user_text, target = fold_accents(user_text), fold_accents(target)
+            limit = self.allowed_distance(target)
+            if bounded_edit_distance(user_text, target, limit) <= limit:
+                return NEAR_MISS
+        return INCORRECT
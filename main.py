@@ -35,11 +35,17 @@ class MainApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Coucou")
-        self.font_size, self.username, self.language_code, self.database_path = (
-            self.load_config()
-        )
+        (
+            self.font_size,
+            self.username,
+            self.language_code,
+            self.database_path,
+            self.database_profile,
+        ) = self.load_config()
         print(self.database_path)
-        self.db_manager = DatabaseManager(self.database_path, self.language_code)
+        self.db_manager = DatabaseManager(
+            self.database_path, self.language_code, pragmas=self.database_profile
+        )
         logger.info("Application démarrée")
         self.show_resume_manual_button = False
         self.resume_manual_button = None  # Référence au bouton
@@ -81,11 +87,12 @@ class MainApp(QMainWindow):
                 config.get("username", ""),
                 config.get("language_code", "fr"),
                 config.get("database_path", "data.db"),
+                config.get("database", {}),
             )
             # 12, "" sont les valeurs par défaut si non trouvée
         except Exception as e:
             logger.error(f"Erreur lors du chargement de la configuration: {e}")
-            return 12, ""  # Valeur par défaut en cas d'erreur
+            return 12, "", "fr", "data.db", {}  # Valeurs par défaut en cas d'erreur
 
     def save_font_size_to_config(self, font_size):
         """Sauvegarde la taille de police dans le fichier config.toml."""
@@ -256,7 +263,7 @@ class MainApp(QMainWindow):
 
     def open_statistics_window(self):
         """Ouvre la fenêtre des statistiques d'utilisation."""
-        self.statistics_window = StatisticsApp(self.font_size, self)
+        self.statistics_window = StatisticsApp(self.db_manager, self.font_size, self)
         self.statistics_window.show()
         logger.info("Ouverture de la fenêtre de statistiques")
 
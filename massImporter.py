@@ -1,5 +1,8 @@
 import csv
+import itertools
 import os
+import queue
+import threading
 from PySide6.QtWidgets import (
     QFileDialog,
     QMessageBox,
@@ -8,6 +11,11 @@ from PySide6.QtWidgets import (
     QWidget,
     QLabel,
 )
+from PySide6.QtCore import (
+    QThread,
+    Signal,
+    QObject,
+)
 from PySide6.QtGui import (
     QShortcut,
     QKeySequence,
@@ -15,6 +23,288 @@ from PySide6.QtGui import (
 from logger import logger
 from missing_responses_dialog import MissingResponsesDialog
 from common_methods import TimeUtils, ProgressBarHelper
+from db import INSERT_OK
+
+_END = object()  # Marque de fin de flux entre les étapes du pipeline
+
+
+class CsvImportWorker(QObject):
+    """
+    Importe des fichiers CSV hors du thread GUI, en trois étapes qui se chevauchent :
+    lecture du CSV -> traitement des médias (découpage, gTTS) -> écriture en base par lots.
+    La lecture et les médias tournent dans leurs propres threads ; l'écriture en base
+    reste dans le thread du worker, seul à utiliser la connexion.
+    """
+
+    file_started = Signal(str, int)  # chemin du fichier, nombre de lignes
+    progress = Signal(int)  # lignes traitées dans le fichier courant
+    finished = Signal(dict)  # résumé de l'importation
+
+    CHUNK_SIZE = 100  # lignes par paquet échangé entre les étapes
+    MAX_CHUNKS_IN_FLIGHT = 4  # paquets lus mais pas encore écrits
+
+    def __init__(self, db_manager, jobs):
+        """jobs : liste de dicts (csv_path, audio_base_dir, has_start_time, has_end_time)."""
+        super().__init__()
+        self.db_manager = db_manager
+        self.jobs = jobs
+        self._cancel_event = threading.Event()
+        self._in_flight = threading.BoundedSemaphore(self.MAX_CHUNKS_IN_FLIGHT)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        summary = {
+            "total_imported": 0,
+            "total_failed": 0,
+            "processed_files": 0,
+            "file_errors": [],
+            "missing_responses": [],
+            "cancelled": False,
+        }
+        inbox = queue.Queue()  # paquets lus (parse) et paquets prêts (media)
+        media_queue = queue.Queue()
+        parser = threading.Thread(target=self._parse_stage, args=(inbox,), daemon=True)
+        media = threading.Thread(
+            target=self._media_stage, args=(media_queue, inbox), daemon=True
+        )
+        parser.start()
+        media.start()
+
+        # Clés des paquets en cours (lus, pas encore écrits) : évite de générer deux
+        # fois l'audio d'un doublon interne. Une fois le paquet écrit, l'index unique
+        # et find_existing_keys prennent le relais ; la mémoire reste bornée.
+        seen_keys = set()
+        pending_media = 0
+        parsing_done = False
+        current_file = None
+        done_in_file = 0
+        try:
+            while not (parsing_done and pending_media == 0):
+                if self.is_cancelled():
+                    summary["cancelled"] = True
+                    break
+                try:
+                    kind, chunk = inbox.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                if kind == "end":
+                    parsing_done = True
+                elif kind == "file_error":
+                    summary["file_errors"].append(chunk)
+                    summary["processed_files"] += 1
+                elif kind == "empty_file":
+                    summary["processed_files"] += 1
+                elif kind == "parsed":
+                    # Étape 1 -> 2 : écarter les doublons avant de générer l'audio
+                    summary["missing_responses"].extend(chunk["missing"])
+                    summary["total_failed"] += len(chunk["missing"])
+                    keys = [
+                        self.db_manager.make_dedup_key(row["question"], row["response"])
+                        for row in chunk["rows"]
+                    ]
+                    existing = self.db_manager.find_existing_keys(keys)
+                    fresh = []
+                    chunk["keys"] = []
+                    for row, key in zip(chunk["rows"], keys):
+                        if key in existing or key in seen_keys:
+                            summary["total_failed"] += 1
+                            logger.warning(
+                                f"{row['question']},{row['response']} est déjà présent dans la base de données et n'est pas ajouté à nouveau"
+                            )
+                        else:
+                            seen_keys.add(key)
+                            chunk["keys"].append(key)
+                            fresh.append(row)
+                    chunk["rows"] = fresh
+                    pending_media += 1
+                    media_queue.put(chunk)
+                elif kind == "prepared":
+                    # Étape 3 : écriture en base dans une transaction par paquet
+                    pending_media -= 1
+                    summary["total_failed"] += chunk["errors"]
+                    statuses = self.db_manager.insert_records_bulk(
+                        chunk["rows"], media_ready=True
+                    )
+                    seen_keys.difference_update(chunk["keys"])
+                    for status in statuses:
+                        if status == INSERT_OK:
+                            summary["total_imported"] += 1
+                        else:
+                            summary["total_failed"] += 1
+                    if chunk["file"] != current_file:
+                        current_file = chunk["file"]
+                        done_in_file = 0
+                        self.file_started.emit(current_file, chunk["file_rows"])
+                    done_in_file += chunk["size"]
+                    self.progress.emit(done_in_file)
+                    if chunk["last"]:
+                        summary["processed_files"] += 1
+                        logger.info(f"Fichier traité: {current_file}")
+                    self._in_flight.release()
+        finally:
+            media_queue.put(_END)
+            self.db_manager.release_thread_connection()
+        self.finished.emit(summary)
+
+    # --- Étape 1 : lecture et analyse des CSV ---
+    def _parse_stage(self, inbox):
+        for job in self.jobs:
+            if self.is_cancelled():
+                break
+            csv_path = job["csv_path"]
+            previous = None
+            try:
+                logger.info(f"Début d'importation depuis {csv_path}")
+                # Pré-analyse légère pour la barre de progression, puis lecture
+                # en flux par paquets : la mémoire ne dépend pas de la taille du fichier
+                total_rows = self.count_rows(csv_path)
+                logger.info(
+                    f"Nombre d'entrées à importer dans {csv_path}: {total_rows}"
+                )
+                for rows in self.iter_row_chunks(csv_path, self.CHUNK_SIZE):
+                    if not self._acquire_slot():
+                        return
+                    try:
+                        chunk = self._build_chunk(job, rows)
+                    except Exception:
+                        self._in_flight.release()
+                        raise
+                    chunk["file_rows"] = total_rows
+                    chunk["last"] = False
+                    if previous is not None:
+                        inbox.put(("parsed", previous))
+                    previous = chunk
+                if previous is None:
+                    inbox.put(("empty_file", csv_path))
+                else:
+                    previous["last"] = True
+                    inbox.put(("parsed", previous))
+            except Exception as e:
+                logger.critical(f"Échec de la lecture du fichier CSV {csv_path} : {e}")
+                inbox.put(("file_error", f"{csv_path} : {e}"))
+                if previous is not None:
+                    # Les lignes déjà lues sont importées (et leur place libérée) ;
+                    # le fichier est compté par file_error, pas comme terminé
+                    inbox.put(("parsed", previous))
+        inbox.put(("end", None))
+
+    @staticmethod
+    def count_rows(csv_path):
+        """Compte les lignes de données sans construire de dictionnaires."""
+        with open(csv_path, "r", encoding="utf-8", newline="") as csv_file:
+            reader = csv.reader(csv_file)
+            next(reader, None)  # en-tête
+            return sum(1 for row in reader if row)
+
+    @staticmethod
+    def iter_row_chunks(csv_path, chunk_size):
+        """Générateur de paquets d'au plus chunk_size lignes (dicts) du CSV."""
+        with open(csv_path, "r", encoding="utf-8", newline="") as csv_file:
+            reader = csv.DictReader(csv_file)
+            while True:
+                rows = list(itertools.islice(reader, chunk_size))
+                if not rows:
+                    return
+                yield rows
+
+    def _acquire_slot(self):
+        """Limite le nombre de paquets en mémoire ; False si l'import est annulé."""
+        while not self._in_flight.acquire(timeout=0.1):
+            if self.is_cancelled():
+                return False
+        return True
+
+    @staticmethod
+    def _build_chunk(job, rows):
+        audio_base_dir = job["audio_base_dir"]
+        chunk = {"file": job["csv_path"], "size": len(rows), "rows": [], "missing": []}
+        for row in rows:
+            file_path = (row.get("audio_path") or "").strip()
+            if audio_base_dir and file_path and not os.path.isabs(file_path):
+                file_path = os.path.join(audio_base_dir, file_path)
+            question = row["question"]
+            response = row.get("response") or ""
+            attribution = row.get("attribution", "no-attribution")
+            start_time_ms = (
+                TimeUtils.parse_time_to_ms(row["start_time"])
+                if job["has_start_time"]
+                else None
+            )
+            end_time_ms = (
+                TimeUtils.parse_time_to_ms(row["end_time"])
+                if job["has_end_time"]
+                else None
+            )
+            uuid = (row.get("UUID") or "").strip() or None  # UUID optionnel
+            creation_date = (
+                row.get("creation_date") or ""
+            ).strip() or None  # creation_date optionnel
+
+            # Ignorer les entrées avec réponse vide, mais les stocker pour saisie manuelle
+            if not response.strip():
+                logger.warning(
+                    f"Entrée ignorée - réponse vide pour question: '{question}'"
+                )
+                chunk["missing"].append(
+                    {
+                        "audio_path": file_path,
+                        "question": question,
+                        "response": response,
+                        "UUID": uuid,
+                        "creation_date": creation_date,
+                        "start_time_ms": start_time_ms,
+                        "end_time_ms": end_time_ms,
+                        "attribution": attribution,
+                    }
+                )
+                continue
+
+            chunk["rows"].append(
+                {
+                    "media_file": file_path,
+                    "question": question,
+                    "response": response,
+                    "start_time_ms": start_time_ms,
+                    "end_time_ms": end_time_ms,
+                    "UUID": uuid,
+                    "creation_date": creation_date,
+                    "attribution": attribution,
+                }
+            )
+        return chunk
+
+    # --- Étape 2 : traitement des médias ---
+    def _media_stage(self, media_queue, inbox):
+        while True:
+            chunk = media_queue.get()
+            if chunk is _END:
+                return
+            prepared = []
+            errors = 0
+            if self.is_cancelled():
+                chunk["rows"] = []
+                chunk["errors"] = 0
+                inbox.put(("prepared", chunk))
+                continue
+            # Les audios du bloc sont générés en parallèle par le pool TTS
+            results = self.db_manager.prepare_rows_media(chunk["rows"])
+            for row, result in zip(chunk["rows"], results):
+                if isinstance(result, Exception):
+                    errors += 1
+                    logger.error(
+                        f"Échec de l'enregistrement des données pour '{row['media_file'] or row['question']}': {result}"
+                    )
+                else:
+                    prepared.append(result)
+            chunk["rows"] = prepared
+            chunk["errors"] = errors
+            inbox.put(("prepared", chunk))
 
 
 class MassImporter(QWidget):
@@ -26,6 +316,8 @@ class MassImporter(QWidget):
         self.setStyleSheet(
             f"* {{ font-size: {self.font_size}px; }}"
         )  # Appliquer la taille de police
+        self._import_thread = None
+        self._import_worker = None
         self.initialize_ui()
 
         # Ajouter les raccourcis clavier
@@ -41,10 +333,10 @@ class MassImporter(QWidget):
         layout = QVBoxLayout()
 
         # Bouton pour sélectionner un fichier CSV
-        select_csv_button = QPushButton("Sélectionner des fichiers CSV (Ctrl+I)")
-        select_csv_button.clicked.connect(self.import_csv)
+        self.select_csv_button = QPushButton("Sélectionner des fichiers CSV (Ctrl+I)")
+        self.select_csv_button.clicked.connect(self.import_csv)
 
-        layout.addWidget(select_csv_button)
+        layout.addWidget(self.select_csv_button)
 
         # Label pour indiquer la contrainte d'unicité
         uniqueness_label = QLabel(
@@ -56,6 +348,12 @@ class MassImporter(QWidget):
         self.progress_helper = ProgressBarHelper(parent_layout=layout)
         self.progress_helper.hide()
 
+        # Bouton pour annuler une importation en cours
+        self.cancel_button = QPushButton("Annuler l'importation")
+        self.cancel_button.clicked.connect(self.cancel_import)
+        self.cancel_button.hide()
+        layout.addWidget(self.cancel_button)
+
         # Bouton pour fermer la fenêtre
         close_button = QPushButton("Fermer (Ctrl+W)")
         close_button.clicked.connect(self.close)
@@ -64,6 +362,11 @@ class MassImporter(QWidget):
         self.setLayout(layout)
 
     def import_csv(self):
+        if self._import_thread is not None:
+            QMessageBox.information(
+                self, "Info", "Une importation est déjà en cours, veuillez patienter."
+            )
+            return
         # Ouvre une boîte de dialogue pour sélectionner plusieurs fichiers CSV
         file_dialog = QFileDialog(
             self, "Sélectionner des fichiers CSV", "", "Fichiers CSV (*.csv)"
@@ -80,189 +383,139 @@ class MassImporter(QWidget):
         if not csv_paths:
             return
 
-        total_imported = 0
-        total_failed = 0
-        processed_files = 0
-        total_files = len(csv_paths)
-
         # Initialisation pour l'avertissement des métadonnées
-        found_uuid = False
-        found_creation_date = False
-
-        # Traiter chaque fichier CSV sélectionné
-        missing_responses = []  # Pour stocker les entrées à compléter manuellement
+        self._found_uuid = False
+        self._found_creation_date = False
+        self._total_files = len(csv_paths)
+        skipped_files = 0
+
+        # Les questions à l'utilisateur (colonnes, chemins relatifs) restent dans le
+        # thread GUI ; le reste de l'importation tourne dans CsvImportWorker.
+        jobs = []
         for csv_path in csv_paths:
             try:
-                logger.info(f"Début d'importation depuis {csv_path}")
-                with open(csv_path, "r", encoding="utf-8") as csv_file:
-                    reader = csv.DictReader(csv_file)
-                    if not {"audio_path", "question"}.issubset(reader.fieldnames):
-                        logger.error(f"Colonnes CSV manquantes dans {csv_path}")
-                        QMessageBox.warning(
-                            self,
-                            "Avertissement",
-                            f"Le fichier {csv_path} ne contient pas les colonnes requises ('audio_path', 'question') et sera ignoré.",
-                        )
-                        processed_files += 1
-                        continue
-
-                    # Vérifier si les colonnes optionnelles sont présentes
-                    if "UUID" in reader.fieldnames:
-                        found_uuid = True
-                    if "creation_date" in reader.fieldnames:
-                        found_creation_date = True
-                    # --- Ajout pour start_time et end_time ---
-                    has_start_time = "start_time" in reader.fieldnames
-                    has_end_time = "end_time" in reader.fieldnames
-
-                    rows = list(reader)
-                    total_rows = len(rows)
-                    logger.info(
-                        f"Nombre d'entrées à importer dans {csv_path}: {total_rows}"
-                    )
-
-                    # --- Nouvelle logique pour gérer les chemins relatifs audio_path ---
-                    audio_base_dir = None
-                    if rows:
-                        # Trouver le premier audio_path non vide
-                        first_audio_path = None
-                        for row in rows:
-                            candidate = row.get("audio_path", "").strip()
-                            if candidate:
-                                first_audio_path = candidate
-                                break
-
-                        if (
-                            first_audio_path
-                            and not os.path.isabs(first_audio_path)
-                            and not os.path.exists(first_audio_path)
-                        ):
-                            reply = QMessageBox.question(
-                                self,
-                                "Chemin audio relatif ?",
-                                f"Le fichier audio '{first_audio_path}' n'a pas été trouvé.\n\nEst-ce que les chemins audio de ce CSV sont relatifs à un dossier ?",
-                                QMessageBox.Yes | QMessageBox.No,
-                            )
-                            if reply == QMessageBox.Yes:
-                                folder = QFileDialog.getExistingDirectory(
-                                    self,
-                                    "Sélectionner le dossier parent des fichiers audio",
-                                )
-                                if folder:
-                                    audio_base_dir = folder
-
-                    # Mettre à jour la barre de progression pour ce fichier
-                    self.progress_helper.show(total_rows)
-
-                    failed_insertion_count = 0
-                    for index, row in enumerate(rows, start=1):
-                        file_path = row["audio_path"].strip()
-                        if (
-                            audio_base_dir
-                            and file_path
-                            and not os.path.isabs(file_path)
-                        ):
-                            file_path = os.path.join(audio_base_dir, file_path)
-                        question = row["question"]
-                        response = row.get("response", "")
-                        attribution = row.get("attribution", "no-attribution")
-
-                        start_time_ms = (
-                            TimeUtils.parse_time_to_ms(row["start_time"])
-                            if has_start_time
-                            else None
-                        )
-                        end_time_ms = (
-                            TimeUtils.parse_time_to_ms(row["end_time"])
-                            if has_end_time
-                            else None
-                        )
-
-                        # Ignorer les entrées avec réponse vide, mais les stocker pour saisie manuelle
-                        if not response.strip():
-                            failed_insertion_count += 1
-                            logger.warning(
-                                f"Entrée ignorée - réponse vide pour question: '{question}'"
-                            )
-                            missing_responses.append(
-                                {
-                                    "audio_path": file_path,
-                                    "question": question,
-                                    "response": response,
-                                    "UUID": row.get("UUID", "").strip() or None,
-                                    "creation_date": row.get(
-                                        "creation_date", ""
-                                    ).strip()
-                                    or None,
-                                    "start_time_ms": start_time_ms,
-                                    "end_time_ms": end_time_ms,
-                                    "attribution": attribution,
-                                }
-                            )
-                            self.progress_helper.set_value(index)
-                            continue
-
-                        uuid = row.get("UUID", "").strip() or None  # UUID optionnel
-                        creation_date = (
-                            row.get("creation_date", "").strip() or None
-                        )  # creation_date optionnel
-
-                        # Enregistrer les données dans la base de données
-                        try:
-                            insertion_status_code = self.db_manager.insert_record(
-                                file_path,
-                                question,
-                                response,
-                                start_time_ms,
-                                end_time_ms,
-                                uuid,
-                                creation_date,
-                                attribution,
-                            )
-                            if insertion_status_code != 0:
-                                failed_insertion_count += insertion_status_code
-                                logger.warning(
-                                    f"{question},{response} est déjà présent dans la base de données et n'est pas ajouté à nouveau"
-                                )
-                        except Exception as e:
-                            logger.error(
-                                f"Échec de l'enregistrement des données pour '{file_path}': {e}"
-                            )
-                            continue
-
-                        self.progress_helper.set_value(index)
-
-                    total_imported += total_rows - failed_insertion_count
-                    total_failed += failed_insertion_count
-                    processed_files += 1
-
-                    # Afficher un aperçu de la progression totale
-                    logger.info(
-                        f"Fichier {processed_files}/{total_files} traité: {csv_path}"
-                    )
-
+                job = self._prepare_import_job(csv_path)
             except Exception as e:
                 logger.critical(f"Échec de la lecture du fichier CSV {csv_path} : {e}")
                 QMessageBox.warning(
                     self, "Erreur", f"Échec de la lecture du fichier {csv_path} : {e}"
                 )
-                processed_files += 1
-                continue
-
+                job = None
+            if job is None:
+                skipped_files += 1
+            else:
+                jobs.append(job)
+        self._skipped_files = skipped_files
+
+        self._import_worker = CsvImportWorker(self.db_manager, jobs)
+        self._import_thread = QThread()
+        self._import_worker.moveToThread(self._import_thread)
+        self._import_thread.started.connect(self._import_worker.run)
+        self._import_worker.file_started.connect(
+            lambda _, total_rows: self.progress_helper.show(total_rows)
+        )
+        self._import_worker.progress.connect(self.progress_helper.set_value)
+        self._import_worker.finished.connect(self.on_import_finished)
+        self._import_worker.finished.connect(self._import_thread.quit)
+        self._import_worker.finished.connect(self._import_worker.deleteLater)
+        self._import_thread.finished.connect(self._import_thread.deleteLater)
+        self.select_csv_button.setEnabled(False)
+        self.cancel_button.show()
+        self._import_thread.start()
+
+    def _prepare_import_job(self, csv_path):
+        """Vérifie les colonnes d'un CSV et demande, si besoin, le dossier des audios relatifs.
+        Retourne la description du fichier pour le worker, ou None s'il doit être ignoré.
+        """
+        with open(csv_path, "r", encoding="utf-8", newline="") as csv_file:
+            reader = csv.DictReader(csv_file)
+            if not {"audio_path", "question"}.issubset(reader.fieldnames or []):
+                logger.error(f"Colonnes CSV manquantes dans {csv_path}")
+                QMessageBox.warning(
+                    self,
+                    "Avertissement",
+                    f"Le fichier {csv_path} ne contient pas les colonnes requises ('audio_path', 'question') et sera ignoré.",
+                )
+                return None
+
+            # Vérifier si les colonnes optionnelles sont présentes
+            if "UUID" in reader.fieldnames:
+                self._found_uuid = True
+            if "creation_date" in reader.fieldnames:
+                self._found_creation_date = True
+
+            # --- Nouvelle logique pour gérer les chemins relatifs audio_path ---
+            # Trouver le premier audio_path non vide
+            first_audio_path = None
+            for row in reader:
+                candidate = (row.get("audio_path") or "").strip()
+                if candidate:
+                    first_audio_path = candidate
+                    break
+
+        audio_base_dir = None
+        if (
+            first_audio_path
+            and not os.path.isabs(first_audio_path)
+            and not os.path.exists(first_audio_path)
+        ):
+            reply = QMessageBox.question(
+                self,
+                "Chemin audio relatif ?",
+                f"Le fichier audio '{first_audio_path}' n'a pas été trouvé.\n\nEst-ce que les chemins audio de ce CSV sont relatifs à un dossier ?",
+                QMessageBox.Yes | QMessageBox.No,
+            )
+            if reply == QMessageBox.Yes:
+                folder = QFileDialog.getExistingDirectory(
+                    self,
+                    "Sélectionner le dossier parent des fichiers audio",
+                )
+                if folder:
+                    audio_base_dir = folder
+
+        return {
+            "csv_path": csv_path,
+            "audio_base_dir": audio_base_dir,
+            "has_start_time": "start_time" in reader.fieldnames,
+            "has_end_time": "end_time" in reader.fieldnames,
+        }
+
+    def cancel_import(self):
+        if self._import_worker is not None:
+            logger.info("Annulation de l'importation demandée")
+            self.cancel_button.setEnabled(False)
+            self._import_worker.cancel()
+
+    def on_import_finished(self, summary):
+        self._import_thread = None
+        self._import_worker = None
         self.progress_helper.hide()
+        self.cancel_button.hide()
+        self.cancel_button.setEnabled(True)
+        self.select_csv_button.setEnabled(True)
+
+        total_imported = summary["total_imported"]
+        total_failed = summary["total_failed"]
+        processed_files = summary["processed_files"] + self._skipped_files
+        total_files = self._total_files
+        for error in summary["file_errors"]:
+            QMessageBox.warning(
+                self, "Erreur", f"Échec de la lecture du fichier {error}"
+            )
 
         # Si des réponses sont manquantes, proposer une interface de saisie
+        missing_responses = summary["missing_responses"]
         if missing_responses:
             self.prompt_missing_responses(missing_responses)
         # Message final avec le résumé
         custom_metadata_warning = ""
-        if not found_uuid and not found_creation_date:
+        if not self._found_uuid and not self._found_creation_date:
             custom_metadata_warning = (
                 "❗(UUID) et ❗(creation_date) ne sont pas trouvés dans vos fichiers."
             )
-        elif not found_uuid:
+        elif not self._found_uuid:
             custom_metadata_warning = "❗(UUID) n'est pas trouvé dans vos fichiers."
-        elif not found_creation_date:
+        elif not self._found_creation_date:
             custom_metadata_warning = (
                 "❗(creation_date) n'est pas trouvé dans vos fichiers."
             )
@@ -271,12 +524,18 @@ class MassImporter(QWidget):
                 "(UUID) et (creation_date) de coutume sont détectées et bien traitées."
             )
 
+        cancelled_notice = (
+            "⚠ Importation annulée : seules les entrées déjà écrites sont conservées.\n\n"
+            if summary["cancelled"]
+            else ""
+        )
         logger.info(
             f"Importation terminée: {total_imported} entrées importées, {total_failed} échecs sur {processed_files} fichiers."
         )
         QMessageBox.information(
             self,
             "Complèt",
+            f"{cancelled_notice}"
             f"Importation en masse terminée !\n\n"
             f"{total_files} fichiers traités\n"
             f"{total_imported} entrées importées avec succès\n"
@@ -284,6 +543,14 @@ class MassImporter(QWidget):
             f"{custom_metadata_warning}",
         )
 
+    def closeEvent(self, event):
+        """Annuler proprement une importation en cours avant de fermer."""
+        if self._import_thread is not None:
+            self._import_worker.cancel()
+            self._import_thread.quit()
+            self._import_thread.wait()
+        super().closeEvent(event)
+
     def prompt_missing_responses(self, missing_responses):
         """
         Affiche une boîte de dialogue non bloquante pour compléter les réponses manquantes.
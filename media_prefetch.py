@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, QUrl, Signal
+from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+from logger import logger
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+
+class MediaPrefetcher(QObject):
+    """
+    Préchargement des médias des prochaines cartes.
+    - En arrière-plan, les fichiers des `lookahead` prochaines entrées sont
+      vérifiés et lus (cache disque de l'OS), vidéos comprises.
+    - Le média de la carte suivante est ouvert à l'avance dans un second
+      QMediaPlayer ; au passage à cette carte, les deux lecteurs sont échangés
+      et la lecture démarre sans attendre l'ouverture ni le décodage.
+    `playbackStateChanged` ne relaie que les changements du lecteur actif.
+    """
+
+    playbackStateChanged = Signal(object)
+
+    WARM_CHUNK = 1 << 20
+    MAX_WARM_BYTES = 64 << 20  # Début des gros fichiers vidéo seulement
+
+    def __init__(self, parent=None, lookahead: int = 3):
+        super().__init__(parent)
+        self.lookahead = lookahead
+        self.player = self._make_player()
+        self._standby = self._make_player()
+        self._standby_path = None
+        self._warm = {}  # chemin -> Future (True si le fichier est lisible)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="media-prefetch"
+        )
+
+    def _make_player(self):
+        player = QMediaPlayer(self)
+        output = QAudioOutput(player)
+        player.setAudioOutput(output)
+        player.playbackStateChanged.connect(
+            lambda state, p=player: self._relay_state(p, state)
+        )
+        return player
+
+    def _relay_state(self, player, state):
+        if player is self.player:
+            self.playbackStateChanged.emit(state)
+
+    def prefetch(self, media_paths):
+        """Prépare les `lookahead` prochains médias ; le premier est pré-ouvert."""
+        upcoming = [
+            path for path in media_paths[: self.lookahead] if isinstance(path, str)
+        ]
+        for path in upcoming:
+            if path and path not in self._warm:
+                self._warm[path] = self._executor.submit(self._warm_file, path)
+        # Oublier les fichiers qui ne sont plus dans la fenêtre
+        for path in list(self._warm):
+            if path not in upcoming:
+                del self._warm[path]
+        next_path = upcoming[0] if upcoming else None
+        if next_path and next_path.lower().endswith(AUDIO_EXTENSIONS):
+            self._preload(next_path)
+
+    def _preload(self, path):
+        if path == self._standby_path or not os.path.exists(path):
+            return
+        self._standby.setSource(QUrl.fromLocalFile(os.path.abspath(path)))
+        self._standby_path = path
+
+    def take(self, path):
+        """
+        Si `path` est le média pré-ouvert, échange les lecteurs et retourne le
+        lecteur prêt à jouer ; sinon None.
+        """
+        if not path or path != self._standby_path:
+            return None
+        self._standby_path = None
+        if self._standby.mediaStatus() == QMediaPlayer.InvalidMedia:
+            return None
+        self.player, self._standby = self._standby, self.player
+        # Libérer l'ancien média ; le lecteur sert au prochain préchargement
+        self._standby.blockSignals(True)
+        self._standby.stop()
+        self._standby.setSource(QUrl())
+        self._standby.blockSignals(False)
+        return self.player
+
+    def stop(self):
+        self.player.stop()
+        self._standby.stop()
+
+    def shutdown(self):
+        self.stop()
+        self._warm.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def _warm_file(cls, path) -> bool:
+        """Vérifie le fichier et en charge le début dans le cache disque."""
+        try:
+            with open(path, "rb") as file:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                read = 0
+                while read < cls.MAX_WARM_BYTES:
+                    chunk = file.read(cls.WARM_CHUNK)
+                    if not chunk:
+                        break
+                    read += len(chunk)
+            return read > 0
+        except OSError as e:
+            logger.warning(f"Préchargement impossible pour {path}: {e}")
+            return False
@@ -25,6 +25,8 @@ from common_methods import TimeUtils, MediaUtils
 from PySide6.QtWidgets import QDialogButtonBox
 
 from common_methods import ProgressBarHelper
+from db import INSERT_ERROR
+from logger import logger
 
 
 class MissingResponsesDialog(QDialog):
@@ -333,26 +335,54 @@ class MissingResponsesDialog(QDialog):
             return
         # Insertion automatique dans la base si db_manager fourni
         if self.db_manager is not None:
+            answered = [
+                entry for entry in self.entries if entry.get("response", "").strip()
+            ]
+            rows = [
+                {
+                    "media_file": entry.get("audio_path", ""),
+                    "question": entry.get("question", ""),
+                    "response": entry.get("response", ""),
+                    "start_time_ms": entry.get("start_time_ms"),
+                    "end_time_ms": entry.get("end_time_ms"),
+                    "UUID": entry.get("UUID"),
+                    "creation_date": entry.get("creation_date"),
+                    "attribution": entry.get("attribution", "no-attribution"),
+                }
+                for entry in answered
+            ]
             progress = ProgressBarHelper(parent_layout=self.layout)
-            progress.show(len(self.entries))
-            count = 0
-            for idx, entry in enumerate(self.entries, start=1):
-                if entry.get("response", "").strip():
-                    try:
-                        self.db_manager.insert_record(
-                            entry.get("audio_path", ""),
-                            entry.get("question", ""),
-                            entry.get("response", ""),
-                            entry.get("start_time_ms"),
-                            entry.get("end_time_ms"),
-                            entry.get("UUID"),
-                            entry.get("creation_date"),
-                        )
-                        count += 1
-                    except Exception as e:
-                        print(f"Erreur lors de l'insertion manuelle: {e}")
-                progress.set_value(idx)
+            progress.show(len(rows))
+            try:
+                # Les audios manquants sont générés en parallèle par lots
+                statuses = self.db_manager.insert_records_bulk(
+                    rows,
+                    progress_callback=progress.set_value,
+                )
+            except Exception as e:
+                logger.error(f"Erreur lors de l'insertion manuelle: {e}")
+                statuses = [INSERT_ERROR] * len(rows)
             progress.hide()
+            failed = [
+                entry
+                for entry, status in zip(answered, statuses)
+                if status == INSERT_ERROR
+            ]
+            if failed:
+                # Garder les entrées non enregistrées (et le fichier de progrès)
+                # pour que l'utilisateur puisse les corriger ou réessayer
+                self.entries[:] = failed
+                self.current_index = 0
+                self.update_entry()
+                self.save_progress()
+                QMessageBox.warning(
+                    self,
+                    "Erreur",
+                    f"{len(failed)} entrée(s) n'ont pas pu être enregistrées "
+                    "(voir le journal). Elles restent affichées et sauvegardées "
+                    "dans le progrès.",
+                )
+                return
             # Supprimer le fichier de progrès uniquement après succès
             if os.path.exists(self.PROGRESS_FILE):
                 try:
@@ -1,30 +1,36 @@
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QAbstractItemView,
     QPushButton,
     QMessageBox,
     QHBoxLayout,
     QLineEdit,
     QHeaderView,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QTimer
 from PySide6.QtGui import QKeySequence, QShortcut
-import csv
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from common_methods import FavoritesManager, DialogUtils, ProgressBarHelper, MediaUtils
 from logger import logger
+from record_model import (
+    ButtonDelegate,
+    RecordTableModel,
+    FAVORITE_COLUMN,
+    PLAY_COLUMN,
+)
 
 
 class RecordManagerApp(QWidget):
+    SEARCH_DELAY_MS = 250  # délai sans frappe avant de lancer la recherche
+
     def __init__(self, db_manager, font_size=12):
         super().__init__()
         self.setWindowTitle("Gérer les entrées")
         self.db_manager = db_manager
         self.font_size = font_size
         self.setStyleSheet(f"* {{ font-size: {self.font_size}px; }}")
-        self.changed_lines = set()
         self.setup_ui()
         self.showMaximized()
 
@@ -47,7 +53,16 @@ class RecordManagerApp(QWidget):
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Rechercher...")
-        self.search_input.textChanged.connect(self.search_records)
+        # Chaque frappe relance le minuteur : les recherches intermédiaires
+        # (périmées) ne sont jamais exécutées
+        self._last_search = ""
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(
+            lambda: self.search_records(self.search_input.text())
+        )
+        self.search_input.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(self.search_input)
         layout.addLayout(search_layout)
 
@@ -67,22 +82,28 @@ class RecordManagerApp(QWidget):
         self.goto_shortcut = QShortcut(QKeySequence("Ctrl+G"), self)
         self.goto_shortcut.activated.connect(self.line_input.setFocus)
 
-        # Table pour afficher les entrées
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(
-            [
-                "UUID",
-                "Fichier Média",
-                "Question",
-                "Réponse",
-                "Créé le",
-                "Attribution",
-                "Lire",
-                "Favori",
-            ]
+        # Table pour afficher les entrées, chargées par pages depuis la base
+        self.model = RecordTableModel(self.db_manager, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed
         )
-        self.table.itemChanged.connect(self.track_changes)
+        self.play_delegate = ButtonDelegate(self.table)
+        self.play_delegate.clicked.connect(
+            lambda index: self.play_media_file(
+                self.model.record_at(index.row())["media_file"]
+            )
+        )
+        self.table.setItemDelegateForColumn(PLAY_COLUMN, self.play_delegate)
+        self.favorite_delegate = ButtonDelegate(self.table, color="#ffd700")
+        self.favorite_delegate.clicked.connect(
+            lambda index: FavoritesManager.mark_as_favorite(
+                self.db_manager, self.model.record_at(index.row())["UUID"], self
+            )
+        )
+        self.table.setItemDelegateForColumn(FAVORITE_COLUMN, self.favorite_delegate)
         layout.addWidget(self.table)
 
         self.resize_table_columns()
@@ -112,7 +133,7 @@ class RecordManagerApp(QWidget):
         button_layout.addWidget(filter_date_button)
 
         clear_error_button = QPushButton("effacer les signalisations des erreurs (&D)")
-        clear_error_button.clicked.connect(self.clear_error_file)
+        clear_error_button.clicked.connect(self.clear_error_reports)
         button_layout.addWidget(clear_error_button)
 
         layout.addLayout(button_layout)
@@ -134,19 +155,14 @@ class RecordManagerApp(QWidget):
         self.audio_output = QAudioOutput(self)
         self.media_player.setAudioOutput(self.audio_output)
 
-        self.load_records()
-
     def focus_search_input(self):
         self.search_input.setFocus()
 
     def focus_line_input(self):
         self.line_input.setFocus()
 
-    def track_changes(self, item):
-        self.changed_lines.add(item.row())
-
     def closeEvent(self, event):
-        if self.changed_lines:
+        if self.model.pending_changes:
             reply = QMessageBox.question(
                 self,
                 "Modifications non sauvegardées",
@@ -166,49 +182,25 @@ class RecordManagerApp(QWidget):
             event.accept()
 
     def save_changes(self):
-        visible_uuids = set()
-        for row in range(self.table.rowCount()):
-            if not self.table.isRowHidden(row):
-                uuid_item = self.table.item(row, 0)
-                if uuid_item:
-                    visible_uuids.add(uuid_item.text())
-
-        changed_lines_copy = list(self.changed_lines)
-        total_changes = len(changed_lines_copy)
+        changes = list(self.model.pending_changes.values())
+        total_changes = len(changes)
         if total_changes == 0:
             QMessageBox.information(self, "Info", "Aucune modification à enregistrer.")
             self.load_records()
             return
 
         self.progress_helper.show(total_changes)
-        for i, row in enumerate(changed_lines_copy):
-            if (
-                self.table.item(row, 0) is None
-                or self.table.item(row, 2) is None
-                or self.table.item(row, 3) is None
-            ):
-                self.changed_lines.discard(row)
-                continue
-
-            record_id = self.table.item(row, 0).text()
-            new_media_file = self.table.item(row, 1).text()
-            new_question = self.table.item(row, 2).text()
-            new_response = self.table.item(row, 3).text()
-            new_attribution = (
-                self.table.item(row, 5).text()
-                if self.table.item(row, 5)
-                else "no-attribution"
-            )
-
+        for i, record in enumerate(changes):
+            record_id = record["UUID"]
             try:
                 success = self.db_manager.update_record(
                     record_id,
-                    new_media_file,
-                    new_question,
-                    new_response,
-                    new_attribution,
+                    record["media_file"],
+                    record["question"],
+                    record["response"],
+                    record.get("attribution") or "no-attribution",
                 )
-                self.changed_lines.discard(row)
+                self.model.pending_changes.pop(record_id, None)
                 if success:
                     logger.info(
                         f"entry UUID={record_id} is successfully modified by user."
@@ -223,69 +215,23 @@ class RecordManagerApp(QWidget):
 
         self.progress_helper.hide()
 
-        if not self.changed_lines:
+        if not self.model.pending_changes:
             QMessageBox.information(
                 self, "Succès", "Toutes les modifications ont été enregistrées."
             )
-        self.table.blockSignals(True)
+        # Le filtre courant (recherche, dates, erreurs) est conservé par le modèle
         self.load_records()
-        self.table.blockSignals(False)
-
-        for row in range(self.table.rowCount()):
-            uuid_item = self.table.item(row, 0)
-            if uuid_item and uuid_item.text() in visible_uuids:
-                self.table.setRowHidden(row, False)
-            else:
-                self.table.setRowHidden(row, True)
-
-        if self.search_input.text():
-            self.search_records(self.search_input.text())
 
     def load_records(self):
-        self.table.blockSignals(True)
-        self.table.setRowCount(0)
-        records = self.db_manager.fetch_all_records()
-        self.table.setRowCount(len(records))
-        for row, record in enumerate(records):
-            uuid_item = QTableWidgetItem(record["UUID"])
-            uuid_item.setFlags(uuid_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 0, uuid_item)
-
-            self.table.setItem(row, 1, QTableWidgetItem(record["media_file"]))
-
-            self.table.setItem(row, 2, QTableWidgetItem(record["question"]))
-
-            self.table.setItem(row, 3, QTableWidgetItem(record["response"]))
-
-            creation_date_item = QTableWidgetItem(record["creation_date"])
-            creation_date_item.setFlags(creation_date_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 4, creation_date_item)
-
-            self.table.setItem(
-                row, 5, QTableWidgetItem(record.get("attribution", "no-attribution"))
-            )
-
-            play_button = QPushButton("Lire")
-            play_button.clicked.connect(
-                lambda checked, media_file=record["media_file"]: self.play_media_file(
-                    media_file
-                )
-            )
-            self.table.setCellWidget(row, 6, play_button)
-
-            fav_button = QPushButton("Favori")
-            fav_button.setStyleSheet(
-                "background-color: #ffd700; color: #333; font-weight: bold;"
-            )
-            fav_button.clicked.connect(
-                lambda checked, uuid=record["UUID"]: FavoritesManager.mark_as_favorite(
-                    self.db_manager, uuid, self
-                )
-            )
-            self.table.setCellWidget(row, 7, fav_button)
-
+        if self._last_search:
+            # Après une écriture, la recherche matérialisée est recalculée : une
+            # entrée modifiée peut entrer dans les résultats ou en sortir
+            where, params = self.db_manager.materialize_search(self._last_search)
+            self._last_search = self._last_search if where else ""
+            self.model.set_filter(where, params)
+        else:
+            self.model.reload()
         self.resize_table_columns()
-        self.table.blockSignals(False)
 
     def play_media_file(self, media_file):
         MediaUtils.play_media_file_qt(self, media_file, self.media_player)
@@ -300,10 +246,10 @@ class RecordManagerApp(QWidget):
             )
             return
 
-        rows_to_delete = sorted([index.row() for index in selected_rows], reverse=True)
-        self.table.blockSignals(True)
-        for row in rows_to_delete:
-            record_id = self.table.item(row, 0).text()
+        record_ids = [
+            self.model.record_at(index.row())["UUID"] for index in selected_rows
+        ]
+        for record_id in record_ids:
             success = self.db_manager.delete_record(record_id)
             if not success:
                 QMessageBox.critical(
@@ -311,29 +257,22 @@ class RecordManagerApp(QWidget):
                     "Erreur",
                     f"Échec de la suppression de l'entrée UUID: {record_id}.",
                 )
-                self.table.blockSignals(False)
+                self.load_records()
                 return
-            self.changed_lines.discard(row)
-            self.changed_lines = set(
-                (i - 1 if i > row else i) for i in self.changed_lines
-            )
+            self.model.pending_changes.pop(record_id, None)
 
-        self.table.blockSignals(False)
         QMessageBox.information(self, "Succès", "entrée(s) supprimé(s) avec succès.")
         self.load_records()
 
     def search_records(self, keyword):
-        keyword = keyword.lower()
-        self.table.blockSignals(True)
-        for row in range(self.table.rowCount()):
-            match = False
-            for column in range(self.table.columnCount()):
-                item = self.table.item(row, column)
-                if item and keyword in item.text().lower():
-                    match = True
-                    break
-            self.table.setRowHidden(row, not match)
-        self.table.blockSignals(False)
+        # Recherche plein texte (FTS5) côté base : seules les pages affichées sont lues.
+        # Si le texte prolonge la recherche précédente, on affine ses résultats.
+        self.search_timer.stop()
+        keyword = keyword.strip()
+        refine = bool(self._last_search) and keyword.startswith(self._last_search)
+        where, params = self.db_manager.materialize_search(keyword, refine)
+        self._last_search = keyword if where else ""
+        self.model.set_filter(where, params)
 
     def go_to_line(self):
         line_number_str = self.line_input.text()
@@ -344,44 +283,32 @@ class RecordManagerApp(QWidget):
             return
 
         line_number = int(line_number_str)
-        if line_number < 1 or line_number > self.table.rowCount():
+        if line_number < 1 or line_number > self.model.total_count():
             QMessageBox.warning(
                 self,
                 "Erreur",
-                f"Le numéro de ligne doit être entre 1 et {self.table.rowCount()}.",
+                f"Le numéro de ligne doit être entre 1 et {self.model.total_count()}.",
             )
             return
 
         row_index = line_number - 1
-        self.table.scrollToItem(self.table.item(row_index, 0))
+        self.model.ensure_loaded(row_index)
+        self.table.scrollTo(self.model.index(row_index, 0))
         self.table.selectRow(row_index)
         self.line_input.clear()
 
     def filter_error_records(self):
         try:
-            with open("entry_error.csv", "r", encoding="utf-8") as file:
-                reader = csv.reader(file)
-                error_uuids = {row[0] for row in reader}
-            self.table.blockSignals(True)
-            for row in range(self.table.rowCount()):
-                uuid_item = self.table.item(row, 0)
-                if uuid_item and uuid_item.text() in error_uuids:
-                    self.table.setRowHidden(row, False)
-                else:
-                    self.table.setRowHidden(row, True)
-            self.table.blockSignals(False)
+            where, params = self.db_manager.error_reports_filter()
+            self._last_search = ""
+            self.model.set_filter(where, params)
             QMessageBox.information(self, "Info", "Filtrage des erreurs terminé.")
-        except FileNotFoundError:
-            QMessageBox.warning(
-                self, "Erreur", "Le fichier entry_error.csv est introuvable."
-            )
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Une erreur s'est produite: {e}")
 
-    def clear_error_file(self):
+    def clear_error_reports(self):
         try:
-            with open("entry_error.csv", "w", encoding="utf-8") as file:
-                pass
+            self.db_manager.clear_error_reports()
             QMessageBox.information(
                 self, "Succès", "les signals ont été effacé avec succès."
             )
@@ -390,54 +317,22 @@ class RecordManagerApp(QWidget):
         self.load_records()
 
     def edit_selected_cell(self):
-        selected_items = self.table.selectedItems()
-        if selected_items:
-            self.table.editItem(selected_items[0])
+        index = self.table.currentIndex()
+        if index.isValid():
+            self.table.edit(index)
 
     def filter_by_date_range(self):
         result = DialogUtils.select_date_range(self)
         if not result:
             return
         start, end = result
-        records = self.db_manager.fetch_record_by_creation_date(start, end)
-        if not records:
+        where = "creation_date BETWEEN ? AND ?"
+        params = [start.isoformat(), end.isoformat()]
+        if not self.db_manager.count_records(where, params):
             QMessageBox.information(
                 self, "Info", "Aucune entrée trouvée pour cette plage de dates."
             )
             return
-        self.table.blockSignals(True)
-        self.table.setRowCount(0)
-        self.table.setRowCount(len(records))
-        for row, record in enumerate(records):
-            uuid_item = QTableWidgetItem(record["UUID"])
-            uuid_item.setFlags(uuid_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 0, uuid_item)
-            self.table.setItem(row, 1, QTableWidgetItem(record["media_file"]))
-            self.table.setItem(row, 2, QTableWidgetItem(record["question"]))
-            self.table.setItem(row, 3, QTableWidgetItem(record["response"]))
-            creation_date_item = QTableWidgetItem(record["creation_date"])
-            creation_date_item.setFlags(creation_date_item.flags() & ~Qt.ItemIsEditable)
-            self.table.setItem(row, 4, creation_date_item)
-            self.table.setItem(
-                row, 5, QTableWidgetItem(record.get("attribution", "no-attribution"))
-            )
-            play_button = QPushButton("Lire")
-            play_button.clicked.connect(
-                lambda checked, media_file=record["media_file"]: self.play_media_file(
-                    media_file
-                )
-            )
-            self.table.setCellWidget(row, 6, play_button)
-            fav_button = QPushButton("Favori")
-            fav_button.setStyleSheet(
-                "background-color: #ffd700; color: #333; font-weight: bold;"
-            )
-            fav_button.clicked.connect(
-                lambda checked, uuid=record["UUID"]: FavoritesManager.mark_as_favorite(
-                    self.db_manager, uuid, self
-                )
-            )
-            self.table.setCellWidget(row, 7, fav_button)
-
+        self._last_search = ""
+        self.model.set_filter(where, params)
         self.resize_table_columns()
-        self.table.blockSignals(False)
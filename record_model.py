@@ -0,0 +1,169 @@
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import (
+    QApplication,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+)
+
+# (clé du dict d'entrée, en-tête) ; les deux dernières colonnes sont des boutons
+COLUMNS = [
+    ("UUID", "UUID"),
+    ("media_file", "Fichier Média"),
+    ("question", "Question"),
+    ("response", "Réponse"),
+    ("creation_date", "Créé le"),
+    ("attribution", "Attribution"),
+    (None, "Lire"),
+    (None, "Favori"),
+]
+EDITABLE_COLUMNS = {1, 2, 3, 5}
+PLAY_COLUMN = 6
+FAVORITE_COLUMN = 7
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Modèle paresseux des entrées : les lignes sont lues par pages depuis la base
+    (canFetchMore/fetchMore) au fil du défilement, la mémoire et le temps
+    d'ouverture ne dépendent donc pas de la taille de la base.
+    Les modifications restent en attente dans `pending_changes` (UUID -> entrée)
+    jusqu'à l'enregistrement, y compris si le filtre change entre-temps.
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.pending_changes = {}
+        self._rows = []
+        self._total = 0
+        self._last_rowid = 0
+        self._where = ""
+        self._params = []
+        self.reload()
+
+    def set_filter(self, where: str = "", params: list = None):
+        """Filtre SQL appliqué aux requêtes (sans le mot-clé WHERE)."""
+        self._where = where
+        self._params = list(params or [])
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self._rows = []
+        self._last_rowid = 0
+        self._total = self.db_manager.count_records(self._where, self._params)
+        self.endResetModel()
+        # Première page tout de suite ; les suivantes au fil du défilement
+        if self.canFetchMore():
+            self.fetchMore()
+
+    def total_count(self) -> int:
+        """Nombre d'entrées correspondant au filtre, chargées ou non."""
+        return self._total
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = self.db_manager.fetch_records_page(
+            self.PAGE_SIZE, self._last_rowid, self._where, self._params
+        )
+        if not page:
+            # La base a changé depuis le comptage
+            self._total = len(self._rows)
+            return
+        # Réappliquer les modifications non enregistrées
+        page = [self.pending_changes.get(record["UUID"], record) for record in page]
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self._last_rowid = page[-1]["rowid"]
+        self.endInsertRows()
+
+    def ensure_loaded(self, row: int):
+        """Charge les pages nécessaires pour que la ligne `row` existe."""
+        while row >= len(self._rows) and self.canFetchMore():
+            self.fetchMore()
+
+    def record_at(self, row: int) -> dict:
+        return self._rows[row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        key, header = COLUMNS[index.column()]
+        if key is None:
+            return header
+        return self._rows[index.row()].get(key)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or index.column() not in EDITABLE_COLUMNS:
+            return False
+        record = self._rows[index.row()]
+        key = COLUMNS[index.column()][0]
+        if record.get(key) == value:
+            return False
+        record[key] = value
+        self.pending_changes[record["UUID"]] = record
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() in EDITABLE_COLUMNS:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return COLUMNS[section][1]
+        return section + 1
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Dessine un bouton dans la cellule sans créer de widget par ligne."""
+
+    clicked = Signal(QModelIndex)
+
+    def __init__(self, parent=None, color: str = None):
+        super().__init__(parent)
+        self.color = color
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data()
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        button.palette = QPalette(option.palette)
+        if self.color:
+            button.palette.setColor(QPalette.Button, QColor(self.color))
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and option.rect.contains(
+            event.position().toPoint()
+        ):
+            self.clicked.emit(index)
+            return True
+        return False
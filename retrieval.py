@@ -10,10 +10,7 @@
 
 import difflib
 import os
-import unicodedata
-import string
-import json  # Importer le module JSON pour la sauvegarde et la restauration
-import csv  # Importer le module CSV pour enregistrer les erreurs
+import time
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -23,28 +20,48 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QDialog,
     QFileDialog,  # Importer QFileDialog pour sélectionner un fichier
+    QCheckBox,
+    QInputDialog,
 )
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PySide6.QtMultimedia import QMediaPlayer
 from PySide6.QtCore import (
     Qt,
     QTimer,  # Importer QTimer pour gérer les délais
 )  # Importer QDate pour gérer les dates Qt et Qt pour les options de fenêtre
 from PySide6.QtGui import QShortcut, QKeySequence  # Importer QShortcut et QKeySequence
 from logger import logger  # Remplacer l'import de logging par le logger centralisé
-import re
-from common_methods import FavoritesManager, DialogUtils, TextUtils, MediaUtils
+from common_methods import FavoritesManager, DialogUtils, MediaUtils
+from card_view import CardView
+from session_journal import SessionJournal
+from media_prefetch import MediaPrefetcher
+from text_normalization import (
+    normalize_special_characters,
+    normalize_text,
+    strip_with_index_map,
+)
+from grading import CORRECT, INCORRECT, NEAR_MISS, GradingEngine
+from scheduler import ReviewScheduler
+from review_log import MODE_RETRIEVAL, MODE_REVIEW, ReviewLogBuffer
 
 
 class RetrievalApp(QWidget):
+    # Nombre maximal de cartes chargées pour une session de cartes dues
+    DUE_SESSION_LIMIT = 200
+
     # --- Initialisation et configuration générale ---
-    def __init__(self, db_manager, font_size=12, review_mode=False):
+    def __init__(self, db_manager, font_size=12, review_mode=False, grader=None):
         super().__init__()
         self.db_manager = db_manager
+        self.grader = grader or GradingEngine.from_config()
+        self.scheduler = ReviewScheduler(db_manager)
+        self.review_log = ReviewLogBuffer(db_manager, self)
+        self._card_shown_at = None
         self.font_size = font_size
         self.review_mode = review_mode
         self.records = None
         self.current_record_index = 0
         self.current_dialog = None
+        self.session_journal = SessionJournal("saved_records.json")
         self.autoplay_enabled = False
         self._video_dialog_ref = type(
             "VideoDialogRef", (), {}
@@ -74,16 +91,24 @@ class RetrievalApp(QWidget):
         logger.info("Raccourci Ctrl+W ajouté pour fermer la fenêtre")
 
     def _setup_audio(self):
-        self.media_player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.media_player.setAudioOutput(self.audio_output)
-        self.media_player.playbackStateChanged.connect(self.on_audio_state_changed)
+        # Deux lecteurs : l'actif et celui qui pré-ouvre le média de la carte suivante
+        self.media_prefetcher = MediaPrefetcher(self)
+        self.media_prefetcher.playbackStateChanged.connect(self.on_audio_state_changed)
+
+    @property
+    def media_player(self):
+        return self.media_prefetcher.player
 
     # --- Gestion des fichiers de session (sauvegarde/restauration) ---
     def save_records_to_file(self, file_path="saved_records.json"):
         try:
-            with open(file_path, "w", encoding="utf-8") as file:
-                json.dump(self.records, file, ensure_ascii=False, indent=4)
+            SessionJournal.write_snapshot(
+                file_path,
+                self.records,
+                cursor=self.current_record_index,
+                initial_count=getattr(self, "_initial_record_count", None),
+                created_at=self.session_journal.created_at,
+            )
             logger.info(f"Enregistrements sauvegardés dans {file_path}")
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde des enregistrements: {e}")
@@ -94,8 +119,16 @@ class RetrievalApp(QWidget):
     def load_records_from_file(self, file_path="saved_records.json"):
         try:
             if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as file:
-                    self.records = json.load(file)
+                # Instantané (UUID) + rejeu du journal, puis une lecture groupée en base
+                session = SessionJournal(file_path).load()
+                self.records = self.db_manager.fetch_records_by_uuids(session["uuids"])
+                self.current_record_index = min(
+                    session["cursor"], max(len(self.records) - 1, 0)
+                )
+                self._initial_record_count = max(
+                    session["initial_count"], len(self.records)
+                )
+                self.session_journal.created_at = session["created_at"]
                 logger.info(f"Enregistrements chargés depuis {file_path}")
                 return True
             else:
@@ -124,10 +157,7 @@ class RetrievalApp(QWidget):
         return False
 
     def saved_session_overwirte_warning(self):
-        if (
-            os.path.exists("saved_records.json")
-            and os.path.getsize("saved_records.json") > 0
-        ):
+        if self.session_journal.exists():
             overwrite_warning = QMessageBox.question(
                 self,
                 "Attention",
@@ -141,10 +171,7 @@ class RetrievalApp(QWidget):
 
     # --- Sélection et chargement des enregistrements (UI d'entrée) ---
     def show_setup_dialog(self):
-        if (
-            os.path.exists("saved_records.json")
-            and os.path.getsize("saved_records.json") > 0
-        ):
+        if self.session_journal.exists():
             reply = QMessageBox.question(
                 self,
                 "Session précédente détectée",
@@ -152,8 +179,7 @@ class RetrievalApp(QWidget):
                 QMessageBox.Yes | QMessageBox.No,
             )
             if reply == QMessageBox.Yes:
-                if self.load_records_from_file():
-                    self.refresh_records_from_db()
+                if self.load_records_from_file() and self.records:
                     self.initialize_ui()
                     return
 
@@ -162,10 +188,16 @@ class RetrievalApp(QWidget):
         layout = QVBoxLayout(self.current_dialog)
 
         label = QLabel(
-            "Voulez-vous afficher tous les enregistrements, une gamme de dates spécifique, les favoris ou restaurer une session précédente ?"
+            "Voulez-vous réviser les entrées dues, afficher tous les enregistrements, une gamme de dates spécifique, les favoris ou restaurer une session précédente ?"
         )
         layout.addWidget(label)
 
+        due_button = QPushButton("Réviser les entrées dues")
+        due_button.clicked.connect(
+            lambda: self.handle_due_records_selection(self.current_dialog)
+        )
+        layout.addWidget(due_button)
+
         date_range_button = QPushButton("Afficher une gamme de dates")
         date_range_button.clicked.connect(
             lambda: self.handle_date_range_selection(self.current_dialog)
@@ -207,6 +239,17 @@ class RetrievalApp(QWidget):
             QMessageBox.information(self, "Info", "Aucun entrée trouvé.")
             self.show_setup_dialog()
 
+    def handle_due_records_selection(self, dialog):
+        if self.saved_session_overwirte_warning():
+            return
+        dialog.accept()
+        self.records = self.db_manager.fetch_due_records(self.DUE_SESSION_LIMIT)
+        if self.records:
+            self.initialize_ui()
+        else:
+            QMessageBox.information(self, "Info", "Aucune entrée à réviser.")
+            self.show_setup_dialog()
+
     def handle_all_records_selection(self, dialog):
         if self.saved_session_overwirte_warning():
             return
@@ -237,7 +280,6 @@ class RetrievalApp(QWidget):
 
         if success:
             if self.records:
-                self.refresh_records_from_db()
                 self.initialize_ui()
             else:
                 QMessageBox.information(
@@ -252,242 +294,220 @@ class RetrievalApp(QWidget):
 
     # --- Interface principale de révision ---
     def initialize_ui(self):
+        # sauvegarder progrès en cas de crash
+        self.session_journal.start(
+            self.records,
+            initial_count=getattr(self, "_initial_record_count", None),
+            cursor=self.current_record_index,
+        )
         self.showMaximized()
         self.display_next_item()
 
-    def display_next_item(self):
-        while self.main_layout.count():
-            child = self.main_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        if not self.records:
-            self.update_usage_stats()  # Enregistrer la fin de session
-            if os.path.exists("saved_records.json"):
-                try:
-                    os.remove("saved_records.json")
-                    logger.info(
-                        "Fichier saved_records.json supprimé après la fin de la session."
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Erreur lors de la suppression de saved_records.json: {e}"
-                    )
-            self.play_audio("assets/audio_effects/félicitations.ogg")
-            end_label = QLabel("Tout fait! Félicitations! ✨ 🌟 ✨")
-            end_label.setAlignment(Qt.AlignCenter)
-            self.main_layout.addWidget(end_label)
-            close_button = QPushButton("Fermer")
-            close_button.clicked.connect(self.close)
-            self.main_layout.addWidget(close_button)
-            return
-
-        record = self.records[self.current_record_index]
-
-        if not hasattr(self, "_initial_record_count"):
-            self._initial_record_count = len(self.records)
-        progress = (
-            1 - (len(self.records) / self._initial_record_count)
-            if self._initial_record_count
-            else 1
-        )
-        percent = int(progress * 100)
-        progress_label = QLabel(f"Progression : {percent}%")
-        progress_label.setAlignment(Qt.AlignRight)
-        self.main_layout.addWidget(progress_label)
-
-        questions = [q.strip() for q in record["question"].split(";") if q.strip()]
-        responses = [r.strip() for r in record["response"].split(";") if r.strip()]
-        audio_path = record["media_file"]
-        entry_uuid = record.get("UUID", "unknown_uuid")
+    def _build_views(self):
+        """Construit une seule fois la vue de carte, ses boutons et l'écran de fin ;
+        les cartes suivantes ne font que relier ces widgets aux nouvelles données.
+        """
+        self.card_view = CardView(self)
+        self.main_layout.addWidget(self.card_view)
 
-        # Affichage commun (questions/réponses, audio, boutons)
-        if getattr(self, "review_mode", False):
-            self._show_questions_with_responses(questions, responses)
-        else:
-            self.response_inputs = []
-            question_widgets = []
-            response_idx = 0
-            first_input = None
-            for idx, q in enumerate(questions):
-                if "(?)" in q:
-                    num_blanks = q.count("(?)")
-                    placeholders = [
-                        "<span style='color:#888;'>______</span>"
-                    ] * num_blanks
-
-                    def make_question_html(q, values):
-                        parts = q.split("(?)")
-                        html = ""
-                        for i, part in enumerate(parts):
-                            html += part
-                            if i < len(values):
-                                html += f"<b><span style='color:#1976d2;'>{values[i] if values[i] else '______'}</span></b>"
-                        return html
-
-                    current_values = [""] * num_blanks
-                    question_label = QLabel()
-                    question_label.setTextFormat(Qt.RichText)
-                    question_label.setWordWrap(True)
-                    question_label.setAlignment(Qt.AlignHCenter)
-                    question_label.setText(make_question_html(q, current_values))
-                    self.main_layout.addWidget(question_label)
-                    blank_inputs = []
-                    for i in range(num_blanks):
-                        correct_resp = (
-                            responses[response_idx]
-                            if response_idx < len(responses)
-                            else ""
-                        )
-                        if hasattr(self, "fontMetrics"):
-                            width = (
-                                self.fontMetrics().horizontalAdvance(correct_resp) + 18
-                            )
-                        else:
-                            width = max(60, min(300, 10 * len(correct_resp) + 18))
-                        response_input = QLineEdit()
-                        response_input.setMinimumWidth(width)
-                        response_input.setMaximumWidth(width)
-                        response_input.setAlignment(Qt.AlignCenter)
-                        response_input.setStyleSheet(
-                            "margin:4px 0 12px 0;padding:2px 6px;"
-                        )
-                        self.response_inputs.append(response_input)
-                        blank_inputs.append(response_input)
-                        response_idx += 1
-                        self.main_layout.addWidget(
-                            response_input, alignment=Qt.AlignHCenter
-                        )
-                        if first_input is None:
-                            first_input = response_input
-
-                    def update_label():
-                        values = [edit.text() for edit in blank_inputs]
-                        question_label.setText(make_question_html(q, values))
-
-                    for edit in blank_inputs:
-                        edit.textChanged.connect(update_label)
-                    update_label()
-                else:
-                    label = QLabel(f"{idx+1}. {q}")
-                    self.main_layout.addWidget(label)
-                    response_input = QLineEdit()
-                    self.main_layout.addWidget(response_input)
-                    self.response_inputs.append(response_input)
-                    response_idx += 1
-                    if first_input is None:
-                        first_input = response_input
-            if first_input is not None:
-                first_input.setFocus()
-
-        play_button = QPushButton("Lire l'audio (&A)")
+        play_button = self.card_view.add_control(QPushButton("Lire l'audio (&A)"))
         play_button.setStyleSheet(
             "background-color: #b3e5fc; color: #01579b; font-weight: bold;"
         )
-        play_button.clicked.connect(lambda: self.play_audio(audio_path))
-        self.main_layout.addWidget(play_button)
+        play_button.clicked.connect(
+            lambda: self.play_audio(self.current_record()["media_file"])
+        )
 
-        favorite_button = QPushButton("Favori (&F)")
+        favorite_button = self.card_view.add_control(QPushButton("Favori (&F)"))
         favorite_button.setStyleSheet(
             "background-color: #ffd700; color: #333; font-weight: bold;"
         )
-        favorite_button.clicked.connect(lambda: self.mark_as_favorite(entry_uuid))
-        self.main_layout.addWidget(favorite_button)
+        favorite_button.clicked.connect(lambda: self.mark_as_favorite())
 
-        report_error_button = QPushButton("Signaler une erreur (&E)")
+        report_error_button = self.card_view.add_control(
+            QPushButton("Signaler une erreur (&E)")
+        )
         report_error_button.setStyleSheet(
             "background-color: #c14a6c; color: white; font-weight: bold;"
         )
-        report_error_button.clicked.connect(lambda: self.report_error(entry_uuid))
-        self.main_layout.addWidget(report_error_button)
+        report_error_button.clicked.connect(lambda: self.report_error())
 
         if getattr(self, "review_mode", False):
-            skip_button = QPushButton("Sauter (&K)")
+            skip_button = self.card_view.add_control(QPushButton("Sauter (&K)"))
             skip_button.setStyleSheet(
                 "background-color: #e0e0e0; color: #222; font-weight: bold;"
             )
             skip_button.clicked.connect(self.skip_current_entry)
-            self.main_layout.addWidget(skip_button)
-            from PySide6.QtWidgets import QCheckBox
-
-            autoplay_checkbox = QCheckBox("Lecture auto (autoplay) (&L)")
+            autoplay_checkbox = self.card_view.add_control(
+                QCheckBox("Lecture auto (autoplay) (&L)")
+            )
             autoplay_checkbox.setChecked(self.autoplay_enabled)
 
             def toggle_autoplay(state):
                 self.autoplay_enabled = bool(state)
 
             autoplay_checkbox.stateChanged.connect(toggle_autoplay)
-            self.main_layout.addWidget(autoplay_checkbox)
-            return
-        # Mode normal : boutons spécifiques
-        enter_shortcut = QShortcut(QKeySequence(Qt.Key_Return), self)
-        enter_shortcut.activated.connect(
-            lambda correct_responses=responses: self.check_multiple_responses_dialog(
-                correct_responses, None
+        else:
+            # Mode normal : boutons spécifiques
+            enter_shortcut = QShortcut(QKeySequence(Qt.Key_Return), self)
+            enter_shortcut.activated.connect(self.check_current_responses)
+            submit_button = self.card_view.add_control(
+                QPushButton("Vérifier les réponses (&C)")
             )
-        )
-        submit_button = QPushButton("Vérifier les réponses (&C)")
-        submit_button.setStyleSheet(
-            "background-color: #4CAF50; color: white; font-weight: bold; border: 2px solid #388e3c;"
-        )
-        submit_button.clicked.connect(
-            lambda _, correct_responses=responses: self.check_multiple_responses_dialog(
-                correct_responses, None
+            submit_button.setStyleSheet(
+                "background-color: #4CAF50; color: white; font-weight: bold; border: 2px solid #388e3c;"
             )
+            submit_button.clicked.connect(self.check_current_responses)
+            save_custom_button = self.card_view.add_control(
+                QPushButton("Sauvegarder le progrès dans un fichier personnalisé (&S)")
+            )
+            save_custom_button.setStyleSheet(
+                "background-color: #3bb67d; color: white; font-weight: bold;"
+            )
+            save_custom_button.clicked.connect(self.save_records_to_custom_file)
+            refresh_button = self.card_view.add_control(
+                QPushButton("Actualiser les entrées (&R)")
+            )
+            refresh_button.setStyleSheet(
+                "background-color: #4f4dc9; color: white; font-weight: bold;"
+            )
+            refresh_button.clicked.connect(
+                lambda: (self.refresh_records_from_db(), self.display_next_item())
+            )
+            skip_button = self.card_view.add_control(QPushButton("Sauter (&K)"))
+            skip_button.setStyleSheet(
+                "background-color: #e0e0e0; color: #222; font-weight: bold;"
+            )
+            skip_button.clicked.connect(self.skip_current_entry)
+
+        self.end_view = QWidget(self)
+        end_layout = QVBoxLayout(self.end_view)
+        end_label = QLabel("Tout fait! Félicitations! ✨ 🌟 ✨")
+        end_label.setAlignment(Qt.AlignCenter)
+        end_layout.addWidget(end_label)
+        close_button = QPushButton("Fermer")
+        close_button.clicked.connect(self.close)
+        end_layout.addWidget(close_button)
+        self.end_view.hide()
+        self.main_layout.addWidget(self.end_view)
+
+    def current_record(self):
+        return self.records[self.current_record_index]
+
+    @staticmethod
+    def split_record(record):
+        questions = [q.strip() for q in record["question"].split(";") if q.strip()]
+        responses = [r.strip() for r in record["response"].split(";") if r.strip()]
+        return questions, responses
+
+    def check_current_responses(self):
+        if self.records:
+            _, responses = self.split_record(self.current_record())
+            self.check_multiple_responses_dialog(responses, None)
+
+    def display_next_item(self):
+        if not hasattr(self, "card_view"):
+            self._build_views()
+
+        if not self.records:
+            self.review_log.flush()  # Enregistrer la fin de session
+            try:
+                self.session_journal.clear()
+                logger.info(
+                    "Fichier saved_records.json supprimé après la fin de la session."
+                )
+            except Exception as e:
+                logger.error(
+                    f"Erreur lors de la suppression de saved_records.json: {e}"
+                )
+            self.play_audio("assets/audio_effects/félicitations.ogg")
+            self.card_view.hide()
+            self.end_view.show()
+            return
+
+        record = self.current_record()
+
+        if not hasattr(self, "_initial_record_count"):
+            self._initial_record_count = len(self.records)
+        progress = (
+            1 - (len(self.records) / self._initial_record_count)
+            if self._initial_record_count
+            else 1
         )
-        self.main_layout.addWidget(submit_button)
-        save_custom_button = QPushButton(
-            "Sauvegarder le progrès dans un fichier personnalisé (&S)"
-        )
-        save_custom_button.setStyleSheet(
-            "background-color: #3bb67d; color: white; font-weight: bold;"
-        )
-        save_custom_button.clicked.connect(self.save_records_to_custom_file)
-        self.main_layout.addWidget(save_custom_button)
-        refresh_button = QPushButton("Actualiser les entrées (&R)")
-        refresh_button.setStyleSheet(
-            "background-color: #4f4dc9; color: white; font-weight: bold;"
-        )
-        refresh_button.clicked.connect(
-            lambda: (self.refresh_records_from_db(), self.display_next_item())
-        )
-        self.main_layout.addWidget(refresh_button)
-        skip_button = QPushButton("Sauter (&K)")
-        skip_button.setStyleSheet(
-            "background-color: #e0e0e0; color: #222; font-weight: bold;"
+        self.end_view.hide()
+        self.card_view.show()
+        self.card_view.set_progress(int(progress * 100))
+        self._card_shown_at = time.monotonic()
+
+        questions, responses = self.split_record(record)
+        audio_path = record["media_file"]
+
+        # Affichage commun (questions/réponses, audio, boutons)
+        if getattr(self, "review_mode", False):
+            self.card_view.show_answers(questions, responses)
+            # Le prochain média lu sera celui de cette carte (bouton Lire)
+            self.prefetch_upcoming_media(start=self.current_record_index)
+            return
+        self.response_inputs = self.card_view.bind(questions, responses)
+        if self.response_inputs:
+            self.response_inputs[0].setFocus()
+
+        # Lancer la lecture du média seulement après que l'UI soit complètement chargée,
+        # puis préparer les médias des cartes suivantes
+        QTimer.singleShot(
+            0, lambda: (self.play_audio(audio_path), self.prefetch_upcoming_media())
         )
-        skip_button.clicked.connect(self.skip_current_entry)
-        self.main_layout.addWidget(skip_button)
-        self.save_records_to_file()  # sauvegarder progrès en cas de crash
 
-        # Lancer la lecture du média seulement après que l'UI soit complètement chargée
-        QTimer.singleShot(0, lambda: self.play_audio(audio_path))
+    def prefetch_upcoming_media(self, start=None):
+        """Précharge les médias des prochaines entrées de la file."""
+        if not self.records:
+            return
+        if start is None:
+            start = self.current_record_index + 1
+        upcoming = self.records[start : start + self.media_prefetcher.lookahead]
+        self.media_prefetcher.prefetch(
+            [record.get("media_file") for record in upcoming]
+        )
 
     # --- Actualisation et gestion des entrées ---
     def refresh_records_from_db(self):
-        updated_records = []
         logger.warning("Essayer d'actualiser les entrées...")
-        for record in self.records:
-            uuid = record.get("UUID")
-            if uuid:
-                updated_record = self.db_manager.fetch_record_by_uuid(uuid)
-                if updated_record:
-                    updated_records.append(updated_record)
-                else:
+        uuids = [record.get("UUID") for record in self.records if record.get("UUID")]
+        updated_records = self.db_manager.fetch_records_by_uuids(uuids)
+        if len(updated_records) < len(uuids):
+            found = {record["UUID"] for record in updated_records}
+            for uuid in uuids:
+                if uuid not in found:
                     logger.warning(f"Enregistrement introuvable pour UUID: {uuid}")
         self.records = updated_records
+        self.session_journal.compact(self.records)
 
         QMessageBox.information(self, "Info", "Les entrées ont été actualisées.")
 
+    def pop_current_record(self):
+        """Retire l'entrée courante de la file et l'inscrit au journal de session."""
+        record = self.records.pop(self.current_record_index)
+        self.session_journal.record_pop(record.get("UUID"), self.records)
+        return record
+
+    def requeue_current_record(self):
+        """Remet l'entrée courante en fin de file (réponse incorrecte)."""
+        record = self.records.pop(self.current_record_index)
+        self.records.append(record)
+        self.session_journal.record_requeue(record.get("UUID"), self.records)
+
     # --- Signalement d'erreur sur une entrée ---
     def report_error(self, entry_uuid=None):
         if entry_uuid is None:
             current_record = self.records[self.current_record_index]
             entry_uuid = current_record.get("UUID", "unknown_uuid")
+        note, ok = QInputDialog.getText(
+            self, "Signaler une erreur", "Note (facultative) :"
+        )
+        if not ok:
+            return
         try:
-            with open("entry_error.csv", "a", newline="", encoding="utf-8") as file:
-                writer = csv.writer(file)
-                writer.writerow([entry_uuid])
+            self.db_manager.add_error_report(entry_uuid, note.strip())
             logger.info(f"Erreur signalée pour l'UUID: {entry_uuid}")
             QMessageBox.information(self, "Succès", "Erreur signalée avec succès!")
         except Exception as e:
@@ -513,36 +533,15 @@ class RetrievalApp(QWidget):
     # --- Utilitaires de comparaison et normalisation de texte ---
     @staticmethod
     def normalize_text(text):
-        text = text.lower().strip().replace("ỹ", "y")
-        text = TextUtils.normalize_special_characters(text)
-        text = unicodedata.normalize("NFKC", text)
-        text = text.translate(str.maketrans("", "", string.punctuation + "’' ‘«»–"))
-        return text
+        return normalize_text(text)
 
     @staticmethod
     def html_diff(a: str, b: str):
-        import string
         import html
 
-        def strip_punct(text):
-            return "".join(
-                ch for ch in text if ch not in string.punctuation + "’' ‘«»–"
-            )
-
-        def build_index_map(text):
-            idx_map = []
-            count = 0
-            for i, ch in enumerate(text):
-                if ch not in string.punctuation + "’' ‘«»–":
-                    idx_map.append(i)
-                    count += 1
-            return idx_map
-
-        a_stripped = strip_punct(a)
-        b_stripped = strip_punct(b)
+        a_stripped, a_idx_map = strip_with_index_map(a)
+        b_stripped, b_idx_map = strip_with_index_map(b)
         seqm = difflib.SequenceMatcher(None, a_stripped.lower(), b_stripped.lower())
-        a_idx_map = build_index_map(a)
-        b_idx_map = build_index_map(b)
         a_html = ""
         b_html = ""
         a_last = 0
@@ -581,11 +580,11 @@ class RetrievalApp(QWidget):
     # --- Vérification de la réponse utilisateur ---
     def check_multiple_responses_dialog(self, correct_responses, dialog=None):
         if self.review_mode:
-            self.update_usage_stats()
-            self.records.pop(self.current_record_index)
+            self.log_answer()
+            self.pop_current_record()
         else:
             user_responses = [
-                TextUtils.normalize_special_characters(edit.text().strip())
+                normalize_special_characters(edit.text().strip())
                 for edit in self.response_inputs
             ]
             if len(user_responses) != len(correct_responses):
@@ -594,65 +593,38 @@ class RetrievalApp(QWidget):
             if any(resp == "" for resp in user_responses):
                 QMessageBox.warning(self, "Erreur", "Aucune réponse ne doit être vide.")
                 return
-            correct_count = 0
+            grades = [
+                self.grader.grade(user, correct)
+                for user, correct in zip(user_responses, correct_responses)
+            ]
+            self.scheduler.record_result(self.current_record().get("UUID"), grades)
+            correct_count = grades.count(CORRECT)
+            near_miss_count = grades.count(NEAR_MISS)
             total = len(correct_responses)
-            detailed_results = []
-            for user, correct in zip(user_responses, correct_responses):
-                is_correct = False
-                if re.fullmatch(r"\s*[+-]?\s*\d*(\.\d+)?\s*%?\s*", correct):
-                    try:
-                        correct_response_processed = (
-                            float(correct.strip("%")) / 100
-                            if "%" in correct
-                            else float(correct)
-                        )
-                        user_response_processed = (
-                            float(user.strip("%")) / 100 if "%" in user else float(user)
-                        )
-                        if (
-                            abs(user_response_processed - correct_response_processed)
-                            < 0.01
-                        ):
-                            is_correct = True
-                    except ValueError:
-                        pass
-                else:
-                    user_mod = TextUtils.normalize_special_characters(user)
-                    correct_mod = TextUtils.normalize_special_characters(correct)
-                    match = re.match(r"^(.*?)(\(.*?\))(.*?)$", correct_mod)
-                    if match:
-                        base = match.group(1) + match.group(3)
-                        paren = match.group(2)
-                        optional_list = paren.strip("()").split(" ")
-                        for opt in optional_list:
-                            user_processed = user_mod.replace(opt, "")
-                            correct_processed = base.replace(opt, "")
-                            user_processed = self.normalize_text(user_processed)
-                            correct_processed = self.normalize_text(correct_processed)
-                            if user_processed == correct_processed:
-                                is_correct = True
-                                break
-                    else:
-                        user_processed = self.normalize_text(user_mod)
-                        correct_processed = self.normalize_text(correct_mod)
-                        if user_processed == correct_processed:
-                            is_correct = True
-                if is_correct:
-                    correct_count += 1
-                detailed_results.append(is_correct)
-            all_correct = correct_count == total
-            self.update_usage_stats(correct_count, total)
-            if all_correct:
+            self.log_answer(correct_count, total, near_miss_count)
+            if INCORRECT not in grades:
                 self.play_audio("assets/audio_effects/correct.ogg")
                 msg_box = QMessageBox(self)
-                msg_box.setWindowTitle("Succès")
-                msg_box.setText(
-                    f"Toutes les réponses sont correctes ! ({correct_count}/{total})"
-                )
                 msg_box.setIcon(QMessageBox.Information)
-                QTimer.singleShot(1000, msg_box.accept)  # Fermeture auto après 1s
+                if near_miss_count:
+                    # Acceptée avec crédit partiel : montrer les fautes sans fermer
+                    diff_html = self._responses_diff_html(
+                        user_responses, correct_responses, grades
+                    )
+                    msg_box.setWindowTitle("Presque")
+                    msg_box.setText(
+                        f"<b>Réponses acceptées avec de petites fautes "
+                        f"({correct_count}/{total} exactes).</b><br><br>{diff_html}"
+                    )
+                    msg_box.setTextFormat(Qt.RichText)
+                else:
+                    msg_box.setWindowTitle("Succès")
+                    msg_box.setText(
+                        f"Toutes les réponses sont correctes ! ({correct_count}/{total})"
+                    )
+                    QTimer.singleShot(1000, msg_box.accept)  # Fermeture auto après 1s
                 msg_box.exec()
-                self.records.pop(self.current_record_index)
+                self.pop_current_record()
             else:
                 self.play_audio("assets/audio_effects/error.ogg")
                 QTimer.singleShot(
@@ -663,21 +635,10 @@ class RetrievalApp(QWidget):
                 )
                 diff_html = (
                     f"<b>{correct_count}/{total} réponses correctes.</b><br><br>"
-                )
-                incorrects = [
-                    (idx, user, correct)
-                    for idx, (user, correct, is_ok) in enumerate(
-                        zip(user_responses, correct_responses, detailed_results)
+                    + self._responses_diff_html(
+                        user_responses, correct_responses, grades
                     )
-                    if not is_ok
-                ]
-                for i, (idx, user, correct) in enumerate(incorrects):
-                    user_diff, correct_diff = self.html_diff(user, correct)
-                    diff_html += f"<b>Réponse {idx+1} :</b><br>"
-                    diff_html += f"Votre réponse : <span style='color: orange;'>{user_diff}</span><br>"
-                    diff_html += f"Réponse attendue : <span style='color: green;'>{correct_diff}</span>"
-                    if i != len(incorrects) - 1:
-                        diff_html += "<br><br>"
+                )
                 msg_box = QMessageBox(self)
                 msg_box.setWindowTitle("Erreur")
                 msg_box.setText(
@@ -699,13 +660,35 @@ class RetrievalApp(QWidget):
 
                 report_button.clicked.connect(report_and_close)
                 msg_box.exec()
-                self.records.append(self.records.pop(self.current_record_index))
+                self.requeue_current_record()
         self.stop_audio(dialog)
         self.display_next_item()
 
+    def _responses_diff_html(self, user_responses, correct_responses, grades):
+        """Différences soulignées pour chaque réponse qui n'est pas exacte."""
+        blocks = []
+        for idx, (user, correct, grade) in enumerate(
+            zip(user_responses, correct_responses, grades)
+        ):
+            if grade == CORRECT:
+                continue
+            user_diff, correct_diff = self.html_diff(user, correct)
+            label = " (presque)" if grade == NEAR_MISS else ""
+            blocks.append(
+                f"<b>Réponse {idx+1}{label} :</b><br>"
+                f"Votre réponse : <span style='color: orange;'>{user_diff}</span><br>"
+                f"Réponse attendue : <span style='color: green;'>{correct_diff}</span>"
+            )
+        return "<br><br>".join(blocks)
+
     # --- Gestion audio et vidéo ---
     def play_audio(self, media_path):
         # Arrêter toute lecture en cours avant de lancer une nouvelle
+        player = self.media_prefetcher.take(media_path)
+        if player is not None:
+            # Média déjà ouvert par le préchargement : lecture immédiate
+            player.play()
+            return
         try:
             if self.media_player.playbackState() == QMediaPlayer.PlayingState:
                 self.media_player.stop()
@@ -734,15 +717,17 @@ class RetrievalApp(QWidget):
             and state == QMediaPlayer.StoppedState
         ):
             if self.records:
-                self.records.pop(self.current_record_index)
+                self.pop_current_record()
                 self.display_next_item()
 
     # --- Fermeture propre de l'application ---
     def closeEvent(self, event):
         if self.records:
-            self.save_records_to_file()
+            self.session_journal.compact(self.records)
+        self.session_journal.close()
+        self.review_log.flush()
         logger.info("Fermeture de session de revoir.")
-        self.media_player.stop()
+        self.media_prefetcher.shutdown()
         super().closeEvent(event)
         self.deleteLater()
 
@@ -750,91 +735,28 @@ class RetrievalApp(QWidget):
         """Affiche les réponses correctes pendant 1s avant de sauter à la prochaine entrée."""
         if not self.records:
             return
-        record = self.records[self.current_record_index]
-        questions = [q.strip() for q in record["question"].split(";") if q.strip()]
-        responses = [r.strip() for r in record["response"].split(";") if r.strip()]
-        self._show_questions_with_responses(questions, responses)
+        questions, responses = self.split_record(self.current_record())
+        # Montrer les réponses (sans les boutons) pendant 1s
+        self.card_view.show_answers(questions, responses, show_controls=False)
         QTimer.singleShot(
             1000,
             lambda: (
-                self.records.pop(self.current_record_index),
+                self.pop_current_record(),
                 self.display_next_item(),
             ),
         )
 
-    def _show_questions_with_responses(self, questions, responses):
-        """Affiche les questions et leurs réponses correctes dans le layout principal.
-        Les questions avec des (?) sont reconstruites avec les réponses insérées et centrées.
-        Le tout est centré verticalement et horizontalement."""
-        # Nettoyer le layout
-        while self.main_layout.count():
-            child = self.main_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        response_idx = 0
-        self.main_layout.addStretch(1)  # Centrage vertical (avant)
-        for idx, q in enumerate(questions):
-            if "(?)" in q:
-                num_blanks = q.count("(?)")
-                inserted = []
-                for i in range(num_blanks):
-                    if response_idx < len(responses):
-                        inserted.append(
-                            f"<b style='color:green'>{responses[response_idx]}</b>"
-                        )
-                        response_idx += 1
-                    else:
-                        inserted.append("<b style='color:green'>______</b>")
-                parts = q.split("(?)")
-                html = ""
-                for i, part in enumerate(parts):
-                    html += part
-                    if i < len(inserted):
-                        html += inserted[i]
-                label = QLabel(html)
-                label.setTextFormat(Qt.RichText)
-                label.setWordWrap(True)
-                label.setAlignment(Qt.AlignHCenter)
-                self.main_layout.addWidget(label)
-            else:
-                label = QLabel(f"{idx+1}. {q}")
-                self.main_layout.addWidget(label)
-                if response_idx < len(responses):
-                    resp_label = QLabel(
-                        f"<b style='color:green'>{responses[response_idx]}</b>"
-                    )
-                    resp_label.setTextFormat(Qt.RichText)
-                    self.main_layout.addWidget(resp_label)
-                    response_idx += 1
-        self.main_layout.addStretch(1)  # Centrage vertical (après)
-
-    # --- Mise à jour des statistiques d'utilisation ---
-    def update_usage_stats(self, correct_count=None, total_count=None):
-        import datetime
-
-        stats_file = "usage_stats.json"
-        today = datetime.date.today().isoformat()
-        stats = {
-            "retrieval_count": 0,
-            "review_count": 0,
-            "correct_count": 0,
-            "answered_count": 0,
-            "dates": [],
-        }
-        if os.path.exists(stats_file):
-            try:
-                with open(stats_file, "r", encoding="utf-8") as f:
-                    stats.update(json.load(f))
-            except Exception:
-                pass
-        if self.review_mode:
-            stats["review_count"] += 1
-        else:
-            stats["retrieval_count"] += 1
-            if correct_count is not None and total_count is not None:
-                stats["correct_count"] += correct_count
-                stats["answered_count"] += total_count
-        if not stats["dates"] or stats["dates"][-1] != today:
-            stats["dates"].append(today)
-        with open(stats_file, "w", encoding="utf-8") as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+    # --- Journal des réponses (statistiques) ---
+    def log_answer(self, correct=None, total=None, near_miss=None):
+        """Inscrit la carte courante au journal des réponses (écrit par lots)."""
+        latency_ms = None
+        if self._card_shown_at is not None:
+            latency_ms = int((time.monotonic() - self._card_shown_at) * 1000)
+        self.review_log.log(
+            self.current_record().get("UUID"),
+            MODE_REVIEW if self.review_mode else MODE_RETRIEVAL,
+            correct,
+            total,
+            near_miss,
+            latency_ms,
+        )
@@ -0,0 +1,67 @@
+from datetime import datetime
+from PySide6.QtCore import QObject, QTimer
+from logger import logger
+
+MODE_RETRIEVAL = "retrieval"
+MODE_REVIEW = "review"
+
+
+class ReviewLogBuffer(QObject):
+    """
+    Journal des réponses en mémoire, écrit par lots dans la table `review_log` :
+    toutes les `flush_interval_ms`, dès `max_pending` entrées ou à la fin de la
+    session (flush). Aucune écriture disque par carte.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        parent=None,
+        flush_interval_ms: int = 10000,
+        max_pending: int = 50,
+    ):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.max_pending = max_pending
+        self.pending = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def log(
+        self,
+        entry_uuid: str,
+        mode: str,
+        correct: int = None,
+        total: int = None,
+        near_miss: int = None,
+        latency_ms: int = None,
+    ):
+        self.pending.append(
+            {
+                "UUID": entry_uuid,
+                "reviewed_at": datetime.now().isoformat(timespec="seconds"),
+                "mode": mode,
+                "correct": correct,
+                "near_miss": near_miss,
+                "total": total,
+                "latency_ms": latency_ms,
+            }
+        )
+        if len(self.pending) >= self.max_pending:
+            self.flush()
+        elif not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if not self.pending:
+            return
+        entries, self.pending = self.pending, []
+        if not self.db_manager.log_reviews(entries):
+            # Réessayer au prochain passage plutôt que perdre les réponses
+            logger.warning(
+                f"{len(entries)} réponse(s) non journalisée(s), nouvel essai."
+            )
+            self.pending = entries + self.pending
+            self._timer.start()
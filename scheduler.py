@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from grading import CORRECT, INCORRECT
+
+# Valeurs initiales SM-2
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+
+def review_quality(grades: list) -> int:
+    """
+    Qualité SM-2 (0-5) d'une carte à partir des notes de ses réponses :
+    5 tout exact, 4 accepté avec des fautes mineures, 2 partiellement faux,
+    1 entièrement faux.
+    """
+    if all(grade == CORRECT for grade in grades):
+        return 5
+    if INCORRECT not in grades:
+        return 4
+    if any(grade != INCORRECT for grade in grades):
+        return 2
+    return 1
+
+
+def new_review_state() -> dict:
+    return {
+        "ease": DEFAULT_EASE,
+        "interval": 0,
+        "repetitions": 0,
+        "due_date": None,
+        "last_review": None,
+    }
+
+
+def sm2_update(state: dict, quality: int, today: date = None) -> dict:
+    """Nouvel état de révision d'une carte (algorithme SM-2)."""
+    today = today or date.today()
+    ease = state["ease"]
+    interval = state["interval"]
+    repetitions = state["repetitions"]
+    if quality < 3:
+        # Échec : la carte repart du début, à revoir demain
+        repetitions = 0
+        interval = 1
+    else:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = max(1, round(interval * ease))
+        repetitions += 1
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return {
+        "ease": ease,
+        "interval": interval,
+        "repetitions": repetitions,
+        "due_date": (today + timedelta(days=interval)).isoformat(),
+        "last_review": today.isoformat(),
+    }
+
+
+class ReviewScheduler:
+    """
+    Planification des révisions : chaque carte notée met à jour sa ligne de la
+    table `reviews` (facilité, intervalle, prochaine échéance) ; une session ne
+    charge ensuite que les cartes dues (DatabaseManager.fetch_due_records).
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def record_result(self, entry_uuid: str, grades: list, today: date = None):
+        state = self.db_manager.fetch_review_state(entry_uuid) or new_review_state()
+        state = sm2_update(state, review_quality(grades), today)
+        self.db_manager.save_review_state(entry_uuid, state)
+        return state
@@ -0,0 +1,203 @@
+import json
+import os
+import uuid
+from collections import deque
+from datetime import datetime
+from logger import logger
+
+_REMOVED = object()  # case vidée lors du rejeu du journal
+
+
+class SessionJournal:
+    """
+    Sauvegarde incrémentale d'une session de révision.
+    Un instantané complet (`path`) est écrit au démarrage et lors des compactages ;
+    entre deux, chaque carte retirée ou remise en fin de file n'ajoute qu'une ligne
+    au journal (`path + ".journal"`). Au chargement, le journal est rejoué sur
+    l'instantané. Le compactage a lieu quand le journal devient aussi long que
+    l'instantané : le coût par carte reste constant en moyenne.
+    L'instantané ne contient que les UUID de la file (plus curseur, taille initiale
+    et horodatages) ; les entrées sont relues depuis la base à la restauration.
+    """
+
+    FORMAT_VERSION = 2
+
+    MIN_COMPACT_OPS = 100
+
+    def __init__(self, path: str = "saved_records.json"):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self._journal_file = None
+        self._journal_id = None
+        self._ops = 0
+        self._snapshot_size = 0
+        self.initial_count = 0
+        self.created_at = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def start(
+        self,
+        records: list,
+        initial_count: int = None,
+        created_at: str = None,
+        cursor: int = 0,
+    ):
+        """Écrit un instantané complet et repart d'un journal vide."""
+        self._close_journal()
+        self._journal_id = uuid.uuid4().hex
+        self.initial_count = initial_count or self.initial_count or len(records)
+        self.created_at = (
+            created_at
+            or self.created_at
+            or datetime.now().isoformat(timespec="seconds")
+        )
+        self.write_snapshot(
+            self.path,
+            records,
+            cursor=cursor,
+            initial_count=self.initial_count,
+            created_at=self.created_at,
+            journal_id=self._journal_id,
+        )
+        self._journal_file = open(self.journal_path, "w", encoding="utf-8")
+        self._append({"journal_id": self._journal_id})
+        self._ops = 0
+        self._snapshot_size = len(records)
+
+    @classmethod
+    def write_snapshot(
+        cls,
+        path: str,
+        records: list,
+        cursor: int = 0,
+        initial_count: int = None,
+        created_at: str = None,
+        journal_id: str = None,
+    ):
+        """Instantané compact de la file : UUID, curseur, taille initiale, horodatages."""
+        now = datetime.now().isoformat(timespec="seconds")
+        cls._write_atomic(
+            path,
+            {
+                "version": cls.FORMAT_VERSION,
+                "journal_id": journal_id,
+                "uuids": [record.get("UUID") for record in records],
+                "cursor": cursor,
+                "initial_count": initial_count or len(records),
+                "created_at": created_at or now,
+                "updated_at": now,
+            },
+        )
+
+    def compact(self, records: list):
+        self.start(records)
+        logger.info(f"Session compactée dans {self.path} ({len(records)} entrées)")
+
+    def record_pop(self, entry_uuid: str, records: list):
+        """L'entrée a été retirée de la file (réussie, sautée ou écoutée)."""
+        self._log({"op": "pop", "UUID": entry_uuid}, records)
+
+    def record_requeue(self, entry_uuid: str, records: list):
+        """L'entrée a été remise en fin de file (réponse incorrecte)."""
+        self._log({"op": "requeue", "UUID": entry_uuid}, records)
+
+    def _log(self, entry: dict, records: list):
+        if self._journal_file is None:
+            self.start(records)
+            return
+        self._append(entry)
+        self._ops += 1
+        if self._ops >= max(self.MIN_COMPACT_OPS, self._snapshot_size):
+            self.compact(records)
+
+    def load(self) -> dict:
+        """Relit l'instantané puis rejoue le journal. Retourne la session :
+        uuids, cursor, initial_count, created_at, updated_at. Accepte aussi les
+        anciens formats (entrées complètes, sans journal).
+        """
+        with open(self.path, "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+        if isinstance(snapshot, list):
+            snapshot = {"records": snapshot}
+        if "uuids" not in snapshot:
+            snapshot["uuids"] = [r.get("UUID") for r in snapshot.pop("records")]
+        uuids = self._replay(
+            snapshot["uuids"], self._read_journal(snapshot.get("journal_id"))
+        )
+        return {
+            "uuids": uuids,
+            "cursor": snapshot.get("cursor", 0),
+            "initial_count": snapshot.get("initial_count") or len(uuids),
+            "created_at": snapshot.get("created_at"),
+            "updated_at": snapshot.get("updated_at"),
+        }
+
+    @staticmethod
+    def _replay(uuids: list, entries: list) -> list:
+        """Applique les opérations du journal à la file en temps linéaire : chaque
+        UUID garde la liste de ses positions, une entrée retirée laisse une case vide.
+        """
+        slots = list(uuids)
+        positions = {}
+        for index, entry_uuid in enumerate(slots):
+            positions.setdefault(entry_uuid, deque()).append(index)
+        for entry in entries:
+            entry_positions = positions.get(entry["UUID"])
+            if not entry_positions:
+                continue
+            # Première occurrence retirée, comme list.remove
+            slots[entry_positions.popleft()] = _REMOVED
+            if entry["op"] == "requeue":
+                entry_positions.append(len(slots))
+                slots.append(entry["UUID"])
+        return [entry_uuid for entry_uuid in slots if entry_uuid is not _REMOVED]
+
+    def _read_journal(self, journal_id):
+        if not journal_id or not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path, "r", encoding="utf-8") as file:
+            for number, line in enumerate(file):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par un arrêt brutal
+                    logger.warning(f"Ligne de journal illisible ignorée : {line!r}")
+                    break
+                if number == 0:
+                    if entry.get("journal_id") != journal_id:
+                        # Journal d'un autre instantané (compactage interrompu)
+                        return []
+                    continue
+                entries.append(entry)
+        return entries
+
+    def clear(self):
+        """Supprime l'instantané et le journal (fin de session)."""
+        self._close_journal()
+        self.initial_count = 0
+        self.created_at = None
+        for path in (self.path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+        self._close_journal()
+
+    def _append(self, entry: dict):
+        self._journal_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal_file.flush()
+
+    def _close_journal(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    @staticmethod
+    def _write_atomic(path: str, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import itertools
+import sqlite3
+import threading
+import uuid
+from collections import namedtuple
+from contextlib import contextmanager
+from logger import logger
+
+# Résultat d'une requête : noms des colonnes, lignes (tuples), lignes modifiées
+QueryResult = namedtuple("QueryResult", ["columns", "rows", "rowcount"])
+
+
+class StorageError(Exception):
+    """Échec d'une requête, quel que soit le moteur."""
+
+
+class StorageBackend:
+    """
+    Accès à un fichier SQLite pour DatabaseManager. Chaque thread reçoit sa
+    propre connexion au même fichier : le thread créateur garde la connexion
+    principale, les autres (import, synthèse, export) ouvrent la leur au premier
+    accès. Les sous-classes fournissent le pilote (_connect, _disconnect,
+    _discard, _execute, _execute_each, _begin, _commit, _rollback).
+    """
+
+    # True : DatabaseManager signale les erreurs par une boîte de dialogue
+    interactive = False
+
+    def __init__(self, db_path: str, on_connect=None):
+        self.db_path = db_path
+        # Appelé dans chaque nouveau thread après l'ouverture de sa connexion
+        self.on_connect = on_connect
+        self._owner_thread = threading.get_ident()
+        self._local = threading.local()
+        self._thread_connections = {}  # nom -> connexion
+        self._pool_lock = threading.Lock()
+        self._connection_ids = itertools.count(1)
+        self.connection_name = f"connection_{uuid.uuid4()}"
+        self._main = self._connect(self.connection_name)
+
+    @property
+    def connection(self):
+        """Connexion du thread appelant, ouverte au besoin."""
+        if threading.get_ident() == self._owner_thread:
+            return self._main
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            name = f"{self.connection_name}_thread{next(self._connection_ids)}"
+            connection = self._connect(name)
+            with self._pool_lock:
+                self._thread_connections[name] = connection
+            self._local.name = name
+            self._local.connection = connection
+            logger.info(f"Connexion {name} ouverte.")
+            if self.on_connect:
+                self.on_connect()
+        return connection
+
+    def release_thread_connection(self):
+        """Ferme la connexion du thread courant ; sans effet dans le thread créateur."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return
+        name = self._local.name
+        self._local.connection = self._local.name = None
+        # Encore fermée ici même si close() l'a déjà oubliée
+        with self._pool_lock:
+            self._thread_connections.pop(name, None)
+        self._disconnect(connection)
+        del connection
+        self._discard(name)
+
+    def close(self):
+        """Ferme la connexion principale. Une connexion de thread ne se ferme que
+        dans son thread (release_thread_connection) : celles qui restent sont
+        seulement signalées et oubliées, pas fermées depuis le thread créateur.
+        """
+        self.release_thread_connection()
+        with self._pool_lock:
+            leftovers, self._thread_connections = self._thread_connections, {}
+        for name in leftovers:
+            logger.warning(f"Connexion {name} non libérée par son thread ; oubliée.")
+        leftovers.clear()
+        if self._main is not None:
+            main, self._main = self._main, None
+            self._disconnect(main)
+            del main
+            self._discard(self.connection_name)
+
+    @property
+    def is_open(self) -> bool:
+        return self._main is not None
+
+    def execute(self, query_text: str, params: list = None) -> QueryResult:
+        """Exécute une requête préparée ; lève StorageError en cas d'échec."""
+        return self._execute(self.connection, query_text, list(params or []))
+
+    def execute_each(self, query_text: str, rows) -> list:
+        """Exécute la même requête préparée pour chaque ligne de paramètres. Une
+        ligne en échec n'interrompt pas les suivantes : retourne, par ligne, None
+        ou le message d'erreur.
+        """
+        return self._execute_each(self.connection, query_text, rows)
+
+    @contextmanager
+    def transaction(self):
+        """Valide à la sortie du bloc, annule si une exception le traverse."""
+        connection = self.connection
+        self._begin(connection)
+        try:
+            yield
+        except BaseException:
+            self._rollback(connection)
+            raise
+        self._commit(connection)
+
+    def _connect(self, name: str):
+        raise NotImplementedError
+
+    def _disconnect(self, connection):
+        raise NotImplementedError
+
+    def _discard(self, name: str):
+        """Oublie la connexion `name` une fois toutes ses références lâchées."""
+
+    def _execute(self, connection, query_text: str, params: list) -> QueryResult:
+        raise NotImplementedError
+
+    def _execute_each(self, connection, query_text: str, rows) -> list:
+        raise NotImplementedError
+
+    def _begin(self, connection):
+        raise NotImplementedError
+
+    def _commit(self, connection):
+        raise NotImplementedError
+
+    def _rollback(self, connection):
+        raise NotImplementedError
+
+
+class QtSqlBackend(StorageBackend):
+    """Pilote QSQLITE de QtSql (application graphique). QtSql n'est importé qu'à
+    l'usage : le module reste importable sans Qt, avec Sqlite3Backend.
+    """
+
+    interactive = True
+
+    def _connect(self, name: str):
+        from PySide6.QtSql import QSqlDatabase
+
+        connection = QSqlDatabase.addDatabase("QSQLITE", name)
+        connection.setDatabaseName(self.db_path)
+        if not connection.open():
+            error = connection.lastError().text()
+            del connection
+            QSqlDatabase.removeDatabase(name)
+            raise StorageError(f"Failed to open database: {error}")
+        return connection
+
+    def _disconnect(self, connection):
+        if connection.isOpen():
+            connection.close()
+
+    def _discard(self, name: str):
+        from PySide6.QtSql import QSqlDatabase
+
+        try:
+            QSqlDatabase.removeDatabase(name)
+        except RuntimeError as e:
+            logger.warning(
+                f"Erreur lors de la suppression de la connexion {name} : {e}"
+            )
+
+    @staticmethod
+    def _prepare(connection, query_text: str):
+        from PySide6.QtSql import QSqlQuery
+
+        query = QSqlQuery(connection)
+        query.setForwardOnly(True)
+        if not query.prepare(query_text):
+            raise StorageError(f"Failed to prepare query: {query.lastError().text()}")
+        return query
+
+    def _execute(self, connection, query_text: str, params: list) -> QueryResult:
+        query = self._prepare(connection, query_text)
+        for param in params:
+            query.addBindValue(param)
+        if not query.exec_():
+            raise StorageError(f"Failed to execute query: {query.lastError().text()}")
+        record = query.record()
+        width = record.count()
+        columns = [record.fieldName(i) for i in range(width)]
+        rows = []
+        while query.next():
+            rows.append(tuple(query.value(i) for i in range(width)))
+        return QueryResult(columns, rows, query.numRowsAffected())
+
+    def _execute_each(self, connection, query_text: str, rows) -> list:
+        query = self._prepare(connection, query_text)
+        errors = []
+        for params in rows:
+            for param in params:
+                query.addBindValue(param)
+            errors.append(None if query.exec_() else query.lastError().text())
+        return errors
+
+    def _begin(self, connection):
+        if not connection.transaction():
+            raise StorageError(
+                f"Failed to start transaction: {connection.lastError().text()}"
+            )
+
+    def _commit(self, connection):
+        if not connection.commit():
+            raise StorageError(f"Failed to commit: {connection.lastError().text()}")
+
+    def _rollback(self, connection):
+        connection.rollback()
+
+
+class Sqlite3Backend(StorageBackend):
+    """
+    Module sqlite3 de la bibliothèque standard : ni QtSql ni QVariant, et les
+    erreurs remontent en exceptions plutôt qu'en boîtes de dialogue. Pour les
+    imports et exports en ligne de commande, les tests et les mesures.
+    """
+
+    def _connect(self, name: str):
+        try:
+            # Autocommit hors transaction explicite, comme QSQLITE ; une
+            # connexion ne sert qu'au thread qui l'a ouverte (voir `connection`)
+            return sqlite3.connect(self.db_path, isolation_level=None)
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to open database: {e}") from e
+
+    def _disconnect(self, connection):
+        connection.close()
+
+    def _execute(self, connection, query_text: str, params: list) -> QueryResult:
+        try:
+            cursor = connection.execute(query_text, params)
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(f"Failed to execute query: {e}") from e
+        columns = [column[0] for column in cursor.description or ()]
+        return QueryResult(columns, rows, cursor.rowcount)
+
+    def _execute_each(self, connection, query_text: str, rows) -> list:
+        errors = []
+        for params in rows:
+            try:
+                connection.execute(query_text, params)
+                errors.append(None)
+            except sqlite3.Error as e:
+                errors.append(str(e))
+        return errors
+
+    def _begin(self, connection):
+        self._execute(connection, "BEGIN", [])
+
+    def _commit(self, connection):
+        self._execute(connection, "COMMIT", [])
+
+    def _rollback(self, connection):
+        if connection.in_transaction:
+            connection.rollback()
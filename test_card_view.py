@@ -0,0 +1,38 @@
+import sys
+import pytest
+from PySide6.QtWidgets import QApplication
+from card_view import CardView
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+
+def test_card_view_reuses_rows_and_inputs(app):
+    view = CardView()
+    inputs = view.bind(["Il (?) et (?)", "Traduire : chat"], ["a", "b", "cat"])
+    assert len(inputs) == 3
+    first_widgets = list(view.rows), list(view.rows[0].inputs)
+    inputs[0].setText("a")
+    assert "a" in view.rows[0].label.text()
+
+    inputs = view.bind(["(?)"], ["mot"])
+    assert len(inputs) == 1 and inputs[0].text() == ""
+    assert (list(view.rows), list(view.rows[0].inputs)) == first_widgets
+    assert view.rows[1].isHidden()
+
+
+def test_card_view_shows_answers(app):
+    view = CardView()
+    view.show_answers(["Il (?)", "Traduire : chat"], ["va", "cat"], show_controls=False)
+    assert "va" in view.rows[0].label.text()
+    assert "cat" in view.rows[1].answer_label.text()
+    assert view.controls.isHidden()
+    assert CardView.split_responses(["(?) (?)", "q"], ["a", "b", "c"]) == [
+        ["a", "b"],
+        ["c"],
+    ]
@@ -0,0 +1,704 @@
+import os
+import subprocess
+import sys
+import threading
+from datetime import date
+import pytest
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+from PySide6.QtWidgets import QApplication
+from db import DatabaseManager, INSERT_OK, INSERT_DUPLICATE, INSERT_ERROR
+from storage import Sqlite3Backend, StorageError
+from tts_service import AudioGenerationService, TTSBackend, TTSCache
+from grading import CORRECT, INCORRECT
+from scheduler import ReviewScheduler
+from review_log import MODE_RETRIEVAL, MODE_REVIEW, ReviewLogBuffer
+
+
+class FakeTTSBackend(TTSBackend):
+    """Pas d'appel réseau (gTTS) pendant les tests."""
+
+    name = "fake"
+
+    def __init__(self, fail_texts=()):
+        self.fail_texts = set(fail_texts)
+        self.calls = []
+
+    def synthesize(self, text, language_code, output_path):
+        self.calls.append(text)
+        if text in self.fail_texts:
+            raise RuntimeError("synthèse impossible")
+        with open(output_path, "wb"):
+            pass
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+
+@pytest.fixture
+def make_manager(app, tmp_path, monkeypatch):
+    """Ouvre des DatabaseManager dans tmp_path, avec un service de synthèse factice
+    partagé ; ils sont tous fermés à la fin du test.
+    """
+    monkeypatch.chdir(tmp_path)
+    service = AudioGenerationService(
+        backend=FakeTTSBackend(fail_texts={"panne"}),
+        cache=TTSCache(str(tmp_path / "tts-cache")),
+        backoff_seconds=0,
+    )
+    managers = []
+
+    def make_manager(name="deck.db", **kwargs):
+        manager = DatabaseManager(str(tmp_path / name), tts_service=service, **kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make_manager
+    for manager in managers:
+        manager.close_connection()
+
+
+@pytest.fixture
+def db_manager(make_manager):
+    manager = make_manager("test.db")
+    os.makedirs(manager.audio_dir, exist_ok=True)
+    return manager
+
+
+def test_insert_record_rejects_duplicates(db_manager):
+    assert db_manager.insert_record("", "(?)", "bonjour") == 0
+    assert db_manager.insert_record("", "(?)", "bonjour") == 1
+    assert db_manager.insert_record("", "(?)", "bonsoir") == 0
+    assert len(db_manager.fetch_all_records()) == 2
+
+
+def test_duplicate_check_uses_normalized_text(db_manager):
+    assert db_manager.insert_record("", "(?)", "cœur") == 0
+    assert db_manager.insert_record("", "(?)", "coeur ") == 1
+
+
+def test_duplicate_lookups_use_dedup_key_index(db_manager, monkeypatch):
+    db_manager.insert_record("", "(?)", "un")
+    record = db_manager.fetch_all_records()[0]
+    # Requêtes réellement émises par les vérifications de doublons
+    lookups = []
+    run_query = db_manager._run_query
+
+    def recording_run_query(query_text, params=None):
+        if "dedup_key" in query_text and query_text.lstrip().startswith("SELECT"):
+            lookups.append((query_text, params))
+        return run_query(query_text, params)
+
+    monkeypatch.setattr(db_manager, "_run_query", recording_run_query)
+    db_manager.insert_record("", "(?)", "un")
+    db_manager.find_existing_keys([record["UUID"], "autre"])
+    db_manager.update_record(record["UUID"], record["media_file"], "(?)", "un")
+    monkeypatch.undo()
+    assert len({query_text for query_text, _ in lookups}) == 3
+
+    for query_text, params in lookups:
+        plan = db_manager._run_query(f"EXPLAIN QUERY PLAN {query_text}", params)
+        details = " ".join(str(row[-1]) for row in plan.rows)
+        assert "idx_records_dedup_key" in details, (query_text, details)
+
+
+def test_insert_records_bulk_reports_status_per_row(db_manager):
+    db_manager.insert_record("", "(?)", "déjà là")
+    rows = [
+        {"media_file": "", "question": "(?)", "response": "un"},
+        {"media_file": "", "question": "(?)", "response": "déjà là"},
+        {"media_file": "", "question": "(?)", "response": "un"},
+        {
+            "media_file": "",
+            "question": "(?)",
+            "response": "deux",
+            "creation_date": "hier",
+        },
+        {"media_file": "", "question": "(?)", "response": "trois"},
+    ]
+    statuses = db_manager.insert_records_bulk(rows, batch_size=2)
+    assert statuses == [
+        INSERT_OK,
+        INSERT_DUPLICATE,
+        INSERT_DUPLICATE,
+        INSERT_ERROR,
+        INSERT_OK,
+    ]
+    assert len(db_manager.fetch_all_records()) == 3
+
+
+def test_insert_records_bulk_failing_row_does_not_abort_batch(db_manager):
+    db_manager.insert_record("", "(?)", "un", UUID="uuid-1")
+    rows = [
+        {"media_file": "", "question": "(?)", "response": "deux", "UUID": "uuid-1"},
+        {"media_file": "", "question": "(?)", "response": "trois"},
+    ]
+    assert db_manager.insert_records_bulk(rows) == [INSERT_ERROR, INSERT_OK]
+
+
+def test_insert_records_bulk_removes_audio_of_failed_rows(db_manager, monkeypatch):
+    db_manager.insert_record("", "(?)", "un", UUID="uuid-1")
+    kept = set(os.listdir(db_manager.audio_dir))
+    # Doublon validé par une autre écriture après la vérification du lot
+    monkeypatch.setattr(db_manager, "find_existing_keys", lambda keys: set())
+    rows = [
+        {"media_file": "", "question": "(?)", "response": "deux", "UUID": "uuid-1"},
+        {"media_file": "", "question": "(?)", "response": "un"},
+        {"media_file": "", "question": "(?)", "response": "trois"},
+    ]
+    statuses = db_manager.insert_records_bulk(rows)
+    assert statuses == [INSERT_ERROR, INSERT_DUPLICATE, INSERT_OK]
+    media_files = {
+        os.path.basename(record["media_file"])
+        for record in db_manager.fetch_all_records()
+    }
+    # Seuls restent les audios des entrées enregistrées
+    assert set(os.listdir(db_manager.audio_dir)) == media_files
+    assert kept < media_files
+
+
+def test_bulk_audio_generation_uses_pool_and_retries(db_manager):
+    rows = [
+        {"media_file": "", "question": "Il dit (?)", "response": "bonjour"},
+        {"media_file": "", "question": "(?) ?", "response": "bonjour;x"},
+        {"media_file": "", "question": "(?)", "response": "panne"},
+    ]
+    statuses = db_manager.insert_records_bulk(rows)
+    assert statuses == [INSERT_OK, INSERT_OK, INSERT_ERROR]
+    backend = db_manager.tts_service.backend
+    assert "Il dit bonjour" in backend.calls
+    # 1 essai + max_retries nouvelles tentatives pour l'échec
+    assert backend.calls.count("panne") == db_manager.tts_service.max_retries + 1
+    media_files = {record["media_file"] for record in db_manager.fetch_all_records()}
+    # Même première réponse dans le lot : pas d'écrasement du fichier
+    assert len(media_files) == 2
+
+
+def test_audio_cache_is_shared_and_skips_unchanged_edits(db_manager, make_manager):
+    backend = db_manager.tts_service.backend
+    assert db_manager.insert_record("", "Il dit (?)", "bonjour") == 0
+    # Autre base, même service de synthèse
+    other = make_manager("autre.db")
+    assert other.insert_record("", "Il dit (?)", "bonjour") == 0
+    other.close_connection()
+    assert backend.calls.count("Il dit bonjour") == 1
+
+    record = db_manager.fetch_all_records()[0]
+    assert db_manager.update_record(
+        record["UUID"], record["media_file"], "Il dit (?)", "bonjour", "quelqu'un"
+    )
+    assert backend.calls.count("Il dit bonjour") == 1
+    assert db_manager.update_record(
+        record["UUID"], record["media_file"], "Il dit (?)", "salut"
+    )
+    assert backend.calls.count("Il dit salut") == 1
+
+
+def test_update_to_duplicate_keeps_media_untouched(db_manager, monkeypatch):
+    db_manager.insert_record("", "(?)", "un")
+    db_manager.insert_record("", "(?)", "deux")
+    calls = len(db_manager.tts_service.backend.calls)
+    deux = db_manager.fetch_all_records()[1]
+    monkeypatch.setattr(db_manager, "interactive", False)
+    with pytest.raises(Exception, match="déjà cette question"):
+        db_manager.update_record(deux["UUID"], deux["media_file"], "(?)", "un")
+    assert os.path.exists(deux["media_file"])
+    assert len(db_manager.tts_service.backend.calls) == calls
+    assert db_manager.fetch_record_by_uuid(deux["UUID"]) == deux
+
+
+def test_insert_record_prepares_media_outside_write_lock(db_manager, monkeypatch):
+    backend = db_manager.tts_service.backend
+    synthesize = backend.synthesize
+    lock_free = []
+
+    def synthesize_while_other_writer_inserts(text, language_code, output_path):
+        synthesize(text, language_code, output_path)
+        # Un autre thread écrit pendant la synthèse : le verrou doit être libre
+        writer = threading.Thread(
+            target=lambda: lock_free.append(
+                db_manager.insert_records_bulk(
+                    [
+                        {
+                            "media_file": "",
+                            "custom_media": 0,
+                            "creation_date": "2025-01-01",
+                            "question": "(?)",
+                            "response": "un",
+                        }
+                    ],
+                    media_ready=True,
+                )
+                == [INSERT_OK]
+            )
+        )
+        writer.start()
+        writer.join(timeout=5)
+
+    monkeypatch.setattr(backend, "synthesize", synthesize_while_other_writer_inserts)
+    assert db_manager.insert_record("", "(?)", "un") == INSERT_DUPLICATE
+    assert lock_free == [True]
+    # Le média préparé pour l'insertion abandonnée est retiré
+    assert os.listdir(db_manager.audio_dir) == []
+    assert [r["response"] for r in db_manager.fetch_all_records()] == ["un"]
+
+
+def test_search_is_accent_insensitive_prefix_and_stays_in_sync(db_manager):
+    db_manager.insert_record("", "Il est (?)", "élégant", attribution="Zola")
+    db_manager.insert_record("", "Elle est (?)", "elle")
+    db_manager.insert_record("", "(?)", "autre")
+    assert [r["response"] for r in db_manager.search("eleg")] == ["élégant"]
+    assert len(db_manager.search("est")) == 2
+    assert [r["response"] for r in db_manager.search("zol")] == ["élégant"]
+    assert db_manager.search("") == []
+
+    record = db_manager.search("eleg")[0]
+    db_manager.update_record(record["UUID"], record["media_file"], "(?)", "chic")
+    assert db_manager.search("eleg") == []
+    assert len(db_manager.search("chic")) == 1
+    db_manager.delete_record(record["UUID"])
+    assert db_manager.search("chic") == []
+    where, params = db_manager.search_filter("ell")
+    assert db_manager.count_records(where, params) == 1
+
+
+def test_like_fallback_matches_wildcards_literally(db_manager, monkeypatch):
+    monkeypatch.setattr(db_manager, "fts_enabled", False)
+    for response in ("100%", "1000", "a_b", "axb", "c\\d"):
+        db_manager.insert_record("", "(?)", response)
+
+    def found(text):
+        return [record["response"] for record in db_manager.search(text)]
+
+    assert found("100%") == ["100%"]
+    assert found("a_b") == ["a_b"]
+    assert found("c\\") == ["c\\d"]
+
+
+def test_materialized_search_can_be_refined(db_manager):
+    for response in ("élan", "élégant", "elle", "autre"):
+        db_manager.insert_record("", "(?)", response)
+    where, params = db_manager.materialize_search("el")
+    assert db_manager.count_records(where, params) == 3
+    where, params = db_manager.materialize_search("ele", refine=True)
+    assert [
+        r["response"] for r in db_manager.fetch_records_page(10, 0, where, params)
+    ] == ["élégant"]
+    assert db_manager.materialize_search("  ") == ("", [])
+
+
+def test_fetch_records_by_uuids_preserves_order(db_manager, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "IN_CHUNK_SIZE", 2)
+    for i in range(5):
+        db_manager.insert_record("", "(?)", f"mot{i}", UUID=f"uuid-{i}")
+    uuids = ["uuid-3", "absent", "uuid-0", "uuid-4", "uuid-1", "uuid-3"]
+    records = db_manager.fetch_records_by_uuids(uuids)
+    assert [r["UUID"] for r in records] == [
+        "uuid-3",
+        "uuid-0",
+        "uuid-4",
+        "uuid-1",
+        "uuid-3",
+    ]
+    assert records[0]["response"] == "mot3"
+
+
+def test_fetch_due_records_follows_review_schedule(db_manager):
+    for word in ("un", "deux", "trois"):
+        db_manager.insert_record("", "(?)", word)
+    by_response = {r["response"]: r["UUID"] for r in db_manager.fetch_all_records()}
+    scheduler = ReviewScheduler(db_manager)
+    today = date(2025, 1, 1)
+    scheduler.record_result(by_response["un"], [CORRECT], today)
+    state = scheduler.record_result(by_response["deux"], [INCORRECT], today)
+    assert state["due_date"] == "2025-01-02" and state["repetitions"] == 0
+
+    # Aujourd'hui : seule l'entrée jamais révisée
+    due = db_manager.fetch_due_records(10, today=today)
+    assert [r["response"] for r in due] == ["trois"]
+    # Demain : les deux échéances passées, puis la nouvelle dans la limite
+    due = db_manager.fetch_due_records(2, today=date(2025, 1, 2))
+    assert [r["response"] for r in due] == ["un", "deux"]
+    due = db_manager.fetch_due_records(10, include_new=False, today=date(2025, 1, 2))
+    assert len(due) == 2
+
+
+def test_review_log_is_batched_and_aggregated(db_manager):
+    buffer = ReviewLogBuffer(db_manager, max_pending=3)
+    buffer.log("u1", MODE_RETRIEVAL, 2, 2, 0, 1500)
+    buffer.log("u2", MODE_RETRIEVAL, 1, 3, 1, 2500)
+    assert db_manager.fetch_usage_stats()["retrieval_count"] == 0  # en attente
+    buffer.log("u3", MODE_REVIEW)
+    assert buffer.pending == []  # lot plein : écrit
+    buffer.log("u1", MODE_RETRIEVAL, 1, 1, 0, 500)
+    buffer.flush()
+
+    stats = db_manager.fetch_usage_stats()
+    assert stats["retrieval_count"] == 3 and stats["review_count"] == 1
+    assert (stats["correct_count"], stats["answered_count"]) == (4, 6)
+    assert stats["near_miss_count"] == 1
+    assert stats["average_latency_ms"] == 1500
+    assert stats["dates"] == [date.today().isoformat()]
+
+
+def test_stats_rollups_follow_review_log(db_manager):
+    db_manager.insert_records_bulk(
+        [
+            {"media_file": "", "question": "(?)", "response": "un"},
+            {
+                "media_file": "",
+                "question": "(?) (?)",
+                "response": "deux;trois",
+                "attribution": "livre",
+            },
+        ]
+    )
+    uuids = {r["response"]: r["UUID"] for r in db_manager.fetch_all_records()}
+    db_manager.log_reviews(
+        [
+            {
+                "UUID": uuids["un"],
+                "reviewed_at": "2025-01-01T09:00:00",
+                "mode": MODE_RETRIEVAL,
+                "correct": 1,
+                "total": 1,
+            },
+            {
+                "UUID": uuids["deux;trois"],
+                "reviewed_at": "2025-01-01T09:01:00",
+                "mode": MODE_RETRIEVAL,
+                "correct": 0,
+                "near_miss": 1,
+                "total": 2,
+            },
+            {
+                "UUID": uuids["deux;trois"],
+                "reviewed_at": "2025-01-02T09:00:00",
+                "mode": MODE_RETRIEVAL,
+                "correct": 2,
+                "total": 2,
+            },
+            {
+                "UUID": uuids["un"],
+                "reviewed_at": "2025-01-02T10:00:00",
+                "mode": "review",
+            },
+        ]
+    )
+    assert db_manager.fetch_daily_accuracy() == [
+        ("2025-01-01", 1, 1, 3),
+        ("2025-01-02", 2, 0, 2),
+    ]
+    assert db_manager.fetch_activity_days() == ["2025-01-01", "2025-01-02"]
+    hardest = db_manager.fetch_hardest_cards()
+    assert [(c["response"], c["attempts"], c["misses"]) for c in hardest] == [
+        ("deux;trois", 2, 1)
+    ]
+    assert dict(
+        (name, (correct, total))
+        for name, correct, _, total in db_manager.fetch_attribution_accuracy()
+    ) == {"livre": (2, 4), "no-attribution": (1, 1)}
+    stats = db_manager.fetch_usage_stats()
+    assert (stats["retrieval_count"], stats["review_count"]) == (3, 1)
+
+    # Les agrégats recalculés depuis le journal sont identiques
+    before = db_manager.fetch_hardest_cards(), db_manager.fetch_daily_accuracy()
+    db_manager._rebuild_stats_rollups()
+    assert (
+        db_manager.fetch_hardest_cards(),
+        db_manager.fetch_daily_accuracy(),
+    ) == before
+
+
+def test_favorites_table_and_csv_migration(make_manager):
+    manager = make_manager()
+    for word in ("un", "deux", "trois"):
+        manager.insert_record("", "(?)", word)
+    uuids = {r["response"]: r["UUID"] for r in manager.fetch_all_records()}
+    manager.close_connection()
+
+    with open("favourites-deck.csv", "w", encoding="utf-8") as file:
+        file.write(f"{uuids['trois']}\ninconnu\n{uuids['un']}\n{uuids['trois']}\n")
+    manager = make_manager()
+    assert not os.path.exists("favourites-deck.csv")
+    assert os.path.exists("favourites-deck.csv.migrated")
+    assert [r["response"] for r in manager.fetch_favorite_records()] == [
+        "trois",
+        "un",
+    ]
+    assert manager.add_favorite(uuids["deux"])
+    assert not manager.add_favorite(uuids["deux"])
+    manager.delete_record(uuids["un"])
+    assert [r["response"] for r in manager.fetch_favorite_records()] == [
+        "trois",
+        "deux",
+    ]
+
+
+def test_unreadable_favorites_csv_does_not_abort_table_creation(make_manager, tmp_path):
+    with open(tmp_path / "favourites-deck.csv", "wb") as file:
+        file.write(b"\xff\xfe\x00invalide\n")
+    manager = make_manager()
+    # Le fichier reste pour une prochaine tentative, la base est complète
+    assert os.path.exists("favourites-deck.csv")
+    assert manager.fetch_favorite_records() == []
+    manager.add_error_report("u-un")
+    assert manager.count_records(*manager.error_reports_filter()) == 0
+
+
+def test_error_reports_filter_and_legacy_import(make_manager, tmp_path):
+    with open(tmp_path / "entry_error.csv", "w", encoding="utf-8") as file:
+        file.write("u-deux\nautre-base\nu-deux\n")
+    manager = make_manager()
+    # La table est créée avant que l'entrée existe : rien à importer
+    assert manager.count_records(*manager.error_reports_filter()) == 0
+    for uuid_value, word in (("u-un", "un"), ("u-deux", "deux")):
+        manager.insert_record("", "(?)", word, UUID=uuid_value)
+    manager.add_error_report("u-un", "faute de frappe")
+    manager.add_error_report("u-un")
+    where, params = manager.error_reports_filter()
+    assert manager.count_records(where, params) == 1
+    assert [r["UUID"] for r in manager.fetch_records_page(10, 0, where, params)] == [
+        "u-un"
+    ]
+    manager.clear_error_reports()
+    assert manager.count_records(where, params) == 0
+    manager.close_connection()
+
+    # Base existante sans table error_reports : import de l'ancien fichier
+    db = QSqlDatabase.addDatabase("QSQLITE", "legacy-errors")
+    db.setDatabaseName(str(tmp_path / "deck.db"))
+    db.open()
+    QSqlQuery(db).exec_("DROP TABLE error_reports")
+    db.close()
+    del db
+    QSqlDatabase.removeDatabase("legacy-errors")
+    manager = make_manager()
+    where, params = manager.error_reports_filter()
+    assert [r["UUID"] for r in manager.fetch_records_page(10, 0, where, params)] == [
+        "u-deux"
+    ]
+
+
+def test_creation_date_range_queries_use_index(db_manager):
+    db_manager.insert_records_bulk(
+        [
+            {
+                "media_file": "",
+                "question": "(?)",
+                "response": f"mot{i}",
+                "creation_date": f"2025-01-{i % 28 + 1:02d}",
+            }
+            for i in range(60)
+        ]
+    )
+    params = ["2025-01-03", "2025-01-05"]
+    plan = db_manager.explain(
+        """
+        SELECT UUID, media_file, question, response, creation_date, attribution
+        FROM records WHERE creation_date BETWEEN ? AND ?
+        """,
+        params,
+    )
+    assert any("USING INDEX idx_records_creation_date" in step for step in plan), plan
+    plan = db_manager.explain(
+        "SELECT COUNT(*) FROM records WHERE creation_date BETWEEN ? AND ?", params
+    )
+    assert any("COVERING INDEX idx_records_creation_date" in s for s in plan), plan
+
+    records = db_manager.fetch_record_by_creation_date(
+        date(2025, 1, 3), date(2025, 1, 5)
+    )
+    assert len(records) == db_manager.count_records(
+        "creation_date BETWEEN ? AND ?", params
+    )
+    assert set(records[0]) == {
+        "UUID",
+        "media_file",
+        "question",
+        "response",
+        "creation_date",
+        "attribution",
+    }
+
+
+def test_connection_profile_is_applied(make_manager):
+    manager = make_manager(
+        "profil.db", pragmas={"synchronous": "OFF", "cache_size": -2048, "bad": 1}
+    )
+    applied = manager.apply_pragmas({**manager.DEFAULT_PRAGMAS, "synchronous": 0})
+    assert str(applied["journal_mode"]).lower() == "wal"
+    assert applied["synchronous"] == 0
+    assert applied["temp_store"] == 2  # MEMORY
+    # Valeurs non numériques ni alphabétiques : refusées sans être exécutées
+    assert manager.apply_pragmas({"journal_mode": "WAL; DROP TABLE records"}) == {}
+    assert manager.insert_record("", "(?)", "toujours là") == 0
+
+
+def test_threads_get_their_own_connection(db_manager):
+    db_manager.insert_record("", "(?)", "principal")
+    names, counts, statuses = [], [], []
+    done, closed = threading.Barrier(5), threading.Event()
+
+    def worker(index):
+        names.append(db_manager.storage.connection.connectionName())
+        statuses.append(db_manager.insert_record("", "(?)", f"thread {index}"))
+        counts.append(db_manager.count_records())
+        if index % 2:
+            db_manager.release_thread_connection()
+        done.wait()
+        if not index % 2:
+            closed.wait()
+            db_manager.release_thread_connection()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    done.wait()
+    assert statuses == [0] * 4
+    assert min(counts) >= 2
+    assert len(set(names)) == 4
+    main_name = db_manager.storage.connection_name
+    assert main_name not in names
+    assert db_manager.storage.connection.connectionName() == main_name
+    assert db_manager.count_records() == 5
+    assert len(db_manager.storage._thread_connections) == 2
+    leftovers = set(db_manager.storage._thread_connections)
+    # close() oublie les connexions non libérées sans y toucher : seul leur
+    # thread les ferme
+    db_manager.close_connection()
+    assert db_manager.storage._thread_connections == {}
+    assert all(QSqlDatabase.contains(name) for name in leftovers)
+    closed.set()
+    for thread in threads:
+        thread.join()
+    assert not any(QSqlDatabase.contains(name) for name in names)
+
+
+def test_sqlite3_backend_runs_headless_and_raises(make_manager):
+    manager = make_manager("headless.db", backend=Sqlite3Backend)
+    statuses = manager.insert_records_bulk(
+        [
+            {"media_file": "", "question": "(?)", "response": "chat"},
+            {"media_file": "", "question": "(?)", "response": "chien"},
+            {"media_file": "", "question": "(?)", "response": "chat"},
+        ]
+    )
+    assert statuses == [INSERT_OK, INSERT_OK, INSERT_DUPLICATE]
+    assert manager.insert_record("", "(?)", "chien") == INSERT_DUPLICATE
+    chat, chien = manager.fetch_all_records()
+    assert set(chat) == {
+        "UUID",
+        "media_file",
+        "question",
+        "response",
+        "creation_date",
+        "attribution",
+    }
+    assert [r["response"] for r in manager.search("cha")] == ["chat"]
+    assert manager.add_favorite(chien["UUID"])
+    assert not manager.add_favorite(chien["UUID"])
+    assert manager.log_reviews(
+        [
+            {
+                "UUID": chat["UUID"],
+                "reviewed_at": "2026-01-02T10:00:00",
+                "mode": MODE_RETRIEVAL,
+                "correct": 0,
+                "total": 1,
+            }
+        ]
+    )
+    assert manager.fetch_daily_accuracy() == [("2026-01-02", 0, 0, 1)]
+    assert manager.delete_record(chien["UUID"])
+    assert manager.fetch_favorite_records() == []
+    # Pas de boîte de dialogue : l'erreur remonte à l'appelant
+    with pytest.raises(Exception, match="Record not found"):
+        manager.update_record("inconnu", "", "(?)", "loup")
+    with pytest.raises(StorageError):
+        manager.count_records("colonne_inconnue = 1")
+    manager.close_connection()
+
+    # Même fichier relu par le moteur QtSql
+    reopened = make_manager("headless.db")
+    assert [r["response"] for r in reopened.fetch_all_records()] == ["chat"]
+
+
+HEADLESS_SCRIPT = """
+import sys
+
+sys.modules["PySide6"] = None  # tout import de Qt échoue
+from db import INSERT_OK, DatabaseManager
+from storage import Sqlite3Backend
+from tts_service import AudioGenerationService, TTSCache
+
+manager = DatabaseManager(
+    "headless.db",
+    tts_service=AudioGenerationService(cache=TTSCache("tts-cache")),
+    backend=Sqlite3Backend,
+)
+row = {"media_file": "", "custom_media": 0, "creation_date": "2026-01-01"}
+statuses = manager.insert_records_bulk(
+    [{**row, "question": "(?)", "response": "chat"}], media_ready=True
+)
+assert statuses == [INSERT_OK] and manager.count_records() == 1
+manager.close_connection()
+"""
+
+
+def test_sqlite3_backend_imports_without_qt(tmp_path):
+    # Interpréteur neuf : celui des tests a déjà chargé PySide6
+    package_dir = os.path.dirname(sys.modules[DatabaseManager.__module__].__file__)
+    result = subprocess.run(
+        [sys.executable, "-c", HEADLESS_SCRIPT],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": package_dir},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_migration_backfills_existing_database(make_manager, tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    legacy = QSqlDatabase.addDatabase("QSQLITE", "legacy")
+    legacy.setDatabaseName(db_path)
+    assert legacy.open()
+    query = QSqlQuery(legacy)
+    query.exec_(
+        """
+        CREATE TABLE records (
+            UUID TEXT PRIMARY KEY,
+            media_file TEXT NOT NULL,
+            question TEXT NOT NULL,
+            response TEXT NOT NULL,
+            creation_date TEXT NOT NULL,
+            custom_media INTEGER DEFAULT 0,
+            attribution TEXT NOT NULL DEFAULT 'no-attribution'
+        )
+        """
+    )
+    for uuid in ("a", "b", "c"):
+        response = "un" if uuid != "c" else "deux"
+        query.exec_(
+            f"INSERT INTO records VALUES ('{uuid}', '', '(?)', '{response}', '2025-01-01', 0, 'x')"
+        )
+    query.clear()
+    legacy.close()
+    del legacy
+    QSqlDatabase.removeDatabase("legacy")
+
+    manager = make_manager("legacy.db")
+    query = manager._run_query(
+        "SELECT COUNT(*) FROM records WHERE dedup_key IS NOT NULL"
+    )
+    # Le doublon existant ("b") reste sans clé, les autres sont indexés
+    assert query.rows == [(2,)]
+    assert manager.insert_record("x.mp3", "(?)", "deux") == 1
+    # L'index plein texte est construit pour les entrées existantes
+    assert len(manager.search("un")) == 2
@@ -0,0 +1,34 @@
+from grading import (
+    CORRECT,
+    INCORRECT,
+    NEAR_MISS,
+    GradingEngine,
+    bounded_edit_distance,
+)
+
+
+def test_bounded_edit_distance():
+    assert bounded_edit_distance("maison", "maison", 2) == 0
+    assert bounded_edit_distance("maison", "masion", 2) == 1  # transposition
+    assert bounded_edit_distance("chat", "chien", 2) == 3  # au-delà : limite + 1
+    assert bounded_edit_distance("a" * 500, "b" * 500, 2) == 3
+
+
+def test_grade_categories():
+    engine = GradingEngine()
+    assert engine.grade("école", "école") == CORRECT
+    assert engine.grade("ecole", "école") == NEAR_MISS
+    assert engine.grade("maisno", "maison") == NEAR_MISS
+    assert engine.grade("Il va bein", "Il va (bien)") == NEAR_MISS
+    assert engine.grade("chien", "chat") == INCORRECT
+    assert engine.grade("51", "50") == INCORRECT
+
+
+def test_grade_tolerance_is_configurable(tmp_path):
+    config = tmp_path / "config.toml"
+    config.write_text(
+        "[grading]\ntolerance = 0\naccent_insensitive = false\n", encoding="utf-8"
+    )
+    engine = GradingEngine.from_config(str(config))
+    assert engine.grade("maisno", "maison") == INCORRECT
+    assert engine.grade("ecole", "école") == INCORRECT
@@ -0,0 +1,111 @@
+import csv
+import sys
+import threading
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+from db import DatabaseManager
+from massImporter import CsvImportWorker
+from tts_service import AudioGenerationService, TTSBackend, TTSCache
+
+
+class SilentTTSBackend(TTSBackend):
+    name = "silent"
+
+    def synthesize(self, text, language_code, output_path):
+        with open(output_path, "wb"):
+            pass
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+
+@pytest.fixture
+def db_manager(app, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = DatabaseManager(
+        str(tmp_path / "import.db"),
+        tts_service=AudioGenerationService(
+            backend=SilentTTSBackend(), cache=TTSCache(str(tmp_path / "tts-cache"))
+        ),
+    )
+    yield manager
+    manager.close_connection()
+
+
+def write_csv(path, responses):
+    with open(path, "w", encoding="utf-8", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["audio_path", "question", "response"])
+        for response in responses:
+            writer.writerow(["", "(?)", response])
+
+
+def run_worker(worker, timeout=30):
+    """Exécute le worker dans un thread et retourne son résumé (None s'il bloque)."""
+    summaries = []
+    worker.finished.connect(summaries.append, Qt.DirectConnection)
+    thread = threading.Thread(target=worker.run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        worker.cancel()
+        return None
+    return summaries[0]
+
+
+def test_file_failing_midway_keeps_read_rows_and_frees_slots(
+    db_manager, tmp_path, monkeypatch
+):
+    jobs = []
+    for index in range(3):
+        path = str(tmp_path / f"lot{index}.csv")
+        write_csv(path, [f"mot{index}-{n}" for n in range(150)])
+        jobs.append(
+            {
+                "csv_path": path,
+                "audio_base_dir": "",
+                "has_start_time": False,
+                "has_end_time": False,
+            }
+        )
+    read_chunks = CsvImportWorker.iter_row_chunks
+
+    def failing_chunks(csv_path, chunk_size):
+        yield from read_chunks(csv_path, chunk_size)
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "octet invalide")
+
+    monkeypatch.setattr(
+        CsvImportWorker, "iter_row_chunks", staticmethod(failing_chunks)
+    )
+    monkeypatch.setattr(CsvImportWorker, "MAX_CHUNKS_IN_FLIGHT", 2)
+
+    summary = run_worker(CsvImportWorker(db_manager, jobs))
+    assert summary is not None, "l'import ne doit pas se bloquer"
+    assert len(summary["file_errors"]) == 3
+    assert summary["processed_files"] == 3
+    assert summary["total_imported"] == 450
+    assert db_manager.count_records() == 450
+
+
+def test_duplicates_across_chunks_are_rejected(db_manager, tmp_path):
+    path = str(tmp_path / "doublons.csv")
+    responses = [f"mot{n}" for n in range(250)]
+    responses[120] = responses[5]  # paquet suivant
+    responses[240] = responses[5]  # deux paquets plus loin
+    write_csv(path, responses)
+    job = {
+        "csv_path": path,
+        "audio_base_dir": "",
+        "has_start_time": False,
+        "has_end_time": False,
+    }
+    summary = run_worker(CsvImportWorker(db_manager, [job]))
+    assert summary["total_imported"] == 248
+    assert summary["total_failed"] == 2
+    assert db_manager.count_records() == 248
@@ -0,0 +1,34 @@
+import sys
+import pytest
+from PySide6.QtWidgets import QApplication
+from media_prefetch import MediaPrefetcher
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+
+def test_prefetch_warms_files_and_swaps_players(app, tmp_path):
+    paths = []
+    for name in ("a.mp3", "b.mp3"):
+        path = tmp_path / name
+        path.write_bytes(b"\0" * 1024)
+        paths.append(str(path))
+    prefetcher = MediaPrefetcher(lookahead=2)
+    prefetcher.prefetch(paths + [str(tmp_path / "absent.mp3")])
+    assert [prefetcher._warm[path].result() for path in paths] == [True, True]
+
+    active = prefetcher.player
+    assert prefetcher.take(paths[1]) is None  # seul le suivant est pré-ouvert
+    player = prefetcher.take(paths[0])
+    assert player is prefetcher.player and player is not active
+    assert prefetcher.take(paths[0]) is None
+    prefetcher.shutdown()
+
+
+def test_warm_file_reports_missing_file(tmp_path):
+    assert not MediaPrefetcher._warm_file(str(tmp_path / "absent.mp3"))
@@ -1,6 +1,8 @@
+import json
 import sys
 import pytest
-from PySide6.QtWidgets import QApplication, QInputDialog
+from PySide6.QtWidgets import QApplication, QInputDialog, QMessageBox
+from db import INSERT_ERROR, INSERT_OK
 from missing_responses_dialog import MissingResponsesDialog
 
 
@@ -143,3 +145,31 @@ def test_reset_entry(qtbot, app):
     dialog.reset_entry()
     assert entries[1]["question"] == "Q2"
     assert entries[1]["response"] == ""
+
+
+def test_validate_keeps_entries_that_failed_to_insert(
+    qtbot, app, monkeypatch, tmp_path
+):
+    class FailingDbManager:
+        def insert_records_bulk(self, rows, progress_callback=None):
+            return [INSERT_OK, INSERT_ERROR]
+
+    progress_file = tmp_path / "progress.json"
+    monkeypatch.setattr(MissingResponsesDialog, "PROGRESS_FILE", str(progress_file))
+    warnings = []
+    monkeypatch.setattr(QMessageBox, "warning", lambda *a, **k: warnings.append(a))
+    entries = [
+        {"question": "Q1", "response": "A1"},
+        {"question": "Q2", "response": "A2"},
+    ]
+    dialog = MissingResponsesDialog(
+        None, entries, prompt_on_load=False, db_manager=FailingDbManager()
+    )
+    qtbot.addWidget(dialog)
+    accepted = []
+    monkeypatch.setattr(dialog, "accept", lambda: accepted.append(True))
+    dialog.validate_and_accept()
+    assert warnings and not accepted
+    assert [entry["question"] for entry in dialog.entries] == ["Q2"]
+    saved = json.loads(progress_file.read_text(encoding="utf-8"))
+    assert [entry["question"] for entry in saved["entries"]] == ["Q2"]
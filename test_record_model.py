@@ -0,0 +1,93 @@
+import sys
+import pytest
+from PySide6.QtWidgets import QApplication
+from db import DatabaseManager
+from record_model import RecordTableModel
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
+
+
+@pytest.fixture
+def db_manager(app, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = DatabaseManager(str(tmp_path / "test.db"))
+    rows = [
+        {
+            "media_file": f"{i}.mp3",
+            "question": "(?)",
+            "response": f"mot{i}",
+            "creation_date": "2025-01-01",
+            "custom_media": 1,
+        }
+        for i in range(25)
+    ]
+    manager.insert_records_bulk(rows, media_ready=True)
+    yield manager
+    manager.close_connection()
+
+
+def test_model_fetches_pages_on_demand(db_manager, monkeypatch):
+    monkeypatch.setattr(RecordTableModel, "PAGE_SIZE", 10)
+    model = RecordTableModel(db_manager)
+    assert model.total_count() == 25
+    assert model.rowCount() == 10
+    model.fetchMore()
+    assert model.rowCount() == 20
+    model.ensure_loaded(24)
+    assert model.rowCount() == 25
+    assert not model.canFetchMore()
+    assert [model.record_at(i)["response"] for i in (0, 24)] == ["mot0", "mot24"]
+
+
+def test_model_keeps_pending_changes_across_filters(db_manager):
+    model = RecordTableModel(db_manager)
+    assert model.setData(model.index(3, 3), "modifié")
+    model.set_filter("response LIKE ?", ["mot2%"])
+    assert model.total_count() == 6
+    model.set_filter()
+    assert model.data(model.index(3, 3)) == "modifié"
+    assert list(model.pending_changes) == [model.record_at(3)["UUID"]]
+
+
+def test_manager_recomputes_search_after_writes(db_manager):
+    from record_manager import RecordManagerApp
+
+    manager = RecordManagerApp(db_manager)
+    try:
+        manager.search_records("mot1")
+        assert manager.model.total_count() == 11  # mot1, mot10 à mot19
+        mot10 = next(
+            record
+            for record in db_manager.search("mot10")
+            if record["response"] == "mot10"
+        )
+        db_manager.update_record(
+            mot10["UUID"], mot10["media_file"], "(?)", "autre", "no-attribution"
+        )
+        db_manager.insert_records_bulk(
+            [
+                {
+                    "media_file": "x.mp3",
+                    "question": "(?)",
+                    "response": "mot1bis",
+                    "creation_date": "2025-01-01",
+                    "custom_media": 1,
+                }
+            ],
+            media_ready=True,
+        )
+        manager.load_records()
+        assert manager.model.total_count() == 11
+        responses = {
+            manager.model.record_at(row)["response"]
+            for row in range(manager.model.rowCount())
+        }
+        assert "autre" not in responses and "mot1bis" in responses
+    finally:
+        manager.close()
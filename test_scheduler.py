@@ -0,0 +1,33 @@
+from datetime import date
+from grading import CORRECT, INCORRECT, NEAR_MISS
+from scheduler import new_review_state, review_quality, sm2_update
+
+
+def test_review_quality_from_grades():
+    assert review_quality([CORRECT, CORRECT]) == 5
+    assert review_quality([CORRECT, NEAR_MISS]) == 4
+    assert review_quality([CORRECT, INCORRECT]) == 2
+    assert review_quality([INCORRECT]) == 1
+
+
+def test_sm2_intervals_grow_and_reset_on_failure():
+    today = date(2025, 1, 1)
+    state = new_review_state()
+    intervals = []
+    for _ in range(4):
+        state = sm2_update(state, 5, today)
+        intervals.append(state["interval"])
+    assert intervals[:2] == [1, 6]
+    assert intervals[2] > 6 and intervals[3] > intervals[2]
+    assert state["ease"] > 2.5
+
+    failed = sm2_update(state, 1, today)
+    assert failed["interval"] == 1 and failed["repetitions"] == 0
+    assert failed["due_date"] == "2025-01-02"
+    assert failed["ease"] < state["ease"]
+
+
+def test_near_miss_lowers_ease_but_still_advances():
+    state = sm2_update(new_review_state(), 3, date(2025, 1, 1))
+    assert state["repetitions"] == 1
+    assert state["ease"] < 2.5
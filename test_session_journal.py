@@ -0,0 +1,70 @@
+import json
+from session_journal import SessionJournal
+
+
+def make_records(n):
+    return [{"UUID": f"u{i}", "question": "(?)", "response": f"r{i}"} for i in range(n)]
+
+
+def test_journal_replays_pops_and_requeues(tmp_path):
+    path = str(tmp_path / "saved_records.json")
+    journal = SessionJournal(path)
+    records = make_records(4)
+    journal.start(records)
+    records.pop(0)
+    journal.record_pop("u0", records)
+    records.append(records.pop(0))
+    journal.record_requeue("u1", records)
+    journal.close()
+    session = SessionJournal(path).load()
+    assert session["uuids"] == ["u2", "u3", "u1"]
+    assert session["initial_count"] == 4
+
+
+def test_journal_compacts_and_ignores_stale_or_truncated_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(SessionJournal, "MIN_COMPACT_OPS", 2)
+    path = str(tmp_path / "saved_records.json")
+    journal = SessionJournal(path)
+    records = make_records(3)
+    journal.start(records)
+    for _ in range(2):
+        record = records.pop(0)
+        journal.record_pop(record["UUID"], records)
+    journal.record_requeue("u2", records)  # 3 opérations = taille de l'instantané
+    # Compacté : l'instantané contient la file restante, le journal est vide
+    with open(path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    # Format compact : seulement les UUID, pas de copies des entrées
+    assert snapshot["uuids"] == ["u2"]
+    assert snapshot["initial_count"] == 3
+    with open(path + ".journal", "a", encoding="utf-8") as f:
+        f.write('{"op": "pop", "UU')  # arrêt brutal en pleine écriture
+    assert SessionJournal(path).load()["uuids"] == ["u2"]
+
+    journal.clear()
+    assert not SessionJournal(path).exists()
+
+
+def test_legacy_list_snapshot_is_loaded(tmp_path):
+    path = tmp_path / "saved_records.json"
+    path.write_text(json.dumps(make_records(2)), encoding="utf-8")
+    assert SessionJournal(str(path)).load()["uuids"] == ["u0", "u1"]
+
+
+def test_replay_matches_list_semantics_with_repeated_uuids():
+    uuids = ["a", "b", "a", "c"]
+    entries = [
+        {"op": "requeue", "UUID": "a"},
+        {"op": "pop", "UUID": "a"},
+        {"op": "pop", "UUID": "inconnu"},
+        {"op": "requeue", "UUID": "b"},
+        {"op": "pop", "UUID": "a"},
+    ]
+    expected = list(uuids)
+    for entry in entries:
+        if entry["UUID"] not in expected:
+            continue
+        expected.remove(entry["UUID"])
+        if entry["op"] == "requeue":
+            expected.append(entry["UUID"])
+    assert SessionJournal._replay(uuids, entries) == expected == ["c", "b"]
@@ -0,0 +1,29 @@
+from text_normalization import (
+    expected_answer,
+    is_correct_response,
+    normalize_text,
+    strip_with_index_map,
+)
+
+
+def test_normalize_text_ignores_case_punctuation_and_spaces():
+    assert normalize_text(" À l’école, « oui » ! ") == normalize_text("à lécole oui")
+    assert normalize_text("coeur") == normalize_text("cœur")
+
+
+def test_is_correct_response_variants():
+    assert is_correct_response("50%", "0.5")
+    assert not is_correct_response("abc", "0.5")
+    assert is_correct_response("Il va", "Il va (bien)")
+    assert is_correct_response("Il va bien", "Il va (bien)")
+    assert not is_correct_response("Il part", "Il va (bien)")
+
+
+def test_expected_answer_is_cached():
+    assert expected_answer("une réponse") is expected_answer("une réponse")
+
+
+def test_strip_with_index_map():
+    stripped, index_map = strip_with_index_map("l'a, b")
+    assert stripped == "lab"
+    assert index_map == [0, 2, 5]
@@ -0,0 +1,46 @@
+import os
+from tts_service import AudioGenerationService, TTSBackend, TTSCache
+
+
+class CountingBackend(TTSBackend):
+    name = "compteur"
+
+    def __init__(self):
+        self.calls = 0
+
+    def synthesize(self, text, language_code, output_path):
+        self.calls += 1
+        with open(output_path, "wb") as f:
+            f.write(text.encode("utf-8") * 10)
+
+
+def test_cache_hit_skips_synthesis(tmp_path):
+    backend = CountingBackend()
+    cache = TTSCache(str(tmp_path / "cache"))
+    service = AudioGenerationService(backend=backend, cache=cache)
+    service.synthesize("bonjour", "fr", str(tmp_path / "a.mp3"))
+    service.synthesize("bonjour", "fr", str(tmp_path / "b.mp3"))
+    service.synthesize("bonjour", "en", str(tmp_path / "c.mp3"))
+    assert backend.calls == 2
+    assert open(tmp_path / "b.mp3", "rb").read() == b"bonjour" * 10
+
+    service.shutdown()
+    # Le manifeste est relu par une nouvelle instance
+    assert len(TTSCache(str(tmp_path / "cache")).entries) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    backend = CountingBackend()
+    cache = TTSCache(str(tmp_path / "cache"), max_bytes=75)
+    service = AudioGenerationService(backend=backend, cache=cache)
+    service.synthesize("un", "fr", str(tmp_path / "un.mp3"))  # 20 octets
+    service.synthesize("deux", "fr", str(tmp_path / "deux.mp3"))  # 40 octets
+    service.synthesize("un", "fr", str(tmp_path / "un-bis.mp3"))  # rafraîchit "un"
+    service.synthesize("trois", "fr", str(tmp_path / "trois.mp3"))  # 50 octets
+    assert backend.calls == 3
+    remaining = set(cache.entries)
+    assert cache.make_key("compteur", "fr", "deux") not in remaining
+    assert cache.make_key("compteur", "fr", "un") in remaining
+    assert sum(entry["size"] for entry in cache.entries.values()) <= 75
+    # Les copies des bases restent intactes après éviction
+    assert os.path.exists(tmp_path / "deux.mp3")
@@ -0,0 +1,10 @@
+from datetime import date
+from usage_statistics import compute_streaks
+
+
+def test_compute_streaks():
+    days = ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-05", "2025-01-06"]
+    assert compute_streaks(days, date(2025, 1, 6)) == (2, 3)
+    assert compute_streaks(days, date(2025, 1, 7)) == (2, 3)  # hier compte encore
+    assert compute_streaks(days, date(2025, 1, 8)) == (0, 3)
+    assert compute_streaks([], date(2025, 1, 8)) == (0, 0)
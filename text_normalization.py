@@ -0,0 +1,107 @@
+import re
+import string
+import unicodedata
+from functools import lru_cache
+
+# Ponctuation ignorée lors de la comparaison des réponses (espaces compris)
+PUNCTUATION = string.punctuation + "’' ‘«»–"
+_PUNCTUATION_SET = frozenset(PUNCTUATION)
+_STRIP_PUNCTUATION = str.maketrans("", "", PUNCTUATION)
+_APOSTROPHES = str.maketrans({"’": "'"})
+# Diacritiques combinants (forme NFD) et ligatures, pour comparer sans accents
+_STRIP_ACCENTS = str.maketrans(
+    {**dict.fromkeys(range(0x300, 0x370)), "œ": "oe", "æ": "ae"}
+)
+_NUMERIC_RE = re.compile(r"\s*[+-]?\s*\d*(\.\d+)?\s*%?\s*")
+_OPTIONAL_RE = re.compile(r"^(.*?)(\(.*?\))(.*?)$")
+
+
+def normalize_special_characters(text):
+    if not isinstance(text, str):
+        return text
+    text = unicodedata.normalize("NFKC", text)
+    text = text.replace("oe", "œ")
+    return text.translate(_APOSTROPHES)
+
+
+def normalize_text(text: str) -> str:
+    """Forme de comparaison : minuscules, sans ponctuation ni espaces."""
+    text = text.lower().strip().replace("ỹ", "y")
+    text = normalize_special_characters(text)
+    text = unicodedata.normalize("NFKC", text)
+    return text.translate(_STRIP_PUNCTUATION)
+
+
+def fold_accents(text: str) -> str:
+    """Texte sans accents ni ligatures (é -> e, œ -> oe)."""
+    return unicodedata.normalize("NFD", text).translate(_STRIP_ACCENTS)
+
+
+def strip_with_index_map(text: str):
+    """
+    Retire la ponctuation en un seul passage ; retourne le texte nettoyé et, pour
+    chacun de ses caractères, sa position dans `text`.
+    """
+    index_map = [i for i, ch in enumerate(text) if ch not in _PUNCTUATION_SET]
+    return "".join([text[i] for i in index_map]), index_map
+
+
+def _parse_number(text: str) -> float:
+    return float(text.strip("%")) / 100 if "%" in text else float(text)
+
+
+class ExpectedAnswer:
+    """Réponse attendue prétraitée une fois pour toutes (voir `expected_answer`)."""
+
+    __slots__ = ("numeric", "number", "normalized", "optionals")
+
+    def __init__(self, correct: str):
+        self.numeric = _NUMERIC_RE.fullmatch(correct) is not None
+        self.number = None
+        self.normalized = None
+        self.optionals = ()
+        if self.numeric:
+            try:
+                self.number = _parse_number(correct)
+            except ValueError:
+                pass
+            return
+        correct = normalize_special_characters(correct)
+        match = _OPTIONAL_RE.match(correct)
+        if match:
+            # "mot (facultatif)" : chaque mot entre parenthèses peut être omis
+            base = match.group(1) + match.group(3)
+            self.optionals = tuple(
+                (opt, normalize_text(base.replace(opt, "")))
+                for opt in match.group(2).strip("()").split(" ")
+            )
+        else:
+            self.normalized = normalize_text(correct)
+
+    def matches(self, user: str) -> bool:
+        if self.numeric:
+            if self.number is None:
+                return False
+            try:
+                return abs(_parse_number(user) - self.number) < 0.01
+            except ValueError:
+                return False
+        user = normalize_special_characters(user)
+        if self.optionals:
+            return any(
+                normalize_text(user.replace(opt, "")) == expected
+                for opt, expected in self.optionals
+            )
+        return normalize_text(user) == self.normalized
+
+
+@lru_cache(maxsize=4096)
+def expected_answer(correct: str) -> ExpectedAnswer:
+    """Réponse attendue prétraitée, mise en cache : une carte remise en fin de
+    file ou révisée à nouveau n'est pas renormalisée.
+    """
+    return ExpectedAnswer(correct)
+
+
+def is_correct_response(user: str, correct: str) -> bool:
+    return expected_answer(correct).matches(user)
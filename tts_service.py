@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from logger import logger
+
+
+class TTSBackend:
+    """Interface d'un moteur de synthèse vocale.
+    Un moteur hors ligne ou un bouchon de test n'a qu'à implémenter `synthesize`.
+    """
+
+    name = "base"
+
+    def synthesize(self, text: str, language_code: str, output_path: str) -> None:
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Synthèse via Google Text-to-Speech (réseau requis)."""
+
+    name = "gtts"
+
+    def synthesize(self, text: str, language_code: str, output_path: str) -> None:
+        from gtts import gTTS  # Import local : gTTS n'est nécessaire que pour ce moteur
+
+        gTTS(text=text, lang=language_code).save(output_path)
+
+
+class TTSCache:
+    """
+    Cache adressé par contenu des audios synthétisés, partagé par toutes les bases.
+    La clé est un hachage de (moteur, langue, texte prononcé) ; les fichiers sont
+    stockés sous `<clé>.mp3` et décrits dans `manifest.json` (taille, dernier usage).
+    Quand la taille totale dépasse `max_bytes`, les entrées les moins récemment
+    utilisées sont supprimées. Les entrées gardent leur propre copie dans le dossier
+    audio de leur base : l'éviction ne casse donc aucun média existant.
+    """
+
+    DEFAULT_DIR = os.path.join("assets", "audio", "tts-cache")
+    MANIFEST_NAME = "manifest.json"
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = DEFAULT_DIR, max_bytes: int = 500 * 1024**2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(cache_dir, self.MANIFEST_NAME)
+        self._lock = threading.RLock()
+        self._key_locks = {}
+        self._dirty = False
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entries = self._load_manifest()
+
+    @classmethod
+    def shared(cls, cache_dir: str = DEFAULT_DIR) -> "TTSCache":
+        """Une seule instance par dossier, pour que toutes les bases ouvertes partagent
+        le même manifeste.
+        """
+        key = os.path.abspath(cache_dir)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(cache_dir)
+            return cls._instances[key]
+
+    @staticmethod
+    def make_key(backend_name: str, language_code: str, text: str) -> str:
+        return hashlib.sha256(
+            "\x1f".join((backend_name, language_code, text)).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+            # Manifeste absent ou illisible : le reconstruire à partir des fichiers
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".mp3"):
+                    path = os.path.join(self.cache_dir, name)
+                    entries[name[:-4]] = {
+                        "size": os.path.getsize(path),
+                        "last_used": os.path.getmtime(path),
+                    }
+        # Ignorer les entrées dont le fichier a disparu
+        return {k: v for k, v in entries.items() if os.path.exists(self._path(k))}
+
+    def save_manifest(self):
+        """Écrit le manifeste de façon atomique s'il a changé."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.manifest_path)
+            self._dirty = False
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Verrou par clé : deux synthèses identiques simultanées n'en font qu'une."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """Copie l'audio en cache vers output_path ; retourne False si absent."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            entry["last_used"] = time.time()
+            self._dirty = True
+        try:
+            self._materialize(self._path(key), output_path)
+        except OSError as e:
+            logger.warning(f"Entrée de cache TTS inutilisable ({key}) : {e}")
+            with self._lock:
+                self.entries.pop(key, None)
+            return False
+        return True
+
+    def store(self, key: str, source_path: str):
+        """Ajoute un audio fraîchement synthétisé au cache puis applique l'éviction."""
+        cached_path = self._path(key)
+        try:
+            shutil.copyfile(source_path, cached_path)
+        except OSError as e:
+            logger.warning(f"Impossible de mettre en cache {source_path} : {e}")
+            return
+        with self._lock:
+            self.entries[key] = {
+                "size": os.path.getsize(cached_path),
+                "last_used": time.time(),
+            }
+            self._dirty = True
+            self._evict()
+            self.save_manifest()
+
+    def _evict(self):
+        total = sum(entry["size"] for entry in self.entries.values())
+        for key, entry in sorted(
+            self.entries.items(), key=lambda item: item[1]["last_used"]
+        ):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            total -= entry["size"]
+            del self.entries[key]
+            self._dirty = True
+
+    @staticmethod
+    def _materialize(cached_path: str, output_path: str):
+        """Lien physique si possible (pas de copie sur disque), sinon copie."""
+        if os.path.abspath(cached_path) == os.path.abspath(output_path):
+            return
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        try:
+            os.link(cached_path, output_path)
+        except OSError:
+            shutil.copyfile(cached_path, output_path)
+
+
+class AudioGenerationService:
+    """
+    Génère les fichiers audio dans un pool de threads à concurrence bornée,
+    avec nouvelles tentatives et attente exponentielle en cas d'échec.
+    Avec un `cache` (TTSCache), un texte déjà synthétisé n'est jamais regénéré.
+    Usage :
+        service = AudioGenerationService(cache=TTSCache.shared())
+        future = service.submit("Bonjour", "fr", "assets/audio/x.mp3")
+        future.result()  # lève l'exception finale si toutes les tentatives ont échoué
+    """
+
+    def __init__(
+        self,
+        backend: TTSBackend = None,
+        cache: TTSCache = None,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+    ):
+        self.backend = backend or GTTSBackend()
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="tts"
+                )
+            return self._executor
+
+    def synthesize(self, text: str, language_code: str, output_path: str) -> str:
+        """Synthèse bloquante (servie par le cache si possible) ; retourne output_path."""
+        if self.cache is None:
+            return self._synthesize_with_retries(text, language_code, output_path)
+        key = self.cache.make_key(self.backend.name, language_code, text)
+        with self.cache.key_lock(key):
+            if self.cache.fetch(key, output_path):
+                return output_path
+            self._synthesize_with_retries(text, language_code, output_path)
+            self.cache.store(key, output_path)
+        return output_path
+
+    def _synthesize_with_retries(
+        self, text: str, language_code: str, output_path: str
+    ) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.backend.synthesize(text, language_code, output_path)
+                return output_path
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_seconds * (2**attempt)
+                logger.warning(
+                    f"Échec de la synthèse ({self.backend.name}) pour '{text[:30]}', nouvelle tentative dans {delay:.1f}s : {e}"
+                )
+                time.sleep(delay)
+
+    def submit(self, text: str, language_code: str, output_path: str) -> Future:
+        """Planifie une synthèse dans le pool ; le Future renvoie output_path."""
+        return self._get_executor().submit(
+            self.synthesize, text, language_code, output_path
+        )
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+        if self.cache is not None:
+            self.cache.save_manifest()
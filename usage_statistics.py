@@ -1,13 +1,55 @@
 import os
 import json
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton
+from datetime import date, timedelta
+from PySide6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QLabel,
+    QPushButton,
+    QTabWidget,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+)
 
-STATS_FILE = "usage_stats.json"
+# Ancien fichier de compteurs globaux, relu (sans plus être écrit) pour ne pas
+# perdre l'historique antérieur au journal des réponses
+LEGACY_STATS_FILE = "usage_stats.json"
+
+
+def compute_streaks(days: list, today: date = None) -> tuple[int, int]:
+    """
+    Série en cours et plus longue série de jours consécutifs d'activité.
+    `days` : jours 'YYYY-MM-DD' triés. La série en cours compte encore si le
+    dernier jour d'activité est hier.
+    """
+    today = today or date.today()
+    longest = current = 0
+    previous = None
+    for day in map(date.fromisoformat, days):
+        current = current + 1 if previous and day - previous == timedelta(1) else 1
+        longest = max(longest, current)
+        previous = day
+    if previous is None or today - previous > timedelta(1):
+        current = 0
+    return current, longest
+
+
+def format_accuracy(correct, total) -> str:
+    return f"{(100 * correct / total):.1f}%" if total else "N/A"
 
 
 class StatisticsApp(QDialog):
-    def __init__(self, font_size=12, parent=None):
+    """Statistiques lues dans les agrégats matérialisés (stats_daily, stats_card,
+    stats_attribution) : l'ouverture ne dépend pas de la taille de l'historique.
+    """
+
+    ACCURACY_DAYS = 30
+    HARDEST_CARDS = 15
+
+    def __init__(self, db_manager, font_size=12, parent=None):
         super().__init__(parent)
+        self.db_manager = db_manager
         self.setWindowTitle("Statistiques d'utilisation")
         self.setStyleSheet(f"* {{ font-size: {font_size}px; }}")
         self.layout = QVBoxLayout(self)
@@ -17,26 +59,110 @@ class StatisticsApp(QDialog):
         close_btn.clicked.connect(self.close)
         self.layout.addWidget(close_btn)
 
+    @staticmethod
+    def load_legacy_stats():
+        if not os.path.exists(LEGACY_STATS_FILE):
+            return {}
+        try:
+            with open(LEGACY_STATS_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
     def load_and_display_stats(self):
-        if not os.path.exists(STATS_FILE):
+        stats = self.db_manager.fetch_usage_stats()
+        legacy = self.load_legacy_stats()
+        for key in (
+            "retrieval_count",
+            "review_count",
+            "correct_count",
+            "answered_count",
+            "near_miss_count",
+        ):
+            stats[key] += legacy.get(key, 0)
+        if not stats["retrieval_count"] and not stats["review_count"]:
             self.layout.addWidget(QLabel("Aucune statistique disponible."))
             return
-        with open(STATS_FILE, "r", encoding="utf-8") as f:
-            stats = json.load(f)
-        total_retrieval = stats.get("retrieval_count", 0)
-        total_review = stats.get("review_count", 0)
-        total_correct = stats.get("correct_count", 0)
-        total_answered = stats.get("answered_count", 0)
-        accuracy = (
-            f"{(100 * total_correct / total_answered):.1f}%"
-            if total_answered
-            else "N/A"
+        accuracy = format_accuracy(stats["correct_count"], stats["answered_count"])
+        last_dates = stats["dates"] or legacy.get("dates", [])
+        self.layout.addWidget(
+            QLabel(f"Éléments parcourus : {stats['retrieval_count']}")
+        )
+        self.layout.addWidget(
+            QLabel(f"Éléments vus en mode revue : {stats['review_count']}")
         )
-        last_dates = stats.get("dates", [])
-        self.layout.addWidget(QLabel(f"Éléments parcourus : {total_retrieval}"))
-        self.layout.addWidget(QLabel(f"Éléments vus en mode revue : {total_review}"))
         self.layout.addWidget(QLabel(f"Taux d'exactitude : {accuracy}"))
+        self.layout.addWidget(
+            QLabel(
+                f"Réponses presque justes (crédit partiel) : {stats['near_miss_count']}"
+            )
+        )
+        if stats["average_latency_ms"] is not None:
+            self.layout.addWidget(
+                QLabel(
+                    f"Temps de réponse moyen : {stats['average_latency_ms'] / 1000:.1f} s"
+                )
+            )
+        current, longest = compute_streaks(self.db_manager.fetch_activity_days())
+        self.layout.addWidget(
+            QLabel(f"Série en cours : {current} jour(s) — record : {longest} jour(s)")
+        )
         if last_dates:
             self.layout.addWidget(
                 QLabel(f"Dernières sessions : {', '.join(last_dates[-5:])}")
             )
+
+        tabs = QTabWidget()
+        tabs.addTab(
+            self._make_table(
+                ["Jour", "Exactes", "Presque", "Réponses", "Exactitude"],
+                [
+                    (day, correct, near_miss, total, format_accuracy(correct, total))
+                    for day, correct, near_miss, total in reversed(
+                        self.db_manager.fetch_daily_accuracy(self.ACCURACY_DAYS)
+                    )
+                ],
+            ),
+            "Exactitude par jour",
+        )
+        tabs.addTab(
+            self._make_table(
+                ["Question", "Réponse", "Essais", "Ratées", "Exactitude"],
+                [
+                    (
+                        card["question"],
+                        card["response"],
+                        card["attempts"],
+                        card["misses"],
+                        format_accuracy(card["correct"], card["total"]),
+                    )
+                    for card in self.db_manager.fetch_hardest_cards(self.HARDEST_CARDS)
+                ],
+            ),
+            "Entrées difficiles",
+        )
+        tabs.addTab(
+            self._make_table(
+                ["Attribution", "Exactes", "Presque", "Réponses", "Exactitude"],
+                [
+                    (name, correct, near_miss, total, format_accuracy(correct, total))
+                    for name, correct, near_miss, total in (
+                        self.db_manager.fetch_attribution_accuracy()
+                    )
+                ],
+            ),
+            "Par attribution",
+        )
+        self.layout.addWidget(tabs)
+
+    @staticmethod
+    def _make_table(headers, rows):
+        table = QTableWidget(len(rows), len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
+        return table